@@ -0,0 +1,39 @@
+"""convert users.preferences to jsonb
+
+Revision ID: 3e1b6f0a9d42
+Revises: c7f2d32c2a1b
+Create Date: 2026-10-19 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '3e1b6f0a9d42'
+down_revision = 'c7f2d32c2a1b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.alter_column(
+        'users',
+        'preferences',
+        type_=postgresql.JSONB(astext_type=sa.Text()),
+        existing_type=sa.JSON(),
+        existing_nullable=True,
+        postgresql_using='preferences::jsonb',
+    )
+
+
+def downgrade():
+    op.alter_column(
+        'users',
+        'preferences',
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(astext_type=sa.Text()),
+        existing_nullable=True,
+        postgresql_using='preferences::json',
+    )
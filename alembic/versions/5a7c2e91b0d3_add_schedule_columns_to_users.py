@@ -0,0 +1,73 @@
+"""add indexed schedule columns to users
+
+Revision ID: 5a7c2e91b0d3
+Revises: 3e1b6f0a9d42
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from datetime import UTC, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a7c2e91b0d3'
+down_revision = '3e1b6f0a9d42'
+branch_labels = None
+depends_on = None
+
+DEFAULT_TIMEZONE = 'Europe/Moscow'
+
+
+def _next_delivery_at(schedule_time, tz_name, now):
+    try:
+        hours, minutes = (int(part) for part in schedule_time.split(':'))
+        zone = ZoneInfo(tz_name or DEFAULT_TIMEZONE)
+    except Exception:
+        return None
+    local_day = now.astimezone(zone).date()
+    for day_offset in range(3):
+        candidate = datetime.combine(
+            local_day + timedelta(days=day_offset), time(hours, minutes), tzinfo=zone
+        ).astimezone(UTC)
+        if candidate > now:
+            return candidate
+    return None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('schedule_time', sa.String(length=5), nullable=True))
+    op.add_column('users', sa.Column('timezone', sa.String(length=64), nullable=True))
+    op.add_column('users', sa.Column('next_delivery_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(op.f('ix_users_next_delivery_at'), 'users', ['next_delivery_at'], unique=False)
+
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text(
+            "SELECT id, preferences->>'vacancy_schedule_time', preferences->>'timezone' "
+            "FROM users WHERE preferences ?| array['vacancy_schedule_time', 'timezone']"
+        )
+    ).fetchall()
+    now = datetime.now(UTC)
+    for user_id, schedule_time, tz_name in rows:
+        bind.execute(
+            sa.text(
+                "UPDATE users SET schedule_time = :schedule_time, timezone = :tz, "
+                "next_delivery_at = :next_at WHERE id = :id"
+            ),
+            {
+                'schedule_time': schedule_time,
+                'tz': tz_name,
+                'next_at': _next_delivery_at(schedule_time, tz_name, now) if schedule_time else None,
+                'id': user_id,
+            },
+        )
+
+
+def downgrade():
+    op.drop_index(op.f('ix_users_next_delivery_at'), table_name='users')
+    op.drop_column('users', 'next_delivery_at')
+    op.drop_column('users', 'timezone')
+    op.drop_column('users', 'schedule_time')
@@ -0,0 +1,74 @@
+"""add delivered_vacancies and move sent ids out of preferences
+
+Revision ID: 8d4f1c3b6e27
+Revises: 5a7c2e91b0d3
+Create Date: 2026-10-19 11:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d4f1c3b6e27'
+down_revision = '5a7c2e91b0d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('delivered_vacancies',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('query_key', sa.Text(), nullable=False),
+    sa.Column('hh_vacancy_id', sa.String(length=50), nullable=False),
+    sa.Column('delivered_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'query_key', 'hh_vacancy_id', name='uq_delivered_vacancies_user_query_vacancy')
+    )
+    op.create_index(op.f('ix_delivered_vacancies_delivered_at'), 'delivered_vacancies', ['delivered_at'], unique=False)
+
+    # Move legacy preferences.sent_vacancy_ids_by_query lists into the table
+    op.execute(
+        """
+        INSERT INTO delivered_vacancies (user_id, query_key, hh_vacancy_id)
+        SELECT u.id, q.key, v.value
+        FROM users u
+        CROSS JOIN LATERAL jsonb_each(
+            CASE WHEN jsonb_typeof(u.preferences->'sent_vacancy_ids_by_query') = 'object'
+                 THEN u.preferences->'sent_vacancy_ids_by_query' ELSE '{}'::jsonb END
+        ) AS q
+        CROSS JOIN LATERAL jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(q.value) = 'array' THEN q.value ELSE '[]'::jsonb END
+        ) AS v
+        WHERE v.value <> ''
+        ON CONFLICT ON CONSTRAINT uq_delivered_vacancies_user_query_vacancy DO NOTHING
+        """
+    )
+    op.execute(
+        "UPDATE users SET preferences = preferences - 'sent_vacancy_ids_by_query' "
+        "WHERE preferences ? 'sent_vacancy_ids_by_query'"
+    )
+
+
+def downgrade():
+    op.execute(
+        """
+        UPDATE users u
+        SET preferences = COALESCE(u.preferences, '{}'::jsonb)
+            || jsonb_build_object('sent_vacancy_ids_by_query', agg.ids_by_query)
+        FROM (
+            SELECT user_id, jsonb_object_agg(query_key, ids) AS ids_by_query
+            FROM (
+                SELECT user_id, query_key,
+                       jsonb_agg(hh_vacancy_id ORDER BY delivered_at) AS ids
+                FROM delivered_vacancies
+                GROUP BY user_id, query_key
+            ) per_query
+            GROUP BY user_id
+        ) agg
+        WHERE u.id = agg.user_id
+        """
+    )
+    op.drop_index(op.f('ix_delivered_vacancies_delivered_at'), table_name='delivered_vacancies')
+    op.drop_table('delivered_vacancies')
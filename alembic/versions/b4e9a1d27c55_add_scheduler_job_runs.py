@@ -0,0 +1,30 @@
+"""add scheduler_job_runs for claiming singleton job runs across replicas
+
+Revision ID: b4e9a1d27c55
+Revises: 8d4f1c3b6e27
+Create Date: 2026-10-19 12:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e9a1d27c55'
+down_revision = '8d4f1c3b6e27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('scheduler_job_runs',
+    sa.Column('job_id', sa.String(length=64), nullable=False),
+    sa.Column('slot_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('owner', sa.String(length=128), nullable=False),
+    sa.Column('claimed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('job_id', 'slot_at')
+    )
+
+
+def downgrade():
+    op.drop_table('scheduler_job_runs')
@@ -0,0 +1,43 @@
+"""add query_watermarks for incremental scheduled fetches
+
+Revision ID: c3d8f5a2e914
+Revises: b4e9a1d27c55
+Create Date: 2026-10-19 13:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3d8f5a2e914'
+down_revision = 'b4e9a1d27c55'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('query_watermarks',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('query_key', sa.Text(), nullable=False),
+    sa.Column('published_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('hh_vacancy_id', sa.String(length=50), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'query_key')
+    )
+
+    # Publication times were never stored, so seed each query's mark with its
+    # latest delivery: anything published before it was already offered.
+    op.execute(
+        """
+        INSERT INTO query_watermarks (user_id, query_key, published_at, hh_vacancy_id)
+        SELECT DISTINCT ON (user_id, query_key)
+               user_id, query_key, delivered_at, hh_vacancy_id
+        FROM delivered_vacancies
+        ORDER BY user_id, query_key, delivered_at DESC
+        """
+    )
+
+
+def downgrade():
+    op.drop_table('query_watermarks')
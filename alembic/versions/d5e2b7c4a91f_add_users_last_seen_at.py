@@ -0,0 +1,36 @@
+"""add users.last_seen_at for dormant delivery
+
+Revision ID: d5e2b7c4a91f
+Revises: c3d8f5a2e914
+Create Date: 2026-10-19 14:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5e2b7c4a91f'
+down_revision = 'c3d8f5a2e914'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('last_seen_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+
+    # users.updated_at also moves on every scheduler roll, so estimate activity
+    # from sign-up and the latest search instead.
+    op.execute(
+        """
+        UPDATE users u
+        SET last_seen_at = GREATEST(
+            u.created_at,
+            (SELECT max(q.created_at) FROM search_queries q WHERE q.user_id = u.id)
+        )
+        """
+    )
+
+
+def downgrade():
+    op.drop_column('users', 'last_seen_at')
@@ -0,0 +1,50 @@
+"""add delivery_runs for per-run delivery statistics
+
+Revision ID: e7a4c9d2b6f3
+Revises: d5e2b7c4a91f
+Create Date: 2026-10-19 15:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a4c9d2b6f3'
+down_revision = 'd5e2b7c4a91f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('delivery_runs',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('job', sa.String(length=64), nullable=False),
+    sa.Column('owner', sa.String(length=128), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('slot_deadline', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('duration_ms', sa.Integer(), nullable=False),
+    sa.Column('headroom_ms', sa.Integer(), nullable=True),
+    sa.Column('users_considered', sa.Integer(), nullable=False),
+    sa.Column('users_due', sa.Integer(), nullable=False),
+    sa.Column('users_sent', sa.Integer(), nullable=False),
+    sa.Column('users_dormant', sa.Integer(), nullable=False),
+    sa.Column('users_deactivated', sa.Integer(), nullable=False),
+    sa.Column('skipped', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('search_requests', sa.Integer(), nullable=False),
+    sa.Column('hh_calls', sa.Integer(), nullable=False),
+    sa.Column('prefetch_hits', sa.Integer(), nullable=False),
+    sa.Column('telegram_sends', sa.Integer(), nullable=False),
+    sa.Column('telegram_failures', sa.Integer(), nullable=False),
+    sa.Column('user_ms_p50', sa.Integer(), nullable=False),
+    sa.Column('user_ms_p95', sa.Integer(), nullable=False),
+    sa.Column('user_ms_max', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_delivery_runs_started_at'), 'delivery_runs', ['started_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_delivery_runs_started_at'), table_name='delivery_runs')
+    op.drop_table('delivery_runs')
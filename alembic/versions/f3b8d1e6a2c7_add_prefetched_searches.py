@@ -0,0 +1,33 @@
+"""add prefetched_searches shared by delivery replicas
+
+Revision ID: f3b8d1e6a2c7
+Revises: e7a4c9d2b6f3
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b8d1e6a2c7'
+down_revision = 'e7a4c9d2b6f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('prefetched_searches',
+    sa.Column('search_key', sa.Text(), nullable=False),
+    sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('response_time', sa.Integer(), nullable=False),
+    sa.Column('fetched_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('search_key')
+    )
+    op.create_index(op.f('ix_prefetched_searches_fetched_at'), 'prefetched_searches', ['fetched_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_prefetched_searches_fetched_at'), table_name='prefetched_searches')
+    op.drop_table('prefetched_searches')
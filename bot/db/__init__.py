@@ -1,6 +1,11 @@
 """Database repositories module"""
 
 from bot.db.cv_repository import CVRepository, CVType
+from bot.db.delivered_vacancy_repository import DeliveredVacancyRepository
+from bot.db.delivery_run_repository import DeliveryRunRepository
+from bot.db.job_run_repository import JobRunRepository
+from bot.db.prefetched_search_repository import PrefetchedSearchRepository
+from bot.db.query_watermark_repository import QueryWatermarkRepository
 from bot.db.search_query_repository import SearchQueryRepository
 from bot.db.user_repository import UserRepository
 from bot.db.user_search_result_repository import UserSearchResultRepository
@@ -13,4 +18,9 @@ __all__ = [
     "UserSearchResultRepository",
     "CVRepository",
     "CVType",
+    "DeliveredVacancyRepository",
+    "DeliveryRunRepository",
+    "JobRunRepository",
+    "PrefetchedSearchRepository",
+    "QueryWatermarkRepository",
 ]
@@ -7,6 +7,7 @@ from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from bot.config import settings
+from bot.db.query_timing import install_query_timing, log_query_stats_summary
 from bot.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -77,6 +78,8 @@ async def init_database():
         pool_recycle=180,
         connect_args=connect_args if connect_args else {},
     )
+    if settings.DB_QUERY_TIMING:
+        install_query_timing(engine.sync_engine, settings.DB_SLOW_QUERY_MS)
 
     SessionLocal = async_sessionmaker(
         engine, expire_on_commit=False, class_=AsyncSession
@@ -100,6 +103,8 @@ async def init_database():
 async def close_database():
     global engine
     if engine:
+        if settings.DB_QUERY_TIMING:
+            log_query_stats_summary()
         await engine.dispose()
         logger.info("Database connection closed")
 
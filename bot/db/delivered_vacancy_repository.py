@@ -0,0 +1,103 @@
+from datetime import datetime
+
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.db.models import DeliveredVacancy
+from bot.utils.logging import get_logger
+
+# Create logger for this module
+repo_logger = get_logger(__name__)
+
+
+class DeliveredVacancyRepository:
+    """Repository for vacancies already delivered to users by scheduled digests"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.logger = repo_logger.bind(repository="DeliveredVacancyRepository")
+
+    async def get_delivered_pairs(
+        self, user_id: int, candidates: dict[str, list[str]]
+    ) -> set[tuple[str, str]]:
+        """Return (query_key, hh_vacancy_id) pairs from candidates already delivered.
+
+        All queries of a batch are checked with a single statement.
+        """
+        pairs = [
+            (query_key, hh_id)
+            for query_key, hh_ids in candidates.items()
+            for hh_id in hh_ids
+        ]
+        if not pairs:
+            return set()
+        try:
+            stmt = select(
+                DeliveredVacancy.query_key, DeliveredVacancy.hh_vacancy_id
+            ).where(
+                DeliveredVacancy.user_id == user_id,
+                tuple_(DeliveredVacancy.query_key, DeliveredVacancy.hh_vacancy_id).in_(
+                    pairs
+                ),
+            )
+            result = await self.session.execute(stmt)
+            delivered = {(row[0], row[1]) for row in result.all()}
+            self.logger.debug(
+                f"{len(delivered)} of {len(pairs)} candidate vacancies already delivered to user {user_id}"
+            )
+            return delivered
+        except Exception as e:
+            self.logger.error(
+                f"Error checking delivered vacancies for user {user_id}: {e}"
+            )
+            raise
+
+    async def mark_delivered(
+        self, user_id: int, vacancy_ids_by_query: dict[str, list[str]]
+    ) -> int:
+        """Record delivered vacancies; duplicates are ignored via ON CONFLICT."""
+        rows = [
+            {"user_id": user_id, "query_key": query_key, "hh_vacancy_id": hh_id}
+            for query_key, hh_ids in vacancy_ids_by_query.items()
+            for hh_id in hh_ids
+        ]
+        if not rows:
+            return 0
+        try:
+            stmt = (
+                insert(DeliveredVacancy)
+                .values(rows)
+                .on_conflict_do_nothing(
+                    constraint="uq_delivered_vacancies_user_query_vacancy"
+                )
+            )
+            await self.session.execute(stmt)
+            await self.session.commit()
+            self.logger.debug(
+                f"Recorded {len(rows)} delivered vacancies for user {user_id}"
+            )
+            return len(rows)
+        except Exception as e:
+            self.logger.error(
+                f"Error recording delivered vacancies for user {user_id}: {e}"
+            )
+            await self.session.rollback()
+            raise
+
+    async def purge_delivered_before(self, cutoff: datetime) -> int:
+        """Delete delivery records older than cutoff. Returns deleted row count."""
+        try:
+            stmt = delete(DeliveredVacancy).where(
+                DeliveredVacancy.delivered_at < cutoff
+            )
+            result = await self.session.execute(stmt)
+            await self.session.commit()
+            self.logger.info(
+                f"Purged {result.rowcount} delivered vacancy records before {cutoff.isoformat()}"
+            )
+            return result.rowcount
+        except Exception as e:
+            self.logger.error(f"Error purging delivered vacancies: {e}")
+            await self.session.rollback()
+            raise
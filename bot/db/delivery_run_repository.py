@@ -0,0 +1,59 @@
+from datetime import datetime
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.db.models import DeliveryRun
+from bot.utils.logging import get_logger
+
+# Create logger for this module
+repo_logger = get_logger(__name__)
+
+
+class DeliveryRunRepository:
+    """Repository for delivery run statistics"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.logger = repo_logger.bind(repository="DeliveryRunRepository")
+
+    async def add(self, run: dict) -> None:
+        """Insert one run's statistics (columns of DeliveryRun)."""
+        try:
+            await self.session.execute(insert(DeliveryRun).values(**run))
+            await self.session.commit()
+        except Exception as e:
+            self.logger.error(f"Error recording delivery run: {e}")
+            await self.session.rollback()
+            raise
+
+    async def get_since(self, since: datetime, job: str | None = None) -> list:
+        """Runs started at or after ``since``, oldest first."""
+        try:
+            stmt = (
+                select(DeliveryRun)
+                .where(DeliveryRun.started_at >= since)
+                .order_by(DeliveryRun.started_at)
+            )
+            if job:
+                stmt = stmt.where(DeliveryRun.job == job)
+            result = await self.session.execute(stmt)
+            return list(result.scalars().all())
+        except Exception as e:
+            self.logger.error(f"Error fetching delivery runs: {e}")
+            raise
+
+    async def purge_before(self, cutoff: datetime) -> int:
+        """Delete runs started before cutoff."""
+        try:
+            stmt = delete(DeliveryRun).where(DeliveryRun.started_at < cutoff)
+            result = await self.session.execute(stmt)
+            await self.session.commit()
+            self.logger.info(
+                f"Purged {result.rowcount} delivery runs before {cutoff.isoformat()}"
+            )
+            return result.rowcount
+        except Exception as e:
+            self.logger.error(f"Error purging delivery runs: {e}")
+            await self.session.rollback()
+            raise
@@ -0,0 +1,56 @@
+from datetime import datetime
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.db.models import SchedulerJobRun
+from bot.utils.logging import get_logger
+
+# Create logger for this module
+repo_logger = get_logger(__name__)
+
+
+class JobRunRepository:
+    """Repository for claiming scheduler job runs across replicas"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.logger = repo_logger.bind(repository="JobRunRepository")
+
+    async def claim(self, job_id: str, slot_at: datetime, owner: str) -> bool:
+        """Claim a job slot; True only for the first replica to insert it."""
+        try:
+            stmt = (
+                insert(SchedulerJobRun)
+                .values(job_id=job_id, slot_at=slot_at, owner=owner)
+                .on_conflict_do_nothing(index_elements=["job_id", "slot_at"])
+                .returning(SchedulerJobRun.job_id)
+            )
+            result = await self.session.execute(stmt)
+            claimed = result.scalar_one_or_none() is not None
+            await self.session.commit()
+            if not claimed:
+                self.logger.debug(
+                    f"Job '{job_id}' slot {slot_at.isoformat()} already claimed"
+                )
+            return claimed
+        except Exception as e:
+            self.logger.error(f"Error claiming job '{job_id}': {e}")
+            await self.session.rollback()
+            raise
+
+    async def purge_before(self, cutoff: datetime) -> int:
+        """Delete job run records for slots older than cutoff."""
+        try:
+            stmt = delete(SchedulerJobRun).where(SchedulerJobRun.slot_at < cutoff)
+            result = await self.session.execute(stmt)
+            await self.session.commit()
+            self.logger.info(
+                f"Purged {result.rowcount} scheduler job runs before {cutoff.isoformat()}"
+            )
+            return result.rowcount
+        except Exception as e:
+            self.logger.error(f"Error purging scheduler job runs: {e}")
+            await self.session.rollback()
+            raise
@@ -1,4 +1,15 @@
-from sqlalchemy import JSON, Boolean, Column, DateTime, Index, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 
@@ -18,10 +29,19 @@ class User(Base):
     language_code = Column(String(10), nullable=True)  # Language code
     city = Column(String(100), nullable=True)  # User's preferred city for job search
     hh_area_id = Column(String(20), nullable=True)  # HH.ru area ID for the city
-    is_active = Column(Boolean, default=True)
+    is_active = Column(Boolean, default=True)  # False once Telegram refuses delivery
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-    preferences = Column(JSON, default={})  # User preferences as JSON
+    last_seen_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=True
+    )  # Last update received from the user, refreshed at most hourly
+    preferences = Column(JSONB, default={})  # User preferences as JSONB
+    # Denormalized from preferences so the delivery job can query due users by index
+    schedule_time = Column(String(5), nullable=True)  # Local HH:MM
+    timezone = Column(String(64), nullable=True)  # IANA zone name
+    next_delivery_at = Column(
+        DateTime(timezone=True), nullable=True, index=True
+    )  # Next scheduled delivery moment in UTC
 
 
 class SearchQuery(Base):
@@ -92,3 +112,92 @@ class CV(Base):
     )  # 0=CV, 1=cover letter
     text = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class DeliveredVacancy(Base):
+    __tablename__ = "delivered_vacancies"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "query_key",
+            "hh_vacancy_id",
+            name="uq_delivered_vacancies_user_query_vacancy",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, nullable=False)  # Foreign key to users table
+    query_key = Column(Text, nullable=False)  # Normalized search query text
+    hh_vacancy_id = Column(String(50), nullable=False)  # HH.ru vacancy ID
+    delivered_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
+    )  # Used by the retention cleanup
+
+
+class SchedulerJobRun(Base):
+    """One row per (job, slot) run; inserting it claims the run across replicas."""
+
+    __tablename__ = "scheduler_job_runs"
+
+    job_id = Column(String(64), primary_key=True)
+    slot_at = Column(DateTime(timezone=True), primary_key=True)
+    owner = Column(String(128), nullable=False)  # hostname:pid of the claimer
+    claimed_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+class QueryWatermark(Base):
+    """Newest delivered vacancy per user query; incremental fetches start here."""
+
+    __tablename__ = "query_watermarks"
+
+    user_id = Column(Integer, primary_key=True)  # Foreign key to users table
+    query_key = Column(Text, primary_key=True)  # Normalized search query text
+    published_at = Column(DateTime(timezone=True), nullable=False)
+    hh_vacancy_id = Column(String(50), nullable=False)  # Tie-break within a second
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+
+class DeliveryRun(Base):
+    """Statistics of one scheduled delivery run, for capacity trends."""
+
+    __tablename__ = "delivery_runs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    job = Column(String(64), nullable=False)
+    owner = Column(String(128), nullable=False)  # hostname:pid of the replica
+    started_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    slot_deadline = Column(DateTime(timezone=True), nullable=True)
+    duration_ms = Column(Integer, nullable=False)
+    headroom_ms = Column(Integer, nullable=True)  # Negative when the run overran
+    users_considered = Column(Integer, nullable=False, default=0)
+    users_due = Column(Integer, nullable=False, default=0)
+    users_sent = Column(Integer, nullable=False, default=0)
+    users_dormant = Column(Integer, nullable=False, default=0)
+    users_deactivated = Column(Integer, nullable=False, default=0)
+    skipped = Column(JSONB, nullable=False, default={})  # Skip reason -> user count
+    search_requests = Column(Integer, nullable=False, default=0)
+    hh_calls = Column(Integer, nullable=False, default=0)
+    prefetch_hits = Column(Integer, nullable=False, default=0)
+    telegram_sends = Column(Integer, nullable=False, default=0)
+    telegram_failures = Column(Integer, nullable=False, default=0)
+    user_ms_p50 = Column(Integer, nullable=False, default=0)
+    user_ms_p95 = Column(Integer, nullable=False, default=0)
+    user_ms_max = Column(Integer, nullable=False, default=0)
+
+
+class PrefetchedSearch(Base):
+    """HH search fetched ahead of a delivery slot, readable by every replica."""
+
+    __tablename__ = "prefetched_searches"
+
+    search_key = Column(Text, primary_key=True)  # SharedSearches key
+    result = Column(JSONB, nullable=False)  # {"items": [...], "found": n}
+    response_time = Column(Integer, nullable=False)  # HH fetch time in ms
+    fetched_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,74 @@
+from datetime import datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.db.models import PrefetchedSearch
+from bot.utils.logging import get_logger
+
+# Create logger for this module
+repo_logger = get_logger(__name__)
+
+
+class PrefetchedSearchRepository:
+    """Repository for HH searches prefetched ahead of delivery slots"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.logger = repo_logger.bind(repository="PrefetchedSearchRepository")
+
+    async def get(
+        self, search_key: str, fetched_after: datetime
+    ) -> tuple[dict, int] | None:
+        """(result, response time) of a search fetched after ``fetched_after``."""
+        try:
+            stmt = select(
+                PrefetchedSearch.result, PrefetchedSearch.response_time
+            ).where(
+                PrefetchedSearch.search_key == search_key,
+                PrefetchedSearch.fetched_at > fetched_after,
+            )
+            row = (await self.session.execute(stmt)).first()
+            return (row.result, row.response_time) if row else None
+        except Exception as e:
+            self.logger.error(f"Error fetching prefetched search: {e}")
+            raise
+
+    async def store(
+        self, search_key: str, result: dict, response_time: int, fetched_at: datetime
+    ) -> None:
+        """Insert or replace the stored result for ``search_key``."""
+        try:
+            stmt = insert(PrefetchedSearch).values(
+                search_key=search_key,
+                result=result,
+                response_time=response_time,
+                fetched_at=fetched_at,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[PrefetchedSearch.search_key],
+                set_={
+                    "result": stmt.excluded.result,
+                    "response_time": stmt.excluded.response_time,
+                    "fetched_at": stmt.excluded.fetched_at,
+                },
+            )
+            await self.session.execute(stmt)
+            await self.session.commit()
+        except Exception as e:
+            self.logger.error(f"Error storing prefetched search: {e}")
+            await self.session.rollback()
+            raise
+
+    async def purge_before(self, cutoff: datetime) -> int:
+        """Delete searches fetched before cutoff."""
+        try:
+            stmt = delete(PrefetchedSearch).where(PrefetchedSearch.fetched_at < cutoff)
+            result = await self.session.execute(stmt)
+            await self.session.commit()
+            return result.rowcount
+        except Exception as e:
+            self.logger.error(f"Error purging prefetched searches: {e}")
+            await self.session.rollback()
+            raise
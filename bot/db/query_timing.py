@@ -0,0 +1,155 @@
+"""SQL statement timing with per-fingerprint aggregation and a slow-query log."""
+
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from bot.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|%s")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+_START_KEY = "query_timing_start"
+
+
+@dataclass
+class QueryStat:
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+@dataclass
+class DbTimeAccumulator:
+    """Mutable per-update counter; shared by reference so greenlets can add to it."""
+
+    queries: int = 0
+    total_ms: float = 0.0
+
+
+# Key: statement fingerprint, Value: aggregated timings
+_stats: dict[str, QueryStat] = {}
+_current_update: ContextVar[DbTimeAccumulator | None] = ContextVar(
+    "db_time_accumulator", default=None
+)
+_slow_threshold_ms: float = 0.0
+
+
+@lru_cache(maxsize=512)
+def fingerprint(statement: str) -> str:
+    """Normalize SQL so statements differing only in literals share one key."""
+    normalized = _PLACEHOLDER.sub("?", statement)
+    normalized = _STRING_LITERAL.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    return _IN_LIST.sub("IN (...)", normalized)
+
+
+def _redact(parameters) -> str:
+    if not parameters:
+        return "[]"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}=<redacted>" for k in parameters) + "}"
+    if isinstance(parameters, list | tuple):
+        if parameters and isinstance(parameters[0], dict | list | tuple):
+            return f"<{len(parameters)} parameter sets redacted>"
+        return f"<{len(parameters)} parameters redacted>"
+    return "<redacted>"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get(_START_KEY)
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+
+    key = fingerprint(statement)
+    stat = _stats.get(key)
+    if stat is None:
+        stat = _stats[key] = QueryStat()
+    stat.count += 1
+    stat.total_ms += elapsed_ms
+    if elapsed_ms > stat.max_ms:
+        stat.max_ms = elapsed_ms
+
+    accumulator = _current_update.get()
+    if accumulator is not None:
+        accumulator.queries += 1
+        accumulator.total_ms += elapsed_ms
+
+    if elapsed_ms >= _slow_threshold_ms:
+        logger.warning(
+            f"Slow query ({elapsed_ms:.1f}ms): {key} params={_redact(parameters)}"
+        )
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    conn = exception_context.connection
+    if conn is None:
+        return
+    starts = conn.info.get(_START_KEY)
+    if starts:
+        starts.pop()
+
+
+def install_query_timing(engine: Engine, slow_threshold_ms: float) -> None:
+    """Attach timing listeners to a (sync) engine."""
+    global _slow_threshold_ms
+    _slow_threshold_ms = slow_threshold_ms
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+    logger.info(f"SQL statement timing enabled (slow threshold {slow_threshold_ms}ms)")
+
+
+def start_update_timing() -> tuple[DbTimeAccumulator, object]:
+    """Begin accumulating DB time for the current task. Returns (accumulator, token)."""
+    accumulator = DbTimeAccumulator()
+    token = _current_update.set(accumulator)
+    return accumulator, token
+
+
+def stop_update_timing(token) -> None:
+    _current_update.reset(token)
+
+
+def get_query_stats(limit: int | None = None) -> list[tuple[str, QueryStat]]:
+    """Return fingerprints sorted by total time spent, slowest first."""
+    ordered = sorted(_stats.items(), key=lambda item: item[1].total_ms, reverse=True)
+    return ordered[:limit] if limit else ordered
+
+
+def reset_query_stats() -> None:
+    _stats.clear()
+
+
+def log_query_stats_summary(limit: int = 10) -> None:
+    top = get_query_stats(limit)
+    if not top:
+        return
+    lines = [
+        f"{stat.total_ms:9.1f}ms total | {stat.count:6d} calls | "
+        f"avg {stat.avg_ms:7.1f}ms | max {stat.max_ms:7.1f}ms | {key[:160]}"
+        for key, stat in top
+    ]
+    logger.info("Top SQL statements by total time:\n" + "\n".join(lines))
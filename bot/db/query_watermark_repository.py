@@ -0,0 +1,75 @@
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.db.models import QueryWatermark
+from bot.utils.logging import get_logger
+
+# Create logger for this module
+repo_logger = get_logger(__name__)
+
+
+class QueryWatermarkRepository:
+    """Repository for per-query publication-time high-water marks"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.logger = repo_logger.bind(repository="QueryWatermarkRepository")
+
+    async def get_watermarks(
+        self, user_id: int, query_keys: list[str]
+    ) -> dict[str, tuple[datetime, str]]:
+        """Return {query_key: (published_at, hh_vacancy_id)} for known queries."""
+        if not query_keys:
+            return {}
+        try:
+            stmt = select(
+                QueryWatermark.query_key,
+                QueryWatermark.published_at,
+                QueryWatermark.hh_vacancy_id,
+            ).where(
+                QueryWatermark.user_id == user_id,
+                QueryWatermark.query_key.in_(query_keys),
+            )
+            result = await self.session.execute(stmt)
+            return {row[0]: (row[1], row[2]) for row in result.all()}
+        except Exception as e:
+            self.logger.error(f"Error fetching watermarks for user {user_id}: {e}")
+            raise
+
+    async def advance_watermarks(
+        self, user_id: int, marks: dict[str, tuple[datetime, str]]
+    ) -> None:
+        """Upsert marks; an existing mark only ever moves forward."""
+        if not marks:
+            return
+        try:
+            stmt = insert(QueryWatermark).values(
+                [
+                    {
+                        "user_id": user_id,
+                        "query_key": query_key,
+                        "published_at": published_at,
+                        "hh_vacancy_id": hh_id,
+                    }
+                    for query_key, (published_at, hh_id) in marks.items()
+                ]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[QueryWatermark.user_id, QueryWatermark.query_key],
+                set_={
+                    "published_at": stmt.excluded.published_at,
+                    "hh_vacancy_id": stmt.excluded.hh_vacancy_id,
+                    "updated_at": func.now(),
+                },
+                where=stmt.excluded.published_at >= QueryWatermark.published_at,
+            )
+            await self.session.execute(stmt)
+            await self.session.commit()
+            self.logger.debug(f"Advanced {len(marks)} watermarks for user {user_id}")
+        except Exception as e:
+            self.logger.error(f"Error advancing watermarks for user {user_id}: {e}")
+            await self.session.rollback()
+            raise
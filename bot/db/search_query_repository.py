@@ -7,6 +7,10 @@ from bot.utils.logging import get_logger
 # Create logger for this module
 repo_logger = get_logger(__name__)
 
+# Scheduled digests are stored as search queries flagged in search_params so
+# their results can be paged; they are not user searches and are looked up by id
+NOT_DIGEST = SearchQuery.search_params["digest"].as_string().is_(None)
+
 
 class SearchQueryRepository:
     """Repository for search query-related database operations"""
@@ -51,7 +55,7 @@ class SearchQueryRepository:
         try:
             stmt = (
                 select(SearchQuery)
-                .where(SearchQuery.user_id == user_id)
+                .where(SearchQuery.user_id == user_id, NOT_DIGEST)
                 .order_by(SearchQuery.created_at.desc())
                 .limit(limit)
             )
@@ -95,6 +99,7 @@ class SearchQueryRepository:
                 .where(
                     SearchQuery.user_id == user_id,
                     SearchQuery.query_text == query_text,
+                    NOT_DIGEST,
                 )
                 .order_by(SearchQuery.created_at.desc())
                 .limit(1)
@@ -117,7 +122,7 @@ class SearchQueryRepository:
         try:
             stmt = (
                 select(SearchQuery)
-                .where(SearchQuery.user_id == user_id)
+                .where(SearchQuery.user_id == user_id, NOT_DIGEST)
                 .order_by(SearchQuery.created_at.desc())
                 .limit(1)
             )
@@ -133,3 +138,19 @@ class SearchQueryRepository:
                 f"Error getting latest search query for user {user_id}: {e}"
             )
             raise
+
+    async def get_search_query_by_id(
+        self, user_id: int, search_query_id: int
+    ) -> SearchQuery | None:
+        """Get a search query by id, only if it belongs to the user"""
+        try:
+            stmt = select(SearchQuery).where(
+                SearchQuery.id == search_query_id, SearchQuery.user_id == user_id
+            )
+            result = await self.session.execute(stmt)
+            return result.scalar_one_or_none()
+        except Exception as e:
+            self.logger.error(
+                f"Error getting search query {search_query_id} for user {user_id}: {e}"
+            )
+            raise
@@ -0,0 +1,69 @@
+"""In-process cache of users keyed by Telegram user ID.
+
+Entries are detached ``User`` rows (sessions use ``expire_on_commit=False``) and
+live for a short TTL. ``UserRepository`` writes through or invalidates on every
+change, so stale reads are bounded by the TTL only for writes made elsewhere.
+"""
+
+import time
+
+from bot.db.models import User
+from bot.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+USER_CACHE_TTL = 60  # seconds
+USER_CACHE_MAX_SIZE = 5000
+
+# Key: tg_user_id, Value: (user, cached_at monotonic timestamp)
+_user_cache: dict[str, tuple[User, float]] = {}
+
+
+def _prune_expired():
+    now = time.monotonic()
+    expired_keys = [
+        key
+        for key, (_, cached_at) in _user_cache.items()
+        if now - cached_at > USER_CACHE_TTL
+    ]
+    for key in expired_keys:
+        del _user_cache[key]
+    if expired_keys:
+        logger.debug(f"Pruned {len(expired_keys)} expired user cache entries")
+
+
+def get_cached_user(tg_user_id: str) -> User | None:
+    """Return the cached user or None if absent or expired."""
+    entry = _user_cache.get(tg_user_id)
+    if entry is None:
+        return None
+    user, cached_at = entry
+    if time.monotonic() - cached_at > USER_CACHE_TTL:
+        del _user_cache[tg_user_id]
+        return None
+    return user
+
+
+def cache_user(user: User | None):
+    if user is None or not user.tg_user_id:
+        return
+    if len(_user_cache) >= USER_CACHE_MAX_SIZE:
+        _prune_expired()
+    _user_cache[user.tg_user_id] = (user, time.monotonic())
+
+
+def update_cached_user(tg_user_id: str, **values):
+    """Apply column values to a cached user in place (write-through)."""
+    user = get_cached_user(tg_user_id)
+    if user is None:
+        return
+    for key, value in values.items():
+        setattr(user, key, value)
+
+
+def invalidate_user(tg_user_id: str):
+    _user_cache.pop(tg_user_id, None)
+
+
+def clear_user_cache():
+    _user_cache.clear()
@@ -1,12 +1,28 @@
-from sqlalchemy import select, update
+from datetime import datetime, timedelta
+
+from sqlalchemy import Text, case, func, literal, literal_column, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.db.models import User
+from bot.db.user_cache import (
+    cache_user,
+    get_cached_user,
+    invalidate_user,
+    update_cached_user,
+)
 from bot.utils.logging import get_logger
+from bot.utils.time import compute_next_delivery_at, utc_now
 
 # Create logger for this module
 repo_logger = get_logger(__name__)
 
+# Telegram fields that are only filled in when empty, never overwritten
+PRESERVED_USER_FIELDS = frozenset({"first_name", "last_name", "language_code"})
+
+# Preference keys mirrored into indexed columns on users
+SCHEDULE_PREFERENCE_KEYS = frozenset({"vacancy_schedule_time", "timezone"})
+
 
 class UserRepository:
     """Repository for user-related database operations"""
@@ -15,52 +31,77 @@ class UserRepository:
         self.session = session
         self.logger = repo_logger.bind(repository="UserRepository")
 
+    @staticmethod
+    def _telegram_field_changes(user: User, fields: dict) -> dict:
+        """Return Telegram profile fields that differ from the stored values."""
+        update_data = {}
+        for k, v in fields.items():
+            if not hasattr(user, k) or v is None:
+                continue
+            current = getattr(user, k)
+            if k in PRESERVED_USER_FIELDS and current:
+                continue  # keep user-provided names and selected language
+            if current == v:
+                continue
+            update_data[k] = v
+        return update_data
+
     async def get_or_create_user(self, tg_user_id: str, **kwargs) -> User:
-        """Get existing user or create a new one"""
+        """Get existing user or create a new one with a single upsert statement"""
+        cached = get_cached_user(tg_user_id)
+        if cached is not None and not self._telegram_field_changes(cached, kwargs):
+            return cached
+
+        fields = {k: v for k, v in kwargs.items() if k in User.__table__.c}
         try:
-            # Try to get existing user
-            stmt = select(User).where(User.tg_user_id == tg_user_id)
-            result = await self.session.execute(stmt)
-            user = result.scalar_one_or_none()
+            stmt = insert(User).values(tg_user_id=tg_user_id, **fields)
+            excluded = stmt.excluded
+            set_ = {}
+            for k in fields:
+                column = User.__table__.c[k]
+                if k in PRESERVED_USER_FIELDS:
+                    # keep user-provided names and the user-selected language
+                    set_[k] = func.coalesce(func.nullif(column, ""), excluded[k])
+                else:
+                    set_[k] = func.coalesce(excluded[k], column)
+            if set_:
+                # Only rewrite the row when a field actually changes
+                changed = or_(
+                    *(User.__table__.c[k].is_distinct_from(v) for k, v in set_.items())
+                )
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[User.tg_user_id],
+                    set_={**set_, "updated_at": func.now()},
+                    where=changed,
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=[User.tg_user_id])
+            stmt = stmt.returning(User, literal_column("xmax = 0").label("inserted"))
 
-            if user:
-                # Update user info if provided
-                update_data = {}
-                for k, v in kwargs.items():
-                    if not hasattr(user, k) or v is None:
-                        continue
-                    if k in {"first_name", "last_name"} and getattr(user, k):
-                        continue  # keep user-provided names
-                    if k == "language_code" and getattr(user, k):
-                        continue  # preserve user-selected language
-                    update_data[k] = v
-                if update_data:
-                    update_stmt = (
-                        update(User)
-                        .where(User.tg_user_id == tg_user_id)
-                        .values(**update_data)
-                    )
-                    await self.session.execute(update_stmt)
-                    await self.session.commit()
-                    # Refresh the user object to get updated data
-                    await self.session.refresh(user)
-                    self.logger.debug(
-                        f"Updated user {tg_user_id} with data: {update_data}"
-                    )
-                return user
+            result = await self.session.execute(
+                stmt, execution_options={"populate_existing": True}
+            )
+            row = result.first()
+            if row is None:
+                # Existing row left untouched; nothing was returned
+                result = await self.session.execute(
+                    select(User).where(User.tg_user_id == tg_user_id),
+                    execution_options={"populate_existing": True},
+                )
+                user, inserted = result.scalar_one(), False
             else:
-                # Create new user
-                user_data = {"tg_user_id": tg_user_id, **kwargs}
-                user = User(**user_data)
-                self.session.add(user)
-                await self.session.commit()
-                await self.session.refresh(user)
+                user, inserted = row
+            await self.session.commit()
+
+            if inserted:
                 self.logger.info(
                     f"Created new user with ID {user.id}, tg_user_id {tg_user_id}"
                 )
-                return user
+            cache_user(user)
+            return user
         except Exception as e:
             self.logger.error(f"Error getting/creating user {tg_user_id}: {e}")
+            invalidate_user(tg_user_id)
             await self.session.rollback()
             raise
 
@@ -82,15 +123,13 @@ class UserRepository:
     async def update_user_preferences(self, tg_user_id: str, preferences: dict) -> bool:
         """Update user preferences"""
         try:
-            stmt = (
-                update(User)
-                .where(User.tg_user_id == tg_user_id)
-                .values(preferences=preferences)
-            )
+            values = {"preferences": preferences, **self._schedule_columns(preferences)}
+            stmt = update(User).where(User.tg_user_id == tg_user_id).values(**values)
             result = await self.session.execute(stmt)
             await self.session.commit()
 
             if result.rowcount > 0:
+                update_cached_user(tg_user_id, **values)
                 self.logger.info(f"Updated preferences for user {tg_user_id}")
                 return True
             else:
@@ -100,66 +139,101 @@ class UserRepository:
                 return False
         except Exception as e:
             self.logger.error(f"Error updating preferences for user {tg_user_id}: {e}")
+            invalidate_user(tg_user_id)
             await self.session.rollback()
             raise
 
+    @staticmethod
+    def _jsonb_object(document):
+        """``document`` if it is a JSON object, else ``{}`` (SQL NULL, JSON null, ...)."""
+        return case(
+            (func.jsonb_typeof(document) == "object", document),
+            else_=literal({}, JSONB),
+        )
+
+    @classmethod
+    def _merge_jsonb(cls, document, fields: dict):
+        """Build `document || sets - deletes` so the merge happens server-side.
+
+        A document that is not an object is replaced: `'null'::jsonb || '{}'`
+        would otherwise yield an array.
+        """
+        sets = {k: v for k, v in fields.items() if v is not None}
+        deletes = [k for k, v in fields.items() if v is None]
+        merged = cls._jsonb_object(document)
+        if sets:
+            merged = merged.op("||", return_type=JSONB)(literal(sets, JSONB))
+        if deletes:
+            merged = merged.op("-", return_type=JSONB)(literal(deletes, ARRAY(Text)))
+        return merged
+
+    @staticmethod
+    def _schedule_columns(preferences: dict) -> dict:
+        """Derive the indexed schedule columns from a preferences document."""
+        schedule_time = preferences.get("vacancy_schedule_time")
+        tz_name = preferences.get("timezone")
+        return {
+            "schedule_time": schedule_time,
+            "timezone": tz_name,
+            "next_delivery_at": compute_next_delivery_at(
+                schedule_time, tz_name, utc_now()
+            ),
+        }
+
     async def update_preferences(self, tg_user_id: str, **kwargs) -> bool:
-        """Merge provided preference fields into existing preferences JSON"""
+        """Merge provided preference fields into preferences in one statement.
+
+        Keys with a None value are removed server-side.
+        """
         if not kwargs:
             return True
 
         try:
-            # Get current preferences
-            stmt = select(User).where(User.tg_user_id == tg_user_id)
+            stmt = (
+                update(User)
+                .where(User.tg_user_id == tg_user_id)
+                .values(preferences=self._merge_jsonb(User.preferences, kwargs))
+                .returning(User.preferences)
+            )
             result = await self.session.execute(stmt)
-            user = result.scalar_one_or_none()
+            preferences = result.scalar_one_or_none()
 
-            if not user:
+            if preferences is None:
+                await self.session.commit()
                 self.logger.warning(
                     f"No user found to update preferences for {tg_user_id}"
                 )
                 return False
 
-            current = dict(user.preferences or {})
-            updated = current.copy()
-
-            for key, value in kwargs.items():
-                if value is None:
-                    updated.pop(key, None)
-                else:
-                    updated[key] = value
-
-            if updated == current:
-                self.logger.debug(
-                    f"No preference changes detected for user {tg_user_id}"
+            cached_values = {"preferences": preferences}
+            if SCHEDULE_PREFERENCE_KEYS.intersection(kwargs):
+                schedule_values = self._schedule_columns(preferences)
+                await self.session.execute(
+                    update(User)
+                    .where(User.tg_user_id == tg_user_id)
+                    .values(**schedule_values)
                 )
-                return True
-
-            update_stmt = (
-                update(User)
-                .where(User.tg_user_id == tg_user_id)
-                .values(preferences=updated)
-            )
-            await self.session.execute(update_stmt)
+                cached_values.update(schedule_values)
             await self.session.commit()
+
+            update_cached_user(tg_user_id, **cached_values)
             self.logger.info(
                 f"Updated preferences for user {tg_user_id}: {list(kwargs.keys())}"
             )
             return True
         except Exception as e:
             self.logger.error(f"Error merging preferences for user {tg_user_id}: {e}")
+            invalidate_user(tg_user_id)
             await self.session.rollback()
             raise
 
     async def get_users_for_schedule(self, time_str: str) -> list[User]:
-        """Return active users whose preferences.vacancy_schedule_time matches HH:MM."""
+        """Return active users whose schedule_time matches HH:MM."""
         try:
             stmt = (
                 select(User)
                 .where(User.is_active.is_(True))
-                .where(
-                    User.preferences["vacancy_schedule_time"].as_string() == time_str
-                )
+                .where(User.schedule_time == time_str)
             )
             result = await self.session.execute(stmt)
             users = list(result.scalars().all())
@@ -179,6 +253,7 @@ class UserRepository:
             result = await self.session.execute(stmt)
             await self.session.commit()
             if result.rowcount:
+                update_cached_user(tg_user_id, language_code=language_code)
                 self.logger.info(
                     f"Updated language for user {tg_user_id} to {language_code}"
                 )
@@ -187,6 +262,7 @@ class UserRepository:
             return False
         except Exception as e:
             self.logger.error(f"Error updating language for user {tg_user_id}: {e}")
+            invalidate_user(tg_user_id)
             await self.session.rollback()
             raise
 
@@ -204,6 +280,7 @@ class UserRepository:
             await self.session.commit()
 
             if result.rowcount > 0:
+                update_cached_user(tg_user_id, city=city, hh_area_id=hh_area_id)
                 self.logger.info(
                     f"Updated city for user {tg_user_id}: {city} (area_id: {hh_area_id})"
                 )
@@ -213,6 +290,7 @@ class UserRepository:
                 return False
         except Exception as e:
             self.logger.error(f"Error updating city for user {tg_user_id}: {e}")
+            invalidate_user(tg_user_id)
             await self.session.rollback()
             raise
 
@@ -232,9 +310,14 @@ class UserRepository:
             return None
 
     async def get_user_by_tg_id(self, tg_id: str):
+        cached = get_cached_user(tg_id)
+        if cached is not None:
+            return cached
         stmt = select(User).where(User.tg_user_id == tg_id)
         result = await self.session.execute(stmt)
-        return result.scalar_one_or_none()
+        user = result.scalar_one_or_none()
+        cache_user(user)
+        return user
 
     async def update_user_name(
         self,
@@ -259,6 +342,7 @@ class UserRepository:
             await self.session.commit()
 
             if result.rowcount > 0:
+                update_cached_user(tg_user_id, **update_data)
                 self.logger.info(
                     f"Updated name for user {tg_user_id}: "
                     f"{'first_name' if 'first_name' in update_data else ''} "
@@ -269,59 +353,59 @@ class UserRepository:
             return False
         except Exception as e:
             self.logger.error(f"Error updating name for user {tg_user_id}: {e}")
+            invalidate_user(tg_user_id)
             await self.session.rollback()
             raise
 
     async def update_search_filters(self, tg_user_id: str, **kwargs) -> bool:
-        """Merge search filter fields into preferences.search_filters"""
+        """Merge search filter fields into preferences.search_filters atomically"""
         if not kwargs:
             return True
         try:
-            stmt = select(User).where(User.tg_user_id == tg_user_id)
+            base = self._jsonb_object(User.preferences)
+            filters = self._merge_jsonb(
+                base.op("->", return_type=JSONB)("search_filters"), kwargs
+            )
+            stmt = (
+                update(User)
+                .where(User.tg_user_id == tg_user_id)
+                .values(
+                    preferences=func.jsonb_set(
+                        base, literal(["search_filters"], ARRAY(Text)), filters, True
+                    )
+                )
+                .returning(User.preferences)
+            )
             result = await self.session.execute(stmt)
-            user = result.scalar_one_or_none()
+            preferences = result.scalar_one_or_none()
+            await self.session.commit()
 
-            if not user:
+            if preferences is None:
                 self.logger.warning(
                     f"No user found to update search filters for {tg_user_id}"
                 )
                 return False
 
-            prefs = dict(user.preferences or {})
-            filters = dict(prefs.get("search_filters") or {})
-
-            changed = False
-            for key, value in kwargs.items():
-                if value is None:
-                    if key in filters:
-                        filters.pop(key, None)
-                        changed = True
-                else:
-                    if filters.get(key) != value:
-                        filters[key] = value
-                        changed = True
-
-            if not changed:
-                self.logger.debug(f"No search filter changes for user {tg_user_id}")
-                return True
-
-            prefs["search_filters"] = filters
-            await self.update_user_preferences(tg_user_id, prefs)
+            update_cached_user(tg_user_id, preferences=preferences)
+            self.logger.info(
+                f"Updated search filters for user {tg_user_id}: {list(kwargs.keys())}"
+            )
             return True
         except Exception as e:
             self.logger.error(
                 f"Error updating search filters for user {tg_user_id}: {e}"
             )
+            invalidate_user(tg_user_id)
             await self.session.rollback()
             raise
 
     async def get_users_with_schedule(self) -> list[User]:
-        """Return active users that have vacancy_schedule_time set."""
+        """Return active users that have a schedule time set."""
         try:
             stmt = (
                 select(User)
                 .where(User.is_active.is_(True))
-                .where(User.preferences["vacancy_schedule_time"].isnot(None))
+                .where(User.schedule_time.isnot(None))
             )
             result = await self.session.execute(stmt)
             users = list(result.scalars().all())
@@ -329,3 +413,171 @@ class UserRepository:
         except Exception as e:
             self.logger.error(f"Error fetching users with schedule: {e}")
             return []
+
+    async def claim_due_users(
+        self,
+        now_utc: datetime,
+        limit: int,
+        dormant_before: datetime | None = None,
+        dormant_interval: timedelta | None = None,
+    ) -> list[tuple[User, datetime]]:
+        """Claim up to ``limit`` due users and roll them to their next slot.
+
+        Rows are locked with FOR UPDATE SKIP LOCKED and advanced in the same
+        transaction, so concurrent replicas never claim the same user slot.
+        Users last seen before ``dormant_before`` are rolled ``dormant_interval``
+        ahead instead of to the next day. Returns (user, claimed slot) pairs.
+        """
+        try:
+            stmt = (
+                select(User)
+                .where(User.is_active.is_(True))
+                .where(User.next_delivery_at <= now_utc)
+                .order_by(User.next_delivery_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            result = await self.session.execute(stmt)
+            users = list(result.scalars().all())
+            claimed = [(user, user.next_delivery_at) for user in users]
+            if users:
+                await self.session.execute(
+                    update(User),
+                    [
+                        {
+                            "id": user.id,
+                            "next_delivery_at": compute_next_delivery_at(
+                                user.schedule_time,
+                                user.timezone,
+                                self._roll_from(
+                                    user, now_utc, dormant_before, dormant_interval
+                                ),
+                            ),
+                        }
+                        for user in users
+                    ],
+                )
+            await self.session.commit()
+            self.logger.debug(f"Claimed {len(claimed)} users due for delivery")
+            return claimed
+        except Exception as e:
+            self.logger.error(f"Error claiming users due for delivery: {e}")
+            await self.session.rollback()
+            return []
+
+    @staticmethod
+    def _roll_from(
+        user: User,
+        now_utc: datetime,
+        dormant_before: datetime | None,
+        dormant_interval: timedelta | None,
+    ) -> datetime:
+        """Moment after which a claimed user's next slot is computed."""
+        if (
+            dormant_before is None
+            or dormant_interval is None
+            or user.last_seen_at is None
+            or user.last_seen_at >= dormant_before
+        ):
+            return now_utc
+        # The next slot after this moment is about dormant_interval away
+        return now_utc + dormant_interval - timedelta(days=1)
+
+    async def mark_seen(self, tg_user_id: str, seen_at: datetime) -> bool:
+        """Record user activity; a user who writes again is reactivated.
+
+        A reactivated user, or one rolled days ahead while dormant, is put back
+        on their regular next slot.
+        """
+        try:
+            stmt = (
+                select(
+                    User.is_active,
+                    User.schedule_time,
+                    User.timezone,
+                    User.next_delivery_at,
+                )
+                .where(User.tg_user_id == tg_user_id)
+                .with_for_update()
+            )
+            row = (await self.session.execute(stmt)).first()
+            if row is None:
+                await self.session.rollback()
+                return False
+
+            values = {"last_seen_at": seen_at, "is_active": True}
+            next_slot = compute_next_delivery_at(
+                row.schedule_time, row.timezone, seen_at
+            )
+            if not row.is_active or (
+                next_slot is not None
+                and (row.next_delivery_at is None or row.next_delivery_at > next_slot)
+            ):
+                values["next_delivery_at"] = next_slot
+
+            await self.session.execute(
+                update(User).where(User.tg_user_id == tg_user_id).values(**values)
+            )
+            await self.session.commit()
+            update_cached_user(tg_user_id, **values)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error recording activity for user {tg_user_id}: {e}")
+            await self.session.rollback()
+            return False
+
+    async def deactivate_user(self, tg_user_id: str) -> bool:
+        """Exclude a user from scheduled delivery until they write again."""
+        try:
+            stmt = (
+                update(User)
+                .where(User.tg_user_id == tg_user_id)
+                .values(is_active=False)
+            )
+            result = await self.session.execute(stmt)
+            await self.session.commit()
+            update_cached_user(tg_user_id, is_active=False)
+            self.logger.info(f"Deactivated user {tg_user_id}")
+            return result.rowcount > 0
+        except Exception as e:
+            self.logger.error(f"Error deactivating user {tg_user_id}: {e}")
+            await self.session.rollback()
+            return False
+
+    async def get_users_with_delivery_between(
+        self, start_utc: datetime, end_utc: datetime
+    ) -> list[User]:
+        """Return active users whose next_delivery_at is in [start_utc, end_utc)."""
+        try:
+            stmt = (
+                select(User)
+                .where(User.is_active.is_(True))
+                .where(User.next_delivery_at >= start_utc)
+                .where(User.next_delivery_at < end_utc)
+                .order_by(User.next_delivery_at)
+            )
+            result = await self.session.execute(stmt)
+            return list(result.scalars().all())
+        except Exception as e:
+            self.logger.error(f"Error fetching users with upcoming delivery: {e}")
+            return []
+
+    async def set_next_delivery_times(
+        self, next_delivery_by_user_id: dict[int, datetime | None]
+    ) -> None:
+        """Bulk update next_delivery_at by primary key"""
+        if not next_delivery_by_user_id:
+            return
+        try:
+            await self.session.execute(
+                update(User),
+                [
+                    {"id": user_id, "next_delivery_at": next_at}
+                    for user_id, next_at in next_delivery_by_user_id.items()
+                ],
+            )
+            await self.session.commit()
+        except Exception as e:
+            self.logger.error(f"Error updating next delivery times: {e}")
+            await self.session.rollback()
+            raise
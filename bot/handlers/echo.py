@@ -50,7 +50,7 @@ def register_echo_handlers(router_instance: Router):
         logger.error(f"Failed to register echo handlers: {e}")
 
 
-@router.message()
+@router.message(flags={"search": True})
 async def echo_handler(message: Message):
     """Echo handler for any other messages with comprehensive logging and database integration"""
     if _is_service_message(message):
@@ -4,21 +4,25 @@ from aiogram import Router
 from aiogram.filters import Command
 from aiogram.types import Message
 
-from bot.handlers.search.common import VACANCIES_PER_PAGE, build_search_keyboard
+from bot.handlers.search.common import VACANCIES_PER_PAGE
 from bot.handlers.search.helpers import get_or_create_user_lang
 from bot.handlers.search.run_search import run_search_and_reply
 from bot.services import search_service
 from bot.services.hh_service import hh_service
 from bot.utils.i18n import detect_lang, t
 from bot.utils.logging import get_logger
-from bot.utils.search import format_search_page, get_vacancies_from_db
+from bot.utils.search import (
+    get_search_session,
+    mark_displayed,
+    render_search_page,
+)
 
 logger = get_logger(__name__)
 
 router = Router()
 
 
-@router.message(Command("search"))
+@router.message(Command("search"), flags={"search": True})
 async def search_handler(message: Message):
     """Handler for the /search command with comprehensive logging and database integration"""
     user_id = str(message.from_user.id)
@@ -81,27 +85,29 @@ async def _handle_no_query(
         await message.answer(t("search.no_previous", lang))
         return True
 
-    query = last_query.query_text
-    vacancies, total_found = await get_vacancies_from_db(user_db_id, query)
+    vacancies, total_found, query = await get_search_session(user_db_id, last_query.id)
     if not vacancies:
         await message.answer(t("search.no_saved_results", lang))
         return True
 
-    page = 0
-    total_pages = (len(vacancies) + VACANCIES_PER_PAGE - 1) // VACANCIES_PER_PAGE
-    response_text = format_search_page(
-        query, vacancies, page, VACANCIES_PER_PAGE, total_found, lang
-    )
-    reply_markup = build_search_keyboard(
-        query, page, total_pages, VACANCIES_PER_PAGE, len(vacancies)
+    rendered = render_search_page(
+        user_db_id,
+        last_query.id,
+        query,
+        vacancies,
+        0,
+        VACANCIES_PER_PAGE,
+        total_found,
+        lang,
     )
 
-    await message.answer(
-        response_text,
+    sent = await message.answer(
+        rendered.text,
         parse_mode="HTML",
         disable_web_page_preview=True,
-        reply_markup=reply_markup,
+        reply_markup=rendered.reply_markup,
     )
+    mark_displayed(sent.chat.id, sent.message_id, rendered)
     logger.debug(f"Sent last search results to user {user_id} for query '{query}'")
     return True
 
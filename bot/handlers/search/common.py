@@ -1,12 +1,10 @@
 import html
 
 from aiogram.exceptions import TelegramBadRequest
-from aiogram.types import InlineKeyboardMarkup
 
 from bot.db import CVType
 from bot.utils.i18n import t
 from bot.utils.logging import get_logger
-from bot.utils.search import create_pagination_keyboard, create_vacancy_buttons
 
 logger = get_logger(__name__)
 
@@ -14,19 +12,6 @@ logger = get_logger(__name__)
 VACANCIES_PER_PAGE = 8
 
 
-def build_search_keyboard(
-    query: str, page: int, total_pages: int, per_page: int, total_count: int
-):
-    keyboard: list[list[dict[str, str]]] = []
-    vacancy_row = create_vacancy_buttons(query, page, per_page, total_count)
-    if vacancy_row:
-        keyboard.append(vacancy_row)
-    pagination_row = create_pagination_keyboard(query, page, total_pages)
-    if pagination_row:
-        keyboard.extend(pagination_row)
-    return InlineKeyboardMarkup(inline_keyboard=keyboard) if keyboard else None
-
-
 def format_cv_header(vacancy: dict, lang: str) -> tuple[str, str]:
     return format_document_header(vacancy, lang, CVType.CV)
 
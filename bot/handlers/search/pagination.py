@@ -1,49 +1,46 @@
 from aiogram import Router
 from aiogram.types import CallbackQuery
 
-from bot.handlers.search.common import (
-    VACANCIES_PER_PAGE,
-    build_search_keyboard,
-    safe_answer,
-)
+from bot.handlers.search.common import VACANCIES_PER_PAGE, safe_answer
 from bot.handlers.search.helpers import get_or_create_user_lang
 from bot.utils.i18n import detect_lang, t
 from bot.utils.logging import get_logger
-from bot.utils.search import format_search_page, get_vacancies_from_db
+from bot.utils.search import (
+    DIGEST_PER_PAGE,
+    PAGE_PREFIXES,
+    build_digest_keyboard,
+    format_digest_page,
+    get_digest_from_db,
+    is_displayed,
+    mark_displayed,
+    parse_page_callback,
+    render_search_page,
+    resolve_search_ref,
+)
 
 logger = get_logger(__name__)
 
 router = Router()
 
 
-@router.callback_query(lambda c: c.data.startswith("search_page:"))
+@router.callback_query(lambda c: c.data.startswith(PAGE_PREFIXES))
 async def pagination_handler(callback: CallbackQuery):
-    """Handler for pagination callbacks"""
-    # Handle non-functional buttons (like ellipsis)
-    if callback.data == "noop":
-        await safe_answer(callback)
-        return
-
+    """Handler for pagination callbacks: sp:<search id>:<page>"""
     user_id = str(callback.from_user.id)
     username = callback.from_user.username or "N/A"
     lang = detect_lang(callback.from_user.language_code if callback.from_user else None)
 
     try:
-        # Parse callback data: search_page:query:page
-        parts = callback.data.split(":", 2)
-        if len(parts) != 3:
-            await safe_answer(
-                callback,
-                text=t("search.pagination.invalid_request", lang),
-                show_alert=True,
-            )
-            return
-
-        query = parts[1]
-        page = int(parts[2])
+        ref, page = parse_page_callback(callback.data)
+    except ValueError:
+        await safe_answer(
+            callback, text=t("search.pagination.invalid_request", lang), show_alert=True
+        )
+        return
 
+    try:
         logger.debug(
-            f"Pagination request from user {user_id} (@{username}): query '{query}', page {page}"
+            f"Pagination request from user {user_id} (@{username}): search {ref!r}, page {page}"
         )
 
         user_obj, lang = await get_or_create_user_lang(callback)
@@ -57,8 +54,8 @@ async def pagination_handler(callback: CallbackQuery):
             )
             return
 
-        # Get vacancies from database
-        vacancies, total_found = await get_vacancies_from_db(user_db_id, query)
+        # Get vacancies by search id (or query text for legacy buttons)
+        vacancies, total_found, query = await resolve_search_ref(user_db_id, ref)
 
         if not vacancies:
             await safe_answer(
@@ -80,60 +77,113 @@ async def pagination_handler(callback: CallbackQuery):
             )
             return
 
-        # Check if user clicked on the current page (extract from message text)
-        import re
-
-        current_page_match = re.search(
-            r"Страница (\d+) из" if lang == "ru" else r"Page (\d+) of",
-            callback.message.text or "",
-        )
-        if current_page_match:
-            current_page_num = (
-                int(current_page_match.group(1)) - 1
-            )  # Convert to 0-based
-            if current_page_num == page:
-                # User clicked on the current page, just answer callback
-                await safe_answer(callback)
-                return
-
-        # Format page
-        response_text = format_search_page(
-            query, vacancies, page, VACANCIES_PER_PAGE, total_found, lang
-        )
-
-        # Create pagination keyboard
-        reply_markup = build_search_keyboard(
-            query, page, total_pages, VACANCIES_PER_PAGE, len(vacancies)
+        rendered = render_search_page(
+            user_db_id,
+            ref,
+            query,
+            vacancies,
+            page,
+            VACANCIES_PER_PAGE,
+            total_found,
+            lang,
         )
+        message = callback.message
+        if is_displayed(
+            message.chat.id, message.message_id, message.reply_markup, rendered
+        ):
+            # Re-tap on the page already shown: nothing to edit
+            await safe_answer(callback)
+            return
 
         # Update message
         try:
-            await callback.message.edit_text(
-                response_text,
+            await message.edit_text(
+                rendered.text,
                 parse_mode="HTML",
                 disable_web_page_preview=True,
-                reply_markup=reply_markup,
+                reply_markup=rendered.reply_markup,
             )
         except Exception as edit_error:
             # If message is not modified (same content), just answer callback
-            if "not modified" in str(edit_error).lower():
-                await safe_answer(callback)
-                return
-            raise
+            if "not modified" not in str(edit_error).lower():
+                raise
+        mark_displayed(message.chat.id, message.message_id, rendered)
 
         await safe_answer(callback)
         logger.success(
             f"Page {page + 1} displayed for user {user_id} for query '{query}'"
         )
 
-    except ValueError as e:
-        logger.error(f"Invalid page number in callback: {e}")
+    except Exception as e:
+        logger.error(
+            f"Failed to handle pagination for user {user_id}, search {ref!r}: {e}"
+        )
+        await safe_answer(
+            callback, text=t("search.pagination.error_loading", lang), show_alert=True
+        )
+
+
+@router.callback_query(lambda c: c.data == "noop" or c.data.startswith("digest_page:"))
+async def digest_pagination_handler(callback: CallbackQuery):
+    """Handler for scheduled digest pagination: digest_page:<digest id>:<page>"""
+    if callback.data == "noop":
+        await safe_answer(callback)
+        return
+
+    user_id = str(callback.from_user.id)
+    lang = detect_lang(callback.from_user.language_code if callback.from_user else None)
+
+    try:
+        _, digest_id, page = callback.data.split(":", 2)
+        digest_id, page = int(digest_id), int(page)
+    except ValueError:
         await safe_answer(
-            callback, text=t("search.pagination.invalid_page", lang), show_alert=True
+            callback, text=t("search.pagination.invalid_request", lang), show_alert=True
         )
+        return
+
+    try:
+        user_obj, lang = await get_or_create_user_lang(callback)
+        if not user_obj:
+            await safe_answer(
+                callback,
+                text=t("search.pagination.user_not_found", lang),
+                show_alert=True,
+            )
+            return
+
+        vacancies, queries = await get_digest_from_db(user_obj.id, digest_id)
+        if not vacancies:
+            await safe_answer(
+                callback,
+                text=t("search.pagination.no_vacancies", lang),
+                show_alert=True,
+            )
+            return
+
+        total_pages = (len(vacancies) + DIGEST_PER_PAGE - 1) // DIGEST_PER_PAGE
+        if page < 0 or page >= total_pages:
+            await safe_answer(
+                callback,
+                text=t("search.pagination.invalid_page", lang),
+                show_alert=True,
+            )
+            return
+
+        try:
+            await callback.message.edit_text(
+                format_digest_page(queries, vacancies, page, DIGEST_PER_PAGE, lang),
+                parse_mode="HTML",
+                disable_web_page_preview=True,
+                reply_markup=build_digest_keyboard(digest_id, page, total_pages),
+            )
+        except Exception as edit_error:
+            if "not modified" not in str(edit_error).lower():
+                raise
+        await safe_answer(callback)
     except Exception as e:
         logger.error(
-            f"Failed to handle pagination for user {user_id}, query '{query}': {e}"
+            f"Failed to handle digest pagination for user {user_id}, digest {digest_id}: {e}"
         )
         await safe_answer(
             callback, text=t("search.pagination.error_loading", lang), show_alert=True
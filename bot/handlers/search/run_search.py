@@ -1,14 +1,16 @@
-from bot.handlers.search.common import VACANCIES_PER_PAGE, build_search_keyboard
+from bot.handlers.search.common import VACANCIES_PER_PAGE
 from bot.services import search_service, user_service
 from bot.utils.i18n import t
 from bot.utils.logging import get_logger
 from bot.utils.profile_helpers import format_search_filters
 from bot.utils.search import (
+    cache_session,
     cache_vacancies,
-    format_search_page,
     get_query_thread_map,
+    mark_displayed,
     normalize_search_query_key,
     perform_search,
+    render_search_page,
     store_search_results,
 )
 
@@ -62,29 +64,39 @@ async def run_search_and_reply(
     vacancies = results["items"]
     total_found = results.get("found", len(vacancies))
 
+    # Buttons reference the stored search by id; query text only as a fallback
+    search_ref = query
     if user_db_id:
-        await store_search_results(
+        search_id = await store_search_results(
             user_db_id, query, vacancies, response_time, per_page=100
         )
         cache_vacancies(user_db_id, query, vacancies, total_found)
+        if search_id is not None:
+            cache_session(user_db_id, search_id, query, vacancies, total_found)
+            search_ref = search_id
         if user_obj and thread_id:
             await _save_query_thread_binding(user_obj.tg_user_id, prefs, query, thread_id)
 
     page = 0
     total_pages = (len(vacancies) + VACANCIES_PER_PAGE - 1) // VACANCIES_PER_PAGE
-    response_text = format_search_page(
-        query, vacancies, page, VACANCIES_PER_PAGE, total_found, lang
-    )
-    reply_markup = build_search_keyboard(
-        query, page, total_pages, VACANCIES_PER_PAGE, len(vacancies)
+    rendered = render_search_page(
+        user_db_id,
+        search_ref,
+        query,
+        vacancies,
+        page,
+        VACANCIES_PER_PAGE,
+        total_found,
+        lang,
     )
 
-    await message.answer(
-        response_text,
+    sent = await message.answer(
+        rendered.text,
         parse_mode="HTML",
         disable_web_page_preview=True,
-        reply_markup=reply_markup,
+        reply_markup=rendered.reply_markup,
     )
+    mark_displayed(sent.chat.id, sent.message_id, rendered)
     logger.success(
         f"Search results sent to user {message.from_user.id} for query '{query}' "
         f"({len(vacancies)} vacancies, {total_pages} pages)"
@@ -9,7 +9,15 @@ from bot.handlers.search.helpers import get_or_create_user_lang
 from bot.services import cv_service
 from bot.utils.i18n import detect_lang, t
 from bot.utils.logging import get_logger
-from bot.utils.search import format_vacancy_details, get_vacancies_from_db
+from bot.utils.search import (
+    DETAIL_PREFIXES,
+    doc_callback,
+    forget_displayed,
+    format_vacancy_details,
+    page_callback,
+    parse_detail_callback,
+    resolve_search_ref,
+)
 from bot.utils.vacancy_docs import ensure_vacancy_db_id
 
 logger = get_logger(__name__)
@@ -17,23 +25,14 @@ logger = get_logger(__name__)
 router = Router()
 
 
-@router.callback_query(lambda c: c.data.startswith("vacancy_detail:"))
+@router.callback_query(lambda c: c.data.startswith(DETAIL_PREFIXES))
 async def vacancy_detail_handler(callback: CallbackQuery):
+    """Handler for vacancy detail callbacks: sd:<search id>:<index>"""
     user_id = str(callback.from_user.id)
     lang = detect_lang(callback.from_user.language_code if callback.from_user else None)
 
     try:
-        parts = callback.data.split(":", 2)
-        if len(parts) != 3:
-            await safe_answer(
-                callback,
-                text=t("search.vacancy_detail.invalid_request", lang),
-                show_alert=True,
-            )
-            return
-
-        query = parts[1]
-        idx = int(parts[2])
+        ref, idx = parse_detail_callback(callback.data)
 
         user_obj, lang = await get_or_create_user_lang(callback)
         user_db_id = user_obj.id if user_obj else None
@@ -46,7 +45,7 @@ async def vacancy_detail_handler(callback: CallbackQuery):
             )
             return
 
-        vacancies, total_found = await get_vacancies_from_db(user_db_id, query)
+        vacancies, total_found, query = await resolve_search_ref(user_db_id, ref)
         if not vacancies or idx < 0 or idx >= len(vacancies):
             await safe_answer(
                 callback,
@@ -89,20 +88,20 @@ async def vacancy_detail_handler(callback: CallbackQuery):
                 cv_buttons.append(
                     InlineKeyboardButton(
                         text=t("search.vacancy_detail.buttons.send_cv", lang),
-                        callback_data=f"vacancy_doc:cv:{query}:{idx}:send",
+                        callback_data=doc_callback(ref, "cv", idx, "send"),
                     )
                 )
                 cv_buttons.append(
                     InlineKeyboardButton(
                         text=t("search.vacancy_detail.buttons.regenerate_cv", lang),
-                        callback_data=f"vacancy_doc:cv:{query}:{idx}:regen",
+                        callback_data=doc_callback(ref, "cv", idx, "regen"),
                     )
                 )
             else:
                 cv_buttons.append(
                     InlineKeyboardButton(
                         text=t("search.vacancy_detail.buttons.generate_cv", lang),
-                        callback_data=f"vacancy_doc:cv:{query}:{idx}:generate",
+                        callback_data=doc_callback(ref, "cv", idx, "generate"),
                     )
                 )
 
@@ -121,7 +120,7 @@ async def vacancy_detail_handler(callback: CallbackQuery):
                 cover_buttons.append(
                     InlineKeyboardButton(
                         text=t("search.vacancy_detail.buttons.send_cover_letter", lang),
-                        callback_data=f"vacancy_doc:cover:{query}:{idx}:send",
+                        callback_data=doc_callback(ref, "cover", idx, "send"),
                     )
                 )
                 cover_buttons.append(
@@ -130,7 +129,7 @@ async def vacancy_detail_handler(callback: CallbackQuery):
                             "search.vacancy_detail.buttons.regenerate_cover_letter",
                             lang,
                         ),
-                        callback_data=f"vacancy_doc:cover:{query}:{idx}:regen",
+                        callback_data=doc_callback(ref, "cover", idx, "regen"),
                     )
                 )
             else:
@@ -139,7 +138,7 @@ async def vacancy_detail_handler(callback: CallbackQuery):
                         text=t(
                             "search.vacancy_detail.buttons.generate_cover_letter", lang
                         ),
-                        callback_data=f"vacancy_doc:cover:{query}:{idx}:generate",
+                        callback_data=doc_callback(ref, "cover", idx, "generate"),
                     )
                 )
 
@@ -149,7 +148,7 @@ async def vacancy_detail_handler(callback: CallbackQuery):
         back_button = [
             InlineKeyboardButton(
                 text=t("search.vacancy_detail.buttons.back", lang),
-                callback_data=f"search_page:{query}:{page}",
+                callback_data=page_callback(ref, page),
             )
         ]
         hh_button = [
@@ -175,6 +174,7 @@ async def vacancy_detail_handler(callback: CallbackQuery):
             disable_web_page_preview=False,
             reply_markup=back_button_markup,
         )
+        forget_displayed(callback.message.chat.id, callback.message.message_id)
         await safe_answer(callback)
         logger.debug(
             f"Sent vacancy detail idx={idx} for user {user_id} query '{query}'"
@@ -2,7 +2,6 @@ import asyncio
 import html
 from collections.abc import Awaitable, Callable
 
-import openai
 from aiogram import Router
 from aiogram.exceptions import TelegramBadRequest
 from aiogram.types import CallbackQuery
@@ -15,7 +14,12 @@ from bot.services.openai_service import openai_service
 from bot.utils.i18n import detect_lang, t
 from bot.utils.logging import get_logger
 from bot.utils.profile_edit import build_full_name
-from bot.utils.search import get_vacancies_from_db
+from bot.utils.search import (
+    DOC_PREFIXES,
+    SearchRef,
+    parse_doc_callback,
+    resolve_search_ref,
+)
 from bot.utils.vacancy_docs import sanitize_cover_letter_text
 
 router = Router()
@@ -28,35 +32,9 @@ MAX_DRAFT_TEXT_LENGTH = 4096
 
 async def _parse_callback(
     callback: CallbackQuery, lang: str
-) -> tuple[CVType, dict, str, int, str] | None:
-    doc_key = "cv"
-    doc_type = CVType.CV
-    doc_meta = DOCUMENT_META[CVType.CV]
+) -> tuple[CVType, dict, SearchRef, int, str] | None:
     try:
-        if callback.data.startswith("vacancy_doc:"):
-            parts = callback.data.split(":", 4)
-            if len(parts) != 5:
-                await safe_answer(
-                    callback,
-                    text=t("search.vacancy_detail.invalid_request", lang),
-                    show_alert=True,
-                )
-                return None
-            doc_key, query, idx, action = parts[1], parts[2], int(parts[3]), parts[4]
-        else:
-            parts = callback.data.split(":", 3)
-            if len(parts) != 4:
-                await safe_answer(
-                    callback,
-                    text=t("search.vacancy_detail.invalid_request", lang),
-                    show_alert=True,
-                )
-                return None
-            query, idx, action = parts[1], int(parts[2]), parts[3]
-
-        doc_type = CVType.COVER_LETTER if doc_key == "cover" else CVType.CV
-        doc_meta = DOCUMENT_META.get(doc_type, DOCUMENT_META[CVType.CV])
-        return doc_type, doc_meta, query, idx, action
+        doc_key, ref, idx, action = parse_doc_callback(callback.data)
     except ValueError:
         await safe_answer(
             callback,
@@ -65,6 +43,10 @@ async def _parse_callback(
         )
         return None
 
+    doc_type = CVType.COVER_LETTER if doc_key == "cover" else CVType.CV
+    doc_meta = DOCUMENT_META.get(doc_type, DOCUMENT_META[CVType.CV])
+    return doc_type, doc_meta, ref, idx, action
+
 
 async def _get_user_and_lang(
     callback: CallbackQuery, lang: str
@@ -81,9 +63,9 @@ async def _get_user_and_lang(
 
 
 async def _get_vacancy(
-    user_db_id: int, query: str, idx: int, lang: str, callback: CallbackQuery
+    user_db_id: int, ref: SearchRef, idx: int, lang: str, callback: CallbackQuery
 ) -> dict | None:
-    vacancies, _ = await get_vacancies_from_db(user_db_id, query)
+    vacancies, _, _ = await resolve_search_ref(user_db_id, ref)
     if not vacancies or idx < 0 or idx >= len(vacancies):
         await safe_answer(
             callback, text=t("search.vacancy_detail.not_found", lang), show_alert=True
@@ -151,9 +133,7 @@ async def _stream_document_generation(
     return "".join(chunks)
 
 
-@router.callback_query(
-    lambda c: c.data.startswith("vacancy_cv:") or c.data.startswith("vacancy_doc:")
-)
+@router.callback_query(lambda c: c.data.startswith(DOC_PREFIXES))
 async def vacancy_cv_handler(callback: CallbackQuery):
     user_id = str(callback.from_user.id)
     await safe_answer(callback)
@@ -163,7 +143,7 @@ async def vacancy_cv_handler(callback: CallbackQuery):
         parsed = await _parse_callback(callback, lang)
         if not parsed:
             return
-        doc_type, doc_meta, query, idx, action = parsed
+        doc_type, doc_meta, ref, idx, action = parsed
 
         user_db_id, user_obj, lang = await _get_user_and_lang(callback, lang)
         if not user_db_id:
@@ -174,7 +154,7 @@ async def vacancy_cv_handler(callback: CallbackQuery):
             )
             return
 
-        vacancy = await _get_vacancy(user_db_id, query, idx, lang, callback)
+        vacancy = await _get_vacancy(user_db_id, ref, idx, lang, callback)
         if not vacancy:
             return
         vacancy_db_id = vacancy["db_id"]
@@ -277,6 +257,8 @@ async def vacancy_cv_handler(callback: CallbackQuery):
                 on_partial=push_draft if draft_enabled else None,
             )
 
+        import openai  # imported on first use, like in openai_service
+
         try:
             doc_text = await asyncio.wait_for(
                 generate_with_draft(), timeout=GENERATION_TIMEOUT
@@ -300,7 +282,7 @@ async def vacancy_cv_handler(callback: CallbackQuery):
                 extra={
                     "user_id": user_id,
                     "vacancy_id": vacancy_db_id,
-                    "query": query,
+                    "search": ref,
                     "llm_model": openai_service.settings.LLM_MODEL,
                     "doc_type": int(doc_type),
                 },
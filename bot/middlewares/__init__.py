@@ -0,0 +1,13 @@
+"""Aiogram middlewares"""
+
+from bot.middlewares.activity import UserActivityMiddleware
+from bot.middlewares.db_timing import DbTimingMiddleware
+from bot.middlewares.outbound import OutboundRateLimitMiddleware
+from bot.middlewares.search_throttle import SearchThrottleMiddleware
+
+__all__ = [
+    "DbTimingMiddleware",
+    "OutboundRateLimitMiddleware",
+    "SearchThrottleMiddleware",
+    "UserActivityMiddleware",
+]
@@ -0,0 +1,64 @@
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, User
+
+from bot.db.user_cache import get_cached_user
+from bot.services import user_service
+from bot.utils.logging import get_logger
+from bot.utils.time import utc_now
+
+logger = get_logger(__name__)
+
+# last_seen_at only drives dormancy (days), so hourly precision is plenty
+TOUCH_INTERVAL = 3600  # seconds
+TOUCH_STATE_MAX_SIZE = 10000
+
+
+class UserActivityMiddleware(BaseMiddleware):
+    """Outer update middleware that keeps ``users.last_seen_at`` current.
+
+    Writes at most once per user per ``TOUCH_INTERVAL`` in each process. Any
+    update also reactivates a user deactivated after a failed delivery; a user
+    cached as inactive is written at once, regardless of the interval.
+    """
+
+    def __init__(self):
+        # Key: tg_user_id, Value: monotonic time of the last recorded touch
+        self._touched_at: dict[str, float] = {}
+
+    def _prune(self, now: float):
+        if len(self._touched_at) < TOUCH_STATE_MAX_SIZE:
+            return
+        self._touched_at = {
+            tg_user_id: touched_at
+            for tg_user_id, touched_at in self._touched_at.items()
+            if now - touched_at < TOUCH_INTERVAL
+        }
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        from_user: User | None = data.get("event_from_user")
+        if from_user is not None and not from_user.is_bot:
+            tg_user_id = str(from_user.id)
+            now = time.monotonic()
+            touched_at = self._touched_at.get(tg_user_id)
+            cached = get_cached_user(tg_user_id)
+            if (
+                touched_at is None
+                or now - touched_at >= TOUCH_INTERVAL
+                or (cached is not None and not cached.is_active)
+            ):
+                self._prune(now)
+                self._touched_at[tg_user_id] = now
+                try:
+                    await user_service.mark_seen(tg_user_id, utc_now())
+                except Exception as e:
+                    logger.warning(f"Failed to record activity for {tg_user_id}: {e}")
+        return await handler(event, data)
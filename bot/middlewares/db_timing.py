@@ -0,0 +1,39 @@
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+
+from bot.db.query_timing import start_update_timing, stop_update_timing
+from bot.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class DbTimingMiddleware(BaseMiddleware):
+    """Outer update middleware that attributes DB time to each handled update."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        update_id = event.update_id if isinstance(event, Update) else None
+        accumulator, token = start_update_timing()
+        started = time.perf_counter()
+        try:
+            with logger.contextualize(update_id=update_id):
+                return await handler(event, data)
+        finally:
+            stop_update_timing(token)
+            total_ms = (time.perf_counter() - started) * 1000
+            logger.bind(
+                update_id=update_id,
+                db_ms=round(accumulator.total_ms, 1),
+                db_queries=accumulator.queries,
+            ).debug(
+                f"Update {update_id} handled in {total_ms:.1f}ms "
+                f"(db: {accumulator.total_ms:.1f}ms over {accumulator.queries} queries)"
+            )
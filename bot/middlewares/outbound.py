@@ -0,0 +1,85 @@
+import time
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import (
+    CopyMessage,
+    EditMessageCaption,
+    EditMessageReplyMarkup,
+    EditMessageText,
+    ForwardMessage,
+    SendDocument,
+    SendMediaGroup,
+    SendMessage,
+    SendPhoto,
+    TelegramMethod,
+)
+from aiogram.methods.base import Response, TelegramType
+
+from bot.utils.logging import get_logger
+from bot.utils.outbound import OutboundDispatcher, outbound_dispatcher
+
+logger = get_logger(__name__)
+
+# Methods that count against Telegram's message limits; the rest pass through
+RATE_LIMITED_METHODS = (
+    SendMessage,
+    SendDocument,
+    SendPhoto,
+    SendMediaGroup,
+    CopyMessage,
+    ForwardMessage,
+    EditMessageText,
+    EditMessageCaption,
+    EditMessageReplyMarkup,
+)
+MAX_SEND_ATTEMPTS = 3
+
+
+class OutboundRateLimitMiddleware(BaseRequestMiddleware):
+    """Session middleware that paces message sends through the outbound queue.
+
+    On ``TelegramRetryAfter`` the chat is held for ``retry_after`` seconds and
+    the call is queued again at the same priority.
+    """
+
+    def __init__(self, dispatcher: OutboundDispatcher = outbound_dispatcher):
+        self.dispatcher = dispatcher
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        if not isinstance(method, RATE_LIMITED_METHODS):
+            return await make_request(bot, method)
+
+        chat_id = getattr(method, "chat_id", None)
+        attempt = 1
+        while True:
+            await self.dispatcher.acquire(chat_id)
+            started = time.perf_counter()
+            try:
+                response = await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                if attempt == MAX_SEND_ATTEMPTS:
+                    self.dispatcher.record_send(time.perf_counter() - started, False)
+                    raise
+                self.dispatcher.record_retry()
+                self.dispatcher.defer_chat(chat_id, e.retry_after)
+                logger.warning(
+                    f"Flood control on {type(method).__name__} for chat {chat_id}: "
+                    f"requeued for {e.retry_after}s (attempt {attempt}/{MAX_SEND_ATTEMPTS})"
+                )
+                attempt += 1
+                continue
+            except Exception:
+                self.dispatcher.record_send(time.perf_counter() - started, False)
+                raise
+            self.dispatcher.record_send(time.perf_counter() - started, True)
+            return response
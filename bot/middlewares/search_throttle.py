@@ -0,0 +1,158 @@
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.filters import CommandObject
+from aiogram.types import Message, TelegramObject
+
+from bot.utils.i18n import detect_lang, t
+from bot.utils.logging import get_logger
+from bot.utils.search import normalize_search_query_key
+
+logger = get_logger(__name__)
+
+# Handlers that start a new HH search are registered with flags={SEARCH_FLAG: True}
+SEARCH_FLAG = "search"
+SEARCH_LIMIT = 6  # searches started per user within SEARCH_WINDOW
+SEARCH_WINDOW = 60.0  # seconds
+DOUBLE_TAP_WINDOW = 3.0  # a repeated query this soon after the first is merged
+SEARCH_STATE_MAX_SIZE = 10000
+
+
+@dataclass
+class _ChatSearch:
+    query_key: str
+    started_at: float
+    task: asyncio.Task
+
+
+def _search_query(message: Message, data: dict[str, Any]) -> str:
+    """Query a flagged handler would search for; empty when it would not search."""
+    command: CommandObject | None = data.get("command")
+    if command is not None:
+        return (command.args or "").strip()
+    text = (message.text or "").strip()
+    return "" if text.startswith("/") else text
+
+
+class SearchThrottleMiddleware(BaseMiddleware):
+    """Inner message middleware for handlers flagged ``search``.
+
+    The search runs as a task of its own, so a chat's next message is handled
+    while it is still fetching. A new query cancels the chat's running search
+    before its remaining HH pages are requested; the same query sent again while
+    the first is running (or just finished) is dropped. Each user may start
+    ``limit`` searches per ``window`` seconds.
+    """
+
+    def __init__(self, limit: int = SEARCH_LIMIT, window: float = SEARCH_WINDOW):
+        self.limit = limit
+        self.window = window
+        # Key: chat_id, Value: the chat's latest search
+        self._searches: dict[int, _ChatSearch] = {}
+        # Key: tg user id, Value: monotonic start times within the window
+        self._started: dict[int, deque[float]] = {}
+        # Key: tg user id, Value: monotonic time the user was last told to wait
+        self._warned_at: dict[int, float] = {}
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if not isinstance(event, Message) or not get_flag(data, SEARCH_FLAG):
+            return await handler(event, data)
+        query = _search_query(event, data)
+        if not query:
+            return await handler(event, data)
+
+        chat_id = event.chat.id
+        user_id = event.from_user.id if event.from_user else chat_id
+        query_key = normalize_search_query_key(query)
+        now = time.monotonic()
+
+        current = self._searches.get(chat_id)
+        if current is not None and current.query_key == query_key:
+            if not current.task.done() or now - current.started_at < DOUBLE_TAP_WINDOW:
+                logger.debug(f"Merged repeated search '{query}' in chat {chat_id}")
+                return None
+
+        if not self._allow(user_id, now):
+            await self._warn(event, user_id, now)
+            return None
+
+        if current is not None and not current.task.done():
+            logger.debug(f"Cancelling search '{current.query_key}' in chat {chat_id}")
+            current.task.cancel()
+
+        self._prune(now)
+        task = asyncio.create_task(handler(event, data))
+        task.add_done_callback(self._on_done)
+        self._searches[chat_id] = _ChatSearch(query_key, now, task)
+        return None
+
+    async def close(self):
+        """Cancel searches still running, e.g. on shutdown."""
+        tasks = [s.task for s in self._searches.values() if not s.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._searches.clear()
+
+    def _allow(self, user_id: int, now: float) -> bool:
+        started = self._started.setdefault(user_id, deque())
+        while started and now - started[0] >= self.window:
+            started.popleft()
+        if len(started) >= self.limit:
+            return False
+        started.append(now)
+        return True
+
+    async def _warn(self, message: Message, user_id: int, now: float):
+        """Tell the user when the next search is possible, once per window."""
+        warned_at = self._warned_at.get(user_id)
+        if warned_at is not None and now - warned_at < self.window:
+            return
+        self._warned_at[user_id] = now
+        retry_in = math.ceil(self.window - (now - self._started[user_id][0]))
+        lang = detect_lang(
+            message.from_user.language_code if message.from_user else None
+        )
+        logger.info(f"Throttled searches for user {user_id} for {retry_in}s")
+        try:
+            await message.answer(t("search.throttled", lang, seconds=retry_in))
+        except Exception as e:
+            logger.warning(f"Failed to send throttle notice to user {user_id}: {e}")
+
+    def _on_done(self, task: asyncio.Task):
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            logger.error(f"Search task failed: {error}")
+
+    def _prune(self, now: float):
+        if len(self._searches) >= SEARCH_STATE_MAX_SIZE:
+            self._searches = {
+                chat_id: search
+                for chat_id, search in self._searches.items()
+                if not search.task.done() or now - search.started_at < DOUBLE_TAP_WINDOW
+            }
+        if len(self._started) >= SEARCH_STATE_MAX_SIZE:
+            self._started = {
+                user_id: started
+                for user_id, started in self._started.items()
+                if started and now - started[-1] < self.window
+            }
+            self._warned_at = {
+                user_id: warned_at
+                for user_id, warned_at in self._warned_at.items()
+                if now - warned_at < self.window
+            }
@@ -1,4 +1,10 @@
-from bot.services import cv_service, search_service, user_service
+from bot.services import (
+    cv_service,
+    delivery_service,
+    job_run_service,
+    search_service,
+    user_service,
+)
 from bot.services.hh_service import hh_service
 from bot.services.openai_service import openai_service
 
@@ -8,4 +14,6 @@ __all__ = [
     "user_service",
     "search_service",
     "cv_service",
+    "delivery_service",
+    "job_run_service",
 ]
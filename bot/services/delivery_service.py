@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from bot.db import (
+    DeliveredVacancyRepository,
+    PrefetchedSearchRepository,
+    QueryWatermarkRepository,
+)
+from bot.db.database import db_session
+
+
+async def get_delivered_pairs(
+    user_id: int, candidates: dict[str, list[str]]
+) -> set[tuple[str, str]]:
+    async with db_session() as session:
+        if not session:
+            return set()
+        repo = DeliveredVacancyRepository(session)
+        return await repo.get_delivered_pairs(user_id, candidates)
+
+
+async def mark_delivered(user_id: int, vacancy_ids_by_query: dict[str, list[str]]):
+    async with db_session() as session:
+        if not session:
+            return 0
+        repo = DeliveredVacancyRepository(session)
+        return await repo.mark_delivered(user_id, vacancy_ids_by_query)
+
+
+async def purge_delivered_before(cutoff: datetime) -> int:
+    async with db_session() as session:
+        if not session:
+            return 0
+        repo = DeliveredVacancyRepository(session)
+        return await repo.purge_delivered_before(cutoff)
+
+
+async def get_watermarks(
+    user_id: int, query_keys: list[str]
+) -> dict[str, tuple[datetime, str]]:
+    async with db_session() as session:
+        if not session:
+            return {}
+        repo = QueryWatermarkRepository(session)
+        return await repo.get_watermarks(user_id, query_keys)
+
+
+async def advance_watermarks(user_id: int, marks: dict[str, tuple[datetime, str]]):
+    async with db_session() as session:
+        if not session:
+            return
+        repo = QueryWatermarkRepository(session)
+        await repo.advance_watermarks(user_id, marks)
+
+
+async def get_prefetched_search(
+    search_key: str, fetched_after: datetime
+) -> tuple[dict, int] | None:
+    async with db_session() as session:
+        if not session:
+            return None
+        repo = PrefetchedSearchRepository(session)
+        return await repo.get(search_key, fetched_after)
+
+
+async def store_prefetched_search(
+    search_key: str, result: dict, response_time: int, fetched_at: datetime
+):
+    async with db_session() as session:
+        if not session:
+            return
+        repo = PrefetchedSearchRepository(session)
+        await repo.store(search_key, result, response_time, fetched_at)
+
+
+async def purge_prefetched_searches_before(cutoff: datetime) -> int:
+    async with db_session() as session:
+        if not session:
+            return 0
+        repo = PrefetchedSearchRepository(session)
+        return await repo.purge_before(cutoff)
@@ -58,6 +58,8 @@ class HHService:
         freshness_days: int | None = None,
         employment: str | None = None,
         experience: str | None = None,
+        order_by: str | None = None,
+        date_from: str | None = None,
     ) -> dict | None:
         """Search for vacancies with comprehensive logging
 
@@ -72,6 +74,8 @@ class HHService:
             freshness_days: Only vacancies published in last N days (HH 'period' param)
             employment: Employment type (full, part, project, volunteer, probation)
             experience: Experience level (noExperience, between1And3, between3And6, moreThan6)
+            order_by: Sort order, e.g. 'publication_time' (HH default is relevance)
+            date_from: ISO 8601 lower bound for publication time
         """
         if not self.session:
             hh_logger.error("HTTP session not initialized")
@@ -103,6 +107,10 @@ class HHService:
                 params["employment"] = employment
             if experience:
                 params["experience"] = experience
+            if order_by:
+                params["order_by"] = order_by
+            if date_from:
+                params["date_from"] = date_from
 
             response = await self.session.get("/vacancies", params=params)
             response.raise_for_status()
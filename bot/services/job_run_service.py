@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import os
+import socket
+from datetime import datetime
+
+from bot.db import DeliveryRunRepository, JobRunRepository
+from bot.db.database import db_session
+
+# Identifies the replica that claimed a run, for debugging only
+OWNER = f"{socket.gethostname()}:{os.getpid()}"[:128]
+
+
+async def claim_job_run(job_id: str, slot_at: datetime) -> bool:
+    async with db_session() as session:
+        if not session:
+            return False
+        repo = JobRunRepository(session)
+        return await repo.claim(job_id, slot_at, OWNER)
+
+
+async def purge_job_runs_before(cutoff: datetime) -> int:
+    async with db_session() as session:
+        if not session:
+            return 0
+        repo = JobRunRepository(session)
+        return await repo.purge_before(cutoff)
+
+
+async def record_delivery_run(run: dict):
+    async with db_session() as session:
+        if not session:
+            return
+        repo = DeliveryRunRepository(session)
+        await repo.add({**run, "owner": OWNER})
+
+
+async def purge_delivery_runs_before(cutoff: datetime) -> int:
+    async with db_session() as session:
+        if not session:
+            return 0
+        repo = DeliveryRunRepository(session)
+        return await repo.purge_before(cutoff)
@@ -1,12 +1,16 @@
 import asyncio
+import importlib
 from collections.abc import AsyncIterator
-
-import openai
+from typing import TYPE_CHECKING
 
 from bot.config import settings
 from bot.utils.logging import get_logger
 from bot.utils.prompt_loader import load_prompt
 
+if TYPE_CHECKING:
+    # The SDK takes ~0.4s to import; methods import it on first LLM use
+    import openai
+
 # Create logger for this module
 openai_logger = get_logger(__name__)
 
@@ -69,6 +73,9 @@ class OpenAIService:
                 )
                 return False
 
+            # Loaded in a thread so startup steps sharing the loop are not blocked
+            openai = await asyncio.to_thread(importlib.import_module, "openai")
+
             # Use custom API base URL if provided
             client_params = {"api_key": self.settings.LLM_API_KEY}
 
@@ -103,6 +110,8 @@ class OpenAIService:
         llm_overrides: dict | None = None,
     ) -> str | None:
         """Create a chat completion with comprehensive logging"""
+        import openai
+
         # Resolve model/connection parameters
         override_model = llm_overrides.get("model") if llm_overrides else None
         override_api_key = llm_overrides.get("api_key") if llm_overrides else None
@@ -198,6 +207,8 @@ class OpenAIService:
         llm_overrides: dict | None = None,
     ) -> AsyncIterator[str]:
         """Stream chat completion deltas from the LLM."""
+        import openai
+
         override_model = llm_overrides.get("model") if llm_overrides else None
         override_api_key = llm_overrides.get("api_key") if llm_overrides else None
         override_base_url = llm_overrides.get("base_url") if llm_overrides else None
@@ -34,12 +34,14 @@ async def create_search_query(
     results_count: int = 0,
     response_time: int | None = None,
     session=None,
+    search_params: dict | None = None,
 ):
     if session:
         repo = SearchQueryRepository(session)
         return await repo.create_search_query(
             user_id=user_id,
             query_text=query_text,
+            search_params=search_params,
             results_count=results_count,
             response_time=response_time,
         )
@@ -50,6 +52,7 @@ async def create_search_query(
         return await repo.create_search_query(
             user_id=user_id,
             query_text=query_text,
+            search_params=search_params,
             results_count=results_count,
             response_time=response_time,
         )
@@ -68,3 +71,14 @@ async def get_latest_search_query(user_id: int, query_text: str, session=None):
         return await repo.get_latest_search_query(
             user_id=user_id, query_text=query_text
         )
+
+
+async def get_search_query_by_id(user_id: int, search_query_id: int, session=None):
+    if session:
+        repo = SearchQueryRepository(session)
+        return await repo.get_search_query_by_id(user_id, search_query_id)
+    async with db_session() as session_cm:
+        if not session_cm:
+            return None
+        repo = SearchQueryRepository(session_cm)
+        return await repo.get_search_query_by_id(user_id, search_query_id)
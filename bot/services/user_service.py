@@ -38,6 +38,51 @@ async def get_users_with_schedule():
         return await repo.get_users_with_schedule()
 
 
+async def claim_due_users(
+    now_utc, limit: int, dormant_before=None, dormant_interval=None
+):
+    async with db_session() as session:
+        if not session:
+            return []
+        repo = UserRepository(session)
+        return await repo.claim_due_users(
+            now_utc, limit, dormant_before, dormant_interval
+        )
+
+
+async def mark_seen(tg_user_id: str, seen_at) -> bool:
+    async with db_session() as session:
+        if not session:
+            return False
+        repo = UserRepository(session)
+        return await repo.mark_seen(tg_user_id, seen_at)
+
+
+async def deactivate_user(tg_user_id: str) -> bool:
+    async with db_session() as session:
+        if not session:
+            return False
+        repo = UserRepository(session)
+        return await repo.deactivate_user(tg_user_id)
+
+
+async def get_users_with_delivery_between(start_utc, end_utc):
+    async with db_session() as session:
+        if not session:
+            return []
+        repo = UserRepository(session)
+        return await repo.get_users_with_delivery_between(start_utc, end_utc)
+
+
+async def set_next_delivery_times(next_delivery_by_user_id: dict) -> bool:
+    async with db_session() as session:
+        if not session:
+            return False
+        repo = UserRepository(session)
+        await repo.set_next_delivery_times(next_delivery_by_user_id)
+        return True
+
+
 async def update_language_code(tg_user_id: str, language_code: str) -> bool:
     async with db_session() as session:
         if not session:
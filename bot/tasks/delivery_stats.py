@@ -0,0 +1,96 @@
+"""Structured per-run statistics for the scheduled delivery job."""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+@dataclass
+class DeliveryRunStats:
+    """Counters for one delivery run; persisted as a delivery_runs row."""
+
+    job: str = "daily_vacancies"
+    started_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    slot_deadline: datetime | None = None
+    users_considered: int = 0  # claimed from the database
+    users_due: int = 0  # claimed and within the missed-slot grace
+    users_sent: int = 0
+    users_dormant: int = 0
+    users_deactivated: int = 0
+    # Key: reason a due user got no message, Value: user count
+    skipped: Counter = field(default_factory=Counter)
+    search_requests: int = 0
+    hh_calls: int = 0
+    prefetch_hits: int = 0
+    telegram_sends: int = 0
+    telegram_failures: int = 0
+    user_ms: list[float] = field(default_factory=list)
+    duration_s: float = 0.0
+
+    def skip(self, reason: str):
+        self.skipped[reason] += 1
+
+    def record_user(self, elapsed: float):
+        self.user_ms.append(elapsed * 1000)
+
+    @property
+    def headroom_s(self) -> float | None:
+        if self.slot_deadline is None:
+            return None
+        return (self.slot_deadline - self.started_at).total_seconds() - self.duration_s
+
+    def user_ms_percentiles(self) -> tuple[float, float, float]:
+        """(p50, p95, max) per-user processing time in milliseconds."""
+        return (
+            _percentile(self.user_ms, 50),
+            _percentile(self.user_ms, 95),
+            max(self.user_ms, default=0.0),
+        )
+
+    def summary(self) -> str:
+        p50, p95, worst = self.user_ms_percentiles()
+        skipped = ", ".join(
+            f"{reason} {count}" for reason, count in self.skipped.most_common()
+        )
+        return (
+            f"{self.users_considered} user(s) claimed, {self.users_due} due, "
+            f"sent to {self.users_sent} in {self.duration_s:.1f}s "
+            f"({self.hh_calls} HH search(es), {self.prefetch_hits} prefetched, "
+            f"for {self.search_requests} user queries; "
+            f"{self.telegram_sends} sends, {self.telegram_failures} failed; "
+            f"per user p50 {p50:.0f}ms p95 {p95:.0f}ms max {worst:.0f}ms)"
+            + (f"; skipped: {skipped}" if skipped else "")
+        )
+
+    def to_row(self, owner: str) -> dict:
+        p50, p95, worst = self.user_ms_percentiles()
+        headroom = self.headroom_s
+        return {
+            "job": self.job,
+            "owner": owner,
+            "started_at": self.started_at,
+            "slot_deadline": self.slot_deadline,
+            "duration_ms": round(self.duration_s * 1000),
+            "headroom_ms": None if headroom is None else round(headroom * 1000),
+            "users_considered": self.users_considered,
+            "users_due": self.users_due,
+            "users_sent": self.users_sent,
+            "users_dormant": self.users_dormant,
+            "users_deactivated": self.users_deactivated,
+            "skipped": dict(self.skipped),
+            "search_requests": self.search_requests,
+            "hh_calls": self.hh_calls,
+            "prefetch_hits": self.prefetch_hits,
+            "telegram_sends": self.telegram_sends,
+            "telegram_failures": self.telegram_failures,
+            "user_ms_p50": round(p50),
+            "user_ms_p95": round(p95),
+            "user_ms_max": round(worst),
+        }
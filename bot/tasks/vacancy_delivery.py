@@ -1,167 +1,642 @@
 from __future__ import annotations
 
-from datetime import UTC, datetime
-from zoneinfo import ZoneInfo
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from itertools import zip_longest
 
 from aiogram import Bot
-
-from bot.handlers.search.common import build_search_keyboard
-from bot.services import search_service, user_service
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
+
+from bot.config import settings
+from bot.services import (
+    delivery_service,
+    job_run_service,
+    search_service,
+    user_service,
+)
 from bot.services.hh_service import hh_service
+from bot.tasks.delivery_stats import DeliveryRunStats
 from bot.utils.i18n import detect_lang
 from bot.utils.logging import get_logger
+from bot.utils.outbound import SendPriority, log_outbound_stats, send_priority
 from bot.utils.search import (
+    DIGEST_PER_PAGE,
+    build_digest_keyboard,
+    build_or_query,
+    build_search_keyboard,
+    cache_session,
     cache_vacancies,
+    format_digest_page,
     format_search_page,
     get_query_thread_map,
-    get_sent_vacancy_ids_by_query,
+    is_newer_than,
     normalize_search_query_key,
-    perform_search,
+    pack_queries,
+    parse_published_at,
+    perform_incremental_search,
+    search_fingerprint,
+    split_by_title,
     store_search_results,
 )
+from bot.utils.time import get_zone
 
 logger = get_logger(__name__)
 
-# Temporary default timezone until user timezones are added to preferences
-DEFAULT_TZ = ZoneInfo("Europe/Moscow")
-MAX_SENT_IDS = 200
+# Slots older than this (e.g. after downtime) are rolled forward without sending
+MISSED_SLOT_GRACE = timedelta(minutes=45)
+# Vacancies older than this may be delivered again for the same query
+DELIVERED_RETENTION = timedelta(days=30)
+# Claims only need to outlive the slot they guard
+JOB_RUN_RETENTION = timedelta(days=2)
+# Run statistics are kept long enough to show capacity trends
+DELIVERY_RUN_RETENTION = timedelta(days=90)
 MAX_VACANCIES_PER_USER = 20
 DAILY_PER_PAGE = 5
 MAX_TRACKED_QUERIES = 50
+# Digest mode: one message per user combining all queries without a forum topic
+DIGEST_MAX_VACANCIES = 50
+DIGEST_QUERY_TEXT = "digest"
+# Combined OR-queries share one page, so request HH's maximum page size
+COMBINED_PER_PAGE = 100
+# Incremental fetches page through results newer than a query's watermark
+INCREMENTAL_PER_PAGE = 50
+INCREMENTAL_MAX_PAGES = 4
+
+# The job fires every SLOT_INTERVAL to pick up users that came due
+SLOT_INTERVAL = timedelta(minutes=1)
+# Users pick delivery times on this grid (see parse_time's minute_step), so a
+# run should finish before the next slot on it, not before the next tick
+SLOT_GRANULARITY = timedelta(minutes=15)
+# Searches are fetched in this window before a user's slot, so the slot itself
+# only deduplicates and sends. Results are kept long enough to cover a late run.
+PREFETCH_LEAD_MAX = timedelta(minutes=15)
+PREFETCH_LEAD_MIN = timedelta(minutes=10)
+PREFETCH_TICK = timedelta(minutes=1)
+PREFETCH_TTL = timedelta(minutes=20)
+# Concurrency limits for one run. Users share the small DB pool, so keep
+# USER_CONCURRENCY modest; HH and Telegram limits are global across users.
+USER_CONCURRENCY = 8
+# Due users are claimed from the database in batches of this size
+CLAIM_BATCH_SIZE = 50
+QUERY_CONCURRENCY_PER_USER = 4
+HH_CONCURRENCY = 6
+TELEGRAM_CONCURRENCY = 20
+
+
+@dataclass
+class DeliveryLimits:
+    """Semaphores shared by every worker of one delivery run."""
+
+    hh: asyncio.Semaphore = field(
+        default_factory=lambda: asyncio.Semaphore(HH_CONCURRENCY)
+    )
+    telegram: asyncio.Semaphore = field(
+        default_factory=lambda: asyncio.Semaphore(TELEGRAM_CONCURRENCY)
+    )
+    queries_per_user: int = QUERY_CONCURRENCY_PER_USER
+
+
+class SharedSearches:
+    """Fetch each distinct (query, area, filters) search once per delivery run.
+
+    Users tracking the same query await the same task; each still filters the
+    shared items against its own watermark and delivered history. ``since`` is
+    floored to the hour so users with nearby watermarks share a fetch. Searches
+    prefetched ahead of the slot are read from the prefetched_searches table, so
+    a user claimed by any replica gets them; with ``keep_results`` new results
+    are stored there for the delivery run to pick up.
+    """
+
+    def __init__(self, limits: DeliveryLimits, keep_results: bool = False):
+        self._limits = limits
+        self._keep_results = keep_results
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.requested = 0
+        self.hh_calls = 0
+        self.prefetch_hits = 0
+
+    async def search(
+        self,
+        query_text: str,
+        area_id: str | None,
+        filters: dict | None,
+        per_page: int = MAX_VACANCIES_PER_USER,
+        since: datetime | None = None,
+    ) -> tuple[dict | None, int]:
+        self.requested += 1
+        if since is not None:
+            since = since.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+        since_key = since.isoformat() if since else "-"
+        key = (
+            f"{search_fingerprint(query_text, area_id, filters)}|{per_page}|{since_key}"
+        )
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._fetch(key, query_text, area_id, filters, per_page, since)
+            )
+            self._tasks[key] = task
+        return await task
+
+    async def _fetch(
+        self,
+        key: str,
+        query_text: str,
+        area_id: str | None,
+        filters: dict | None,
+        per_page: int,
+        since: datetime | None,
+    ) -> tuple[dict | None, int]:
+        prefetched = await self._get_prefetched(key)
+        if prefetched is not None:
+            self.prefetch_hits += 1
+            return prefetched
+        async with self._limits.hh:
+            self.hh_calls += 1
+            page_size = max(per_page, INCREMENTAL_PER_PAGE)
+            result = await perform_incremental_search(
+                query_text,
+                since,
+                # With a watermark, page back to it: the oldest new items go first
+                limit=per_page if since is None else page_size * INCREMENTAL_MAX_PAGES,
+                area_id=area_id,
+                filters=filters,
+                per_page=page_size,
+                max_pages=INCREMENTAL_MAX_PAGES,
+            )
+        if self._keep_results and result[0] is not None:
+            try:
+                await delivery_service.store_prefetched_search(
+                    key, result[0], result[1], datetime.now(UTC)
+                )
+            except Exception as e:
+                logger.warning(f"Failed to store prefetched search: {e}")
+        return result
+
+    @staticmethod
+    async def _get_prefetched(key: str) -> tuple[dict, int] | None:
+        try:
+            return await delivery_service.get_prefetched_search(
+                key, datetime.now(UTC) - PREFETCH_TTL
+            )
+        except Exception as e:
+            logger.warning(f"Failed to read prefetched search: {e}")
+            return None
 
 
-def _already_sent_today(prefs: dict, now_local: datetime, schedule_time: str) -> bool:
-    last_sent_raw = prefs.get("vacancy_last_sent_at")
-    if not last_sent_raw:
-        return False
-    try:
-        last_dt = datetime.fromisoformat(last_sent_raw)
-        if last_dt.tzinfo is None:
-            last_dt = last_dt.replace(tzinfo=UTC)
-        last_local = last_dt.astimezone(now_local.tzinfo)
-        # If schedule time changed for today, allow sending again
-        if last_local.strftime("%Y-%m-%d") == now_local.strftime("%Y-%m-%d"):
-            if last_local.strftime("%H:%M") != schedule_time:
-                return False
-            return True
-        return False
-    except Exception:
-        return False
+def _dormant_before(now_utc: datetime) -> datetime | None:
+    if settings.DELIVERY_DORMANT_AFTER_DAYS <= 0:
+        return None
+    return now_utc - timedelta(days=settings.DELIVERY_DORMANT_AFTER_DAYS)
 
 
-def _get_timezone(prefs: dict) -> ZoneInfo:
-    tz_name = prefs.get("timezone")
-    if tz_name:
-        try:
-            return ZoneInfo(tz_name)
-        except Exception:
-            logger.debug(f"Invalid timezone '{tz_name}', falling back to default")
-    return DEFAULT_TZ
+def _is_recipient_gone(error: Exception) -> bool:
+    """True when Telegram will refuse every further message to this chat."""
+    if isinstance(error, TelegramForbiddenError):
+        return True
+    return isinstance(error, TelegramBadRequest) and "chat not found" in str(error)
+
+
+def _slot_deadline(now_utc: datetime) -> datetime:
+    slot_minutes = int(SLOT_GRANULARITY.total_seconds() // 60)
+    slot_start = now_utc.replace(
+        minute=now_utc.minute - now_utc.minute % slot_minutes,
+        second=0,
+        microsecond=0,
+    )
+    return slot_start + SLOT_GRANULARITY
 
 
 async def run_daily_vacancies(bot: Bot):
-    """Send daily vacancies to users with a schedule time set."""
+    """Send daily vacancies to users whose next delivery time has arrived."""
     if not hh_service.session:
         logger.warning("HH service not initialized; skipping daily vacancies job")
         return
 
+    started = time.monotonic()
     now_utc = datetime.now(UTC)
-    users = await user_service.get_users_with_schedule()
+    deadline = _slot_deadline(now_utc)
+    stats = DeliveryRunStats(started_at=now_utc, slot_deadline=deadline)
+    dormant_before = _dormant_before(now_utc)
+    dormant_interval = timedelta(days=settings.DELIVERY_DORMANT_INTERVAL_DAYS)
+
+    async def claim() -> list:
+        # Claiming rolls each user to their next slot before sending, so an
+        # overrunning run, a crash mid-way or another replica never delivers
+        # the same slot twice. Dormant users are rolled further ahead.
+        return await user_service.claim_due_users(
+            now_utc, CLAIM_BATCH_SIZE, dormant_before, dormant_interval
+        )
 
-    processed = 0
-    for user in users:
-        try:
-            sent = await send_vacancies_to_user(user, bot, now_utc)
-            if sent:
-                processed += 1
-        except Exception as e:
-            logger.error(f"Failed to process user {user.tg_user_id} in scheduler: {e}")
+    batch = await claim()
+    if not batch:
+        return
 
-    if processed:
-        logger.debug(f"Daily vacancies job finished, sent to {processed} user(s)")
+    # Bounded, so a replica claims the next batch only once workers catch up
+    queue: asyncio.Queue = asyncio.Queue(maxsize=CLAIM_BATCH_SIZE)
+    limits = DeliveryLimits()
+    searches = SharedSearches(limits)
 
+    async def producer(batch: list):
+        try:
+            while batch:
+                stats.users_considered += len(batch)
+                for user, slot_at in batch:
+                    if (
+                        dormant_before
+                        and user.last_seen_at
+                        and user.last_seen_at < dormant_before
+                    ):
+                        stats.users_dormant += 1
+                    if slot_at < now_utc - MISSED_SLOT_GRACE:
+                        logger.info(
+                            f"Skip user {user.tg_user_id}: slot {slot_at.isoformat()} missed"
+                        )
+                        stats.skip("missed_slot")
+                        continue
+                    stats.users_due += 1
+                    await queue.put(user)
+                if len(batch) < CLAIM_BATCH_SIZE:
+                    break
+                batch = await claim()
+        finally:
+            for _ in range(USER_CONCURRENCY):
+                await queue.put(None)
+
+    async def worker():
+        while (user := await queue.get()) is not None:
+            user_started = time.monotonic()
+            try:
+                if await send_vacancies_to_user(
+                    user,
+                    bot,
+                    now_utc,
+                    limits=limits,
+                    searches=searches,
+                    stats=stats,
+                ):
+                    stats.users_sent += 1
+            except Exception as e:
+                logger.error(
+                    f"Failed to process user {user.tg_user_id} in scheduler: {e}"
+                )
+                stats.skip("error")
+            stats.record_user(time.monotonic() - user_started)
+            if not user.is_active:
+                stats.users_deactivated += 1
+
+    # Scheduled digests queue behind interactive replies in the outbound queue
+    with send_priority(SendPriority.BULK):
+        await asyncio.gather(
+            producer(batch), *(worker() for _ in range(USER_CONCURRENCY))
+        )
 
-async def send_vacancies_to_user(
-    user, bot: Bot, now_utc: datetime, force: bool = False, mark_sent: bool = True
-):
+    stats.duration_s = time.monotonic() - started
+    stats.search_requests = searches.requested
+    stats.hh_calls = searches.hh_calls
+    stats.prefetch_hits = searches.prefetch_hits
+    headroom = stats.headroom_s
+    summary = f"Daily vacancies job: {stats.summary()}"
+    if stats.users_dormant or stats.users_deactivated:
+        # Each dormant claim skips the deliveries until its next, distant slot;
+        # deactivated users are not claimed again until they write to the bot.
+        skipped = stats.users_dormant * max(dormant_interval.days - 1, 0)
+        summary += (
+            f"; {stats.users_dormant} dormant user(s) moved to every "
+            f"{dormant_interval.days} days ({skipped} daily deliveries skipped), "
+            f"{stats.users_deactivated} deactivated"
+        )
+    if headroom < 0:
+        logger.warning(
+            f"{summary}; overran slot deadline {deadline:%H:%M} UTC by {-headroom:.0f}s"
+        )
+    else:
+        logger.info(
+            f"{summary}; {headroom:.0f}s left before slot deadline {deadline:%H:%M} UTC"
+        )
+    log_outbound_stats()
+    try:
+        await job_run_service.record_delivery_run(stats.to_row(job_run_service.OWNER))
+    except Exception as e:
+        logger.error(f"Failed to record delivery run stats: {e}")
+
+
+async def fetch_user_queries(
+    user,
+    searches: SharedSearches,
+    limits: DeliveryLimits,
+    use_watermarks: bool = True,
+) -> list[tuple[str, str, list[dict], int]] | None:
+    """Fetch a user's tracked queries as (text, key, items, response_time).
+
+    With ``use_watermarks`` only vacancies published after each query's last
+    delivered one are fetched. Returns None when the user has no saved queries.
+    Results keep query order.
+    """
     prefs = user.preferences or {}
-    user_tz = _get_timezone(prefs)
-    now_local = now_utc.astimezone(user_tz)
+    now_local = datetime.now(get_zone(prefs.get("timezone")))
     current_time = now_local.strftime("%H:%M")
 
-    schedule_time = prefs.get("vacancy_schedule_time")
-    if not schedule_time:
-        return False
-
-    if not force and schedule_time != current_time:
-        return False
-
-    if not force and _already_sent_today(prefs, now_local, schedule_time):
-        return False
-
-    lang = detect_lang(user.language_code)
     query_records = await search_service.get_recent_distinct_search_queries(
         user.id, limit=MAX_TRACKED_QUERIES
     )
     if not query_records:
-        logger.info(f"Skip user {user.tg_user_id}: no saved search queries")
-        return False
+        return None
 
-    query_threads = get_query_thread_map(prefs)
-    sent_ids_by_query = get_sent_vacancy_ids_by_query(prefs)
     filters = prefs.get("search_filters", {})
     area_id = user.hh_area_id
-    any_sent = False
-    updated_sent_ids_by_query = dict(sent_ids_by_query)
-
-    for query_record in query_records:
-        query_text = (query_record.query_text or "").strip()
-        if not query_text:
-            continue
-
-        query_key = normalize_search_query_key(query_text)
-        sent_ids = updated_sent_ids_by_query.get(query_key, [])
-        sent_ids_set = set(sent_ids)
+    query_semaphore = asyncio.Semaphore(limits.queries_per_user)
+    marks: dict[str, tuple[datetime, str]] = {}
+
+    async def fetch(group: list[str]) -> dict[str, tuple[str, str, list[dict], int]]:
+        search_text = build_or_query(group)
+        per_page = COMBINED_PER_PAGE if len(group) > 1 else MAX_VACANCIES_PER_USER
+        # A query without a watermark needs the full (newest-first) result set
+        group_marks = [marks.get(normalize_search_query_key(q)) for q in group]
+        since = (
+            min(mark[0] for mark in group_marks)
+            if all(mark is not None for mark in group_marks)
+            else None
+        )
+        async with query_semaphore:
+            try:
+                results, response_time = await searches.search(
+                    search_text, area_id, filters, per_page=per_page, since=since
+                )
+            except Exception as e:
+                logger.error(
+                    f"Search failed for user {user.tg_user_id}, query '{search_text}': {e}"
+                )
+                return {}
+
+        items = (results or {}).get("items") or []
+        items_by_query = (
+            split_by_title(items, group) if len(group) > 1 else {group[0]: items}
+        )
 
-        try:
-            results, response_time = await perform_search(
+        fetched_group = {}
+        for query_text, query_items in items_by_query.items():
+            query_key = normalize_search_query_key(query_text)
+            mark = marks.get(query_key)
+            query_items = [item for item in query_items if is_newer_than(item, mark)]
+            if not query_items:
+                logger.info(
+                    f"No vacancies found for user {user.tg_user_id}, query '{query_text}' at {current_time}"
+                )
+                continue
+            # Items are newest first. Past a watermark, send the oldest new ones
+            # so the mark moves up to them and the rest follow on the next run.
+            fetched_group[query_text] = (
                 query_text,
-                per_page=MAX_VACANCIES_PER_USER,
-                max_pages=1,
-                search_in_name_only=True,
-                area_id=area_id,
-                filters=filters,
+                query_key,
+                query_items[-MAX_VACANCIES_PER_USER:]
+                if mark is not None
+                else query_items[:MAX_VACANCIES_PER_USER],
+                response_time,
             )
-        except Exception as e:
-            logger.error(
-                f"Search failed for user {user.tg_user_id}, query '{query_text}': {e}"
+        return fetched_group
+
+    query_texts = [
+        query_text
+        for query_record in query_records
+        if (query_text := (query_record.query_text or "").strip())
+    ]
+    if settings.DELIVERY_COMBINED_QUERIES:
+        groups = pack_queries(query_texts)
+    else:
+        groups = [[query_text] for query_text in query_texts]
+
+    if use_watermarks:
+        try:
+            marks = await delivery_service.get_watermarks(
+                user.id,
+                list({normalize_search_query_key(text) for text in query_texts}),
             )
-            continue
-
-        if not results or not results.get("items"):
+        except Exception as e:
+            logger.error(f"Failed to load watermarks for user {user.tg_user_id}: {e}")
+
+    fetched_by_query: dict[str, tuple[str, str, list[dict], int]] = {}
+    for fetched_group in await asyncio.gather(*(fetch(group) for group in groups)):
+        fetched_by_query.update(fetched_group)
+    return [
+        fetched_by_query[query_text]
+        for query_text in query_texts
+        if query_text in fetched_by_query
+    ]
+
+
+def _delivered_watermark(
+    vacancies: list[dict], sent_ids: set[str]
+) -> tuple[datetime, str] | None:
+    """Newest (published_at, vacancy id) below which all ``vacancies`` were sent.
+
+    Vacancies left out of a message (past the digest cap) stay above the
+    mark, so the next run fetches them again instead of skipping them.
+    """
+    dated = sorted(
+        (published_at, str(vac.get("id")))
+        for vac in vacancies
+        if vac.get("id") and (published_at := parse_published_at(vac))
+    )
+    mark = None
+    for published_at, vacancy_id in dated:
+        if vacancy_id not in sent_ids:
+            break
+        mark = (published_at, vacancy_id)
+    return mark
+
+
+def _merge_digest(
+    entries: list[tuple[str, str, list[dict], int]],
+) -> tuple[list[dict], dict[str, list[dict]]]:
+    """Interleave the queries' vacancies round-robin, dropping repeats.
+
+    Returns the digest and, per query key, the vacancies it covers for that
+    query (including ones first listed under another query).
+    """
+    digest: list[dict] = []
+    seen_ids: set[str] = set()
+    included_by_query: dict[str, list[dict]] = {key: [] for _, key, _, _ in entries}
+    for row in zip_longest(*(vacancies for _, _, vacancies, _ in entries)):
+        for (_, query_key, _, _), vacancy in zip(entries, row, strict=True):
+            if vacancy is None:
+                continue
+            vacancy_id = str(vacancy.get("id"))
+            if vacancy_id not in seen_ids:
+                if len(digest) >= DIGEST_MAX_VACANCIES:
+                    continue
+                seen_ids.add(vacancy_id)
+                digest.append(vacancy)
+            included_by_query[query_key].append(vacancy)
+    return digest, included_by_query
+
+
+async def _send_delivery(
+    user,
+    bot: Bot,
+    limits: DeliveryLimits,
+    send_kwargs: dict,
+    what: str,
+    stats: DeliveryRunStats,
+) -> bool:
+    """Send one delivery message; deactivate the user if their chat is gone."""
+    try:
+        async with limits.telegram:
+            await bot.send_message(**send_kwargs)
+        stats.telegram_sends += 1
+        return True
+    except Exception as e:
+        stats.telegram_failures += 1
+        if _is_recipient_gone(e):
             logger.info(
-                f"No vacancies found for user {user.tg_user_id}, query '{query_text}' at {current_time}"
+                f"User {user.tg_user_id} is unreachable ({e}); excluding from delivery"
             )
-            continue
+            await user_service.deactivate_user(user.tg_user_id)
+            user.is_active = False
+        else:
+            logger.error(f"Failed to send {what} to user {user.tg_user_id}: {e}")
+        return False
+
 
-        vacancies_all = results.get("items", [])
+async def send_vacancies_to_user(
+    user,
+    bot: Bot,
+    now_utc: datetime,
+    force: bool = False,
+    mark_sent: bool = True,
+    limits: DeliveryLimits | None = None,
+    searches: SharedSearches | None = None,
+    stats: DeliveryRunStats | None = None,
+):
+    limits = limits or DeliveryLimits()
+    searches = searches or SharedSearches(limits)
+    stats = stats or DeliveryRunStats()
+    prefs = user.preferences or {}
+
+    schedule_time = prefs.get("vacancy_schedule_time")
+    if not schedule_time:
+        stats.skip("no_schedule")
+        return False
+
+    lang = detect_lang(user.language_code)
+    query_threads = get_query_thread_map(prefs)
+
+    # Fetch every tracked query first so delivered ids are checked in one batch.
+    # Results come back in query order, so messages keep their sequence.
+    fetched = await fetch_user_queries(user, searches, limits, use_watermarks=not force)
+    if fetched is None:
+        logger.info(f"Skip user {user.tg_user_id}: no saved search queries")
+        stats.skip("no_queries")
+        return False
+
+    delivered_pairs: set[tuple[str, str]] = set()
+    if not force and fetched:
+        delivered_pairs = await delivery_service.get_delivered_pairs(
+            user.id,
+            {
+                query_key: [str(vac.get("id")) for vac in items if vac.get("id")]
+                for _, query_key, items, _ in fetched
+            },
+        )
+
+    pending: list[tuple[str, str, list[dict], int]] = []
+    for query_text, query_key, vacancies_all, response_time in fetched:
         vacancies_filtered = [
-            vac for vac in vacancies_all if force or vac.get("id") not in sent_ids_set
+            vac
+            for vac in vacancies_all
+            if (query_key, str(vac.get("id"))) not in delivered_pairs
         ]
         if not vacancies_filtered:
             logger.info(
                 f"All vacancies already sent to user {user.tg_user_id} for query '{query_text}', skipping"
             )
             continue
+        pending.append(
+            (
+                query_text,
+                query_key,
+                vacancies_filtered[:MAX_VACANCIES_PER_USER],
+                response_time,
+            )
+        )
+
+    digest_entries: list[tuple[str, str, list[dict], int]] = []
+    if settings.DELIVERY_DIGEST:
+        # Queries bound to forum topics keep their own message in their thread
+        digest_entries = [entry for entry in pending if entry[1] not in query_threads]
+        if len(digest_entries) < 2:
+            digest_entries = []
+
+    any_sent = False
+    delivered_by_query: dict[str, list[str]] = {}
+    fetched_by_query = {query_key: items for _, query_key, items, _ in fetched}
+    new_marks: dict[str, tuple[datetime, str]] = {}
+
+    def record_delivered(query_key: str, vacancies: list[dict]):
+        if not mark_sent:
+            return
+        delivered_by_query[query_key] = [
+            str(vac.get("id")) for vac in vacancies if vac.get("id")
+        ]
+        sent_ids = set(delivered_by_query[query_key]) | {
+            vacancy_id for key, vacancy_id in delivered_pairs if key == query_key
+        }
+        mark = _delivered_watermark(fetched_by_query.get(query_key, []), sent_ids)
+        if mark is not None:
+            new_marks[query_key] = mark
+
+    if digest_entries:
+        digest, included_by_query = _merge_digest(digest_entries)
+        queries = [query_text for query_text, _, _, _ in digest_entries]
+        digest_id = await store_search_results(
+            user.id,
+            DIGEST_QUERY_TEXT,
+            digest,
+            max(response_time for _, _, _, response_time in digest_entries),
+            per_page=DIGEST_PER_PAGE,
+            search_params={"digest": True, "queries": queries},
+        )
+        if digest_id is None:
+            # Without a stored digest its pages cannot be served; send per query
+            digest_entries = []
+        else:
+            total_pages = (len(digest) + DIGEST_PER_PAGE - 1) // DIGEST_PER_PAGE
+            send_kwargs = {
+                "chat_id": user.tg_user_id,
+                "text": format_digest_page(queries, digest, 0, DIGEST_PER_PAGE, lang),
+                "parse_mode": "HTML",
+                "disable_web_page_preview": True,
+                "reply_markup": build_digest_keyboard(digest_id, 0, total_pages),
+            }
+            if await _send_delivery(user, bot, limits, send_kwargs, "digest", stats):
+                any_sent = True
+                for query_key, vacancies in included_by_query.items():
+                    record_delivered(query_key, vacancies)
+                logger.info(
+                    f"Sent digest of {len(digest)} vacancies from {len(queries)} "
+                    f"queries to user {user.tg_user_id}"
+                )
+
+    digest_keys = {query_key for _, query_key, _, _ in digest_entries}
+    for query_text, query_key, vacancies, response_time in pending:
+        if not user.is_active:
+            break
+        if query_key in digest_keys:
+            continue
 
-        vacancies = vacancies_filtered[:MAX_VACANCIES_PER_USER]
         total_found = len(vacancies)
         per_page = DAILY_PER_PAGE
 
-        await store_search_results(
+        search_id = await store_search_results(
             user.id, query_text, vacancies, response_time, per_page=per_page
         )
         cache_vacancies(user.id, query_text, vacancies, total_found)
+        search_ref = query_text
+        if search_id is not None:
+            cache_session(user.id, search_id, query_text, vacancies, total_found)
+            search_ref = search_id
 
         page = 0
         total_pages = (len(vacancies) + per_page - 1) // per_page
@@ -169,7 +644,7 @@ async def send_vacancies_to_user(
             query_text, vacancies, page, per_page, total_found, lang
         )
         reply_markup = build_search_keyboard(
-            query_text, page, total_pages, per_page, len(vacancies)
+            search_ref, page, total_pages, per_page, len(vacancies)
         )
 
         send_kwargs = {
@@ -183,29 +658,133 @@ async def send_vacancies_to_user(
         if thread_id:
             send_kwargs["message_thread_id"] = thread_id
 
-        try:
-            await bot.send_message(**send_kwargs)
-        except Exception as e:
-            logger.error(
-                f"Failed to send vacancies to user {user.tg_user_id} for query '{query_text}': {e}"
-            )
+        if not await _send_delivery(
+            user,
+            bot,
+            limits,
+            send_kwargs,
+            f"vacancies for query '{query_text}'",
+            stats,
+        ):
             continue
 
         any_sent = True
-        if not mark_sent:
-            continue
-
-        new_ids = [str(vac.get("id")) for vac in vacancies if vac.get("id")]
-        updated_sent_ids_by_query[query_key] = (sent_ids + new_ids)[-MAX_SENT_IDS:]
+        record_delivered(query_key, vacancies)
 
     if not any_sent:
+        if not user.is_active:
+            stats.skip("unreachable")
+        elif pending:
+            stats.skip("send_failed")
+        else:
+            stats.skip("nothing_new")
         return False
 
     if mark_sent:
+        try:
+            await delivery_service.mark_delivered(user.id, delivered_by_query)
+        except Exception as e:
+            logger.error(
+                f"Failed to record delivered vacancies for user {user.tg_user_id}: {e}"
+            )
+        try:
+            await delivery_service.advance_watermarks(user.id, new_marks)
+        except Exception as e:
+            logger.error(
+                f"Failed to advance watermarks for user {user.tg_user_id}: {e}"
+            )
         await user_service.update_preferences(
-            user.tg_user_id,
-            vacancy_last_sent_at=now_utc.isoformat(),
-            sent_vacancy_ids_by_query=updated_sent_ids_by_query,
+            user.tg_user_id, vacancy_last_sent_at=now_utc.isoformat()
         )
 
     return True
+
+
+def _prefetch_at(user) -> datetime:
+    """Stable per-user moment in the prefetch window, spreading a slot's users evenly."""
+    window = int((PREFETCH_LEAD_MAX - PREFETCH_LEAD_MIN).total_seconds())
+    offset = (user.id * 2654435761) % window  # multiplicative hash of the id
+    return user.next_delivery_at - PREFETCH_LEAD_MAX + timedelta(seconds=offset)
+
+
+# Running prefetch ticks; referenced here so they are not garbage-collected
+_prefetch_tasks: set[asyncio.Task] = set()
+
+
+async def prefetch_scheduled_searches():
+    """Start fetching searches for users whose prefetch moment falls in this tick.
+
+    Each user is prefetched once, 10–15 minutes before their slot, at a moment
+    derived from their id. The fetching runs as a task that waits for each
+    user's moment, so the job returns at once and never holds up the next
+    tick. Users the prefetch missed (e.g. the schedule changed) are fetched
+    live at the slot.
+    """
+    if not hh_service.session:
+        return
+
+    tick = datetime.now(UTC).replace(second=0, microsecond=0)
+    tick_end = tick + PREFETCH_TICK
+    candidates = await user_service.get_users_with_delivery_between(
+        tick + PREFETCH_LEAD_MIN, tick_end + PREFETCH_LEAD_MAX
+    )
+    users = [user for user in candidates if tick <= _prefetch_at(user) < tick_end]
+    if not users:
+        return
+    # One replica prefetches each tick; the others would only repeat HH calls
+    try:
+        if not await job_run_service.claim_job_run("prefetch_scheduled_searches", tick):
+            return
+    except Exception as e:
+        logger.error(f"Failed to claim prefetch tick {tick.isoformat()}: {e}")
+        return
+    try:
+        await delivery_service.purge_prefetched_searches_before(tick - PREFETCH_TTL)
+    except Exception as e:
+        logger.warning(f"Failed to purge expired prefetched searches: {e}")
+
+    task = asyncio.create_task(_prefetch_users(users))
+    _prefetch_tasks.add(task)
+    task.add_done_callback(_prefetch_tasks.discard)
+
+
+async def _prefetch_users(users: list):
+    """Fetch each user's searches at their prefetch moment."""
+    limits = DeliveryLimits()
+    searches = SharedSearches(limits, keep_results=True)
+    user_semaphore = asyncio.Semaphore(USER_CONCURRENCY)
+
+    async def prefetch(user):
+        delay = (_prefetch_at(user) - datetime.now(UTC)).total_seconds()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        async with user_semaphore:
+            try:
+                await fetch_user_queries(user, searches, limits)
+            except Exception as e:
+                logger.error(
+                    f"Failed to prefetch searches for user {user.tg_user_id}: {e}"
+                )
+
+    await asyncio.gather(*(prefetch(user) for user in users))
+    logger.info(
+        f"Prefetched {searches.hh_calls} HH search(es) for {len(users)} user(s) "
+        f"({searches.prefetch_hits} already prefetched)"
+    )
+
+
+async def purge_delivered_vacancies():
+    """Drop delivery records, job claims and run stats past their retention windows."""
+    now_utc = datetime.now(UTC)
+    day = now_utc.replace(hour=0, minute=0, second=0, microsecond=0)
+    try:
+        if not await job_run_service.claim_job_run("purge_delivered_vacancies", day):
+            return
+        await delivery_service.purge_delivered_before(now_utc - DELIVERED_RETENTION)
+        await job_run_service.purge_job_runs_before(now_utc - JOB_RUN_RETENTION)
+        await job_run_service.purge_delivery_runs_before(
+            now_utc - DELIVERY_RUN_RETENTION
+        )
+        await delivery_service.purge_prefetched_searches_before(now_utc - PREFETCH_TTL)
+    except Exception as e:
+        logger.error(f"Failed to purge delivered vacancies: {e}")
@@ -1,19 +1,21 @@
-from functools import lru_cache
-from pathlib import Path
-
-import yaml
+from string import Formatter
 
 from bot.utils.logging import get_logger
+from bot.utils.resources import ReloadableResource, i18n_sources, read_i18n_sources
 
 logger = get_logger(__name__)
 
-BASE_DIR = Path(__file__).resolve().parent.parent
-REPO_ROOT = BASE_DIR.parent
-I18N_DIR = REPO_ROOT / "i18n"
+DEFAULT_LANG = "en"
+
+# hardcoded fallbacks for critical keys to avoid breaking user-facing text
+FALLBACKS = {
+    "profile.on": {"en": "On", "ru": "Вкл"},
+    "profile.on_tick": {"en": "On ✅", "ru": "Вкл ✅"},
+    "profile.off": {"en": "Off", "ru": "Выкл"},
+}
 
-if not I18N_DIR.exists():
-    # Fallback for environments where package data lives next to bot/
-    I18N_DIR = BASE_DIR / "i18n"
+# (lang, key) pairs already reported as missing
+_missing: set[tuple[str, str]] = set()
 
 
 def detect_lang(user_lang: str | None) -> str:
@@ -25,56 +27,64 @@ def detect_lang(user_lang: str | None) -> str:
     return "en"
 
 
-@lru_cache(maxsize=8)
-def _load_lang(lang: str) -> dict:
-    data: dict = {}
-    lang_dir = I18N_DIR / lang
-    if not lang_dir.exists():
-        logger.warning(f"I18N directory not found for lang={lang}")
-        return data
-    for file in lang_dir.glob("*.yml"):
-        try:
-            loaded = yaml.safe_load(file.read_text(encoding="utf-8"))
-            if isinstance(loaded, dict):
-                data.update(loaded)
-        except Exception as e:
-            logger.error(f"Failed to load i18n file {file}: {e}")
-    return data
-
-
-def _get_by_path(data: dict, path: str):
-    cur = data
-    for part in path.split("."):
-        if not isinstance(cur, dict) or part not in cur:
-            return None
-        cur = cur[part]
-    return cur
+def _compile(value: object) -> tuple[str, bool]:
+    """Template and whether it has replacement fields.
 
+    Field-less templates are pre-formatted ("{{" becomes "{"), so t() can
+    return them without calling str.format.
+    """
+    text = str(value)
+    try:
+        has_fields = any(
+            field is not None for _, field, _, _ in Formatter().parse(text)
+        )
+        if not has_fields:
+            text = text.format()
+    except (ValueError, IndexError, KeyError):
+        return text, False
+    return text, has_fields
 
-def t(key: str, lang: str = "en", **kwargs) -> str:
-    lang_data = _load_lang(lang)
-    template = _get_by_path(lang_data, key)
-    if template is None:
-        # In case of stale cache (e.g., paths changed), try reloading once
-        _load_lang.cache_clear()
-        lang_data = _load_lang(lang)
-        template = _get_by_path(lang_data, key)
-    if template is None and lang != "en":
-        # fallback to en
-        template = _get_by_path(_load_lang("en"), key)
-    if template is None:
-        # hardcoded fallbacks for critical keys to avoid breaking user-facing text
-        fallbacks = {
-            "profile.on": {"en": "On", "ru": "Вкл"},
-            "profile.on_tick": {"en": "On ✅", "ru": "Вкл ✅"},
-            "profile.off": {"en": "Off", "ru": "Выкл"},
+
+def _build_catalogs(
+    sources: dict[str, dict[str, object]],
+) -> dict[str, dict[str, tuple[str, bool]]]:
+    """Per language: its keys over the default language's over FALLBACKS.
+
+    Key: lang, Value: flattened catalog, dotted key -> (template, has fields)
+    """
+    catalogs = {}
+    for lang in sources.keys() | {DEFAULT_LANG}:
+        flat: dict[str, object] = {
+            key: texts.get(lang) or texts[DEFAULT_LANG]
+            for key, texts in FALLBACKS.items()
         }
-        if key in fallbacks:
-            template = fallbacks[key].get(lang) or fallbacks[key].get("en")
-    if template is None:
-        logger.warning(f"Missing i18n key: {key} for lang {lang}")
+        flat.update(sources.get(DEFAULT_LANG, {}))
+        flat.update(sources.get(lang, {}))
+        catalogs[lang] = {key: _compile(value) for key, value in flat.items()}
+    return catalogs
+
+
+_catalogs = ReloadableResource("i18n", i18n_sources, read_i18n_sources, _build_catalogs)
+
+
+def load_catalogs() -> int:
+    """Load the catalogs now rather than on first use; returns the language count."""
+    return len(_catalogs.get())
+
+
+def t(key: str, lang: str = "en", **kwargs) -> str:
+    catalogs = _catalogs.get()
+    # Unknown languages share the default catalog
+    entry = (catalogs.get(lang) or catalogs[DEFAULT_LANG]).get(key)
+    if entry is None:
+        if (lang, key) not in _missing:
+            _missing.add((lang, key))
+            logger.warning(f"Missing i18n key: {key} for lang {lang}")
         return key
+    template, has_fields = entry
+    if not has_fields or not kwargs:
+        return template
     try:
         return template.format(**kwargs)
     except Exception:
-        return str(template)
+        return template
@@ -0,0 +1,277 @@
+"""Outbound Telegram pacing: a global token bucket, per-chat spacing and priorities.
+
+Every rate-limited API call waits in one priority queue. A single dispatcher task
+releases waiters when both the global bucket and the target chat allow a send.
+Interactive replies go ahead of bulk sends (scheduled digests); within the same
+priority, sends leave in arrival order, so per-chat ordering is kept.
+"""
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+from bot.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+GLOBAL_RATE = 30  # messages per second across all chats
+GLOBAL_BURST = 30
+PRIVATE_CHAT_INTERVAL = 1.0  # seconds between messages to one private chat
+GROUP_CHAT_INTERVAL = 3.0  # groups allow about 20 messages per minute
+LATENCY_SAMPLES = 1000
+CHAT_STATE_MAX_SIZE = 10000
+
+
+class SendPriority(IntEnum):
+    INTERACTIVE = 0
+    BULK = 10
+
+
+_current_priority: ContextVar[SendPriority] = ContextVar(
+    "send_priority", default=SendPriority.INTERACTIVE
+)
+
+
+@contextmanager
+def send_priority(priority: SendPriority) -> Iterator[None]:
+    """Run API calls made in this context (and tasks it spawns) at ``priority``."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_send_priority() -> SendPriority:
+    return _current_priority.get()
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    chat_id: int | str | None = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(compare=False)
+
+
+def _chat_key(chat_id: int | str | None) -> int | str | None:
+    """One pacing key per chat: ``"123"`` and ``123`` are the same chat."""
+    if isinstance(chat_id, str):
+        try:
+            return int(chat_id)
+        except ValueError:
+            return chat_id  # @channel username
+    return chat_id
+
+
+def _percentile(samples: deque, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+@dataclass
+class OutboundStats:
+    sent: int = 0
+    failed: int = 0
+    retried: int = 0
+    max_depth: int = 0
+    wait_ms: deque = field(default_factory=lambda: deque(maxlen=LATENCY_SAMPLES))
+    send_ms: deque = field(default_factory=lambda: deque(maxlen=LATENCY_SAMPLES))
+
+    def summary(self, depth: int) -> str:
+        return (
+            f"sent {self.sent}, failed {self.failed}, retried {self.retried}; "
+            f"queue depth {depth} (max {self.max_depth}); "
+            f"wait p50 {_percentile(self.wait_ms, 50):.0f}ms "
+            f"p95 {_percentile(self.wait_ms, 95):.0f}ms; "
+            f"send p50 {_percentile(self.send_ms, 50):.0f}ms "
+            f"p95 {_percentile(self.send_ms, 95):.0f}ms"
+        )
+
+
+class OutboundDispatcher:
+    def __init__(self, rate: float = GLOBAL_RATE, burst: float = GLOBAL_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.stats = OutboundStats()
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        # Key: chat_id, Value: monotonic time the chat may receive the next send
+        self._chat_ready_at: dict[int | str, float] = {}
+        self._waiters: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def set_rate(self, rate: float, burst: float | None = None):
+        self.rate = rate
+        self.burst = rate if burst is None else burst
+        self._tokens = min(self._tokens, self.burst)
+
+    @property
+    def depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(
+        self, chat_id: int | str | None, priority: SendPriority | None = None
+    ) -> float:
+        """Wait for a send slot to ``chat_id``. Returns seconds spent queued."""
+        waiter = _Waiter(
+            priority=current_send_priority() if priority is None else priority,
+            seq=next(self._seq),
+            chat_id=_chat_key(chat_id),
+            future=asyncio.get_running_loop().create_future(),
+            enqueued_at=time.monotonic(),
+        )
+        self._waiters.append(waiter)
+        self.stats.max_depth = max(self.stats.max_depth, len(self._waiters))
+        self._ensure_running()
+        self._wakeup.set()
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+        waited = time.monotonic() - waiter.enqueued_at
+        self.stats.wait_ms.append(waited * 1000)
+        return waited
+
+    def defer_chat(self, chat_id: int | str | None, delay: float):
+        """Hold sends to a chat, e.g. for Telegram's ``retry_after``."""
+        chat_id = _chat_key(chat_id)
+        if chat_id is None:
+            return
+        ready_at = time.monotonic() + delay
+        self._chat_ready_at[chat_id] = max(
+            self._chat_ready_at.get(chat_id, 0.0), ready_at
+        )
+
+    def record_send(self, elapsed: float, ok: bool):
+        self.stats.send_ms.append(elapsed * 1000)
+        if ok:
+            self.stats.sent += 1
+        else:
+            self.stats.failed += 1
+
+    def record_retry(self):
+        self.stats.retried += 1
+
+    async def close(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        for waiter in self._waiters:
+            waiter.future.cancel()
+        self._waiters.clear()
+        self._task = None
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    @staticmethod
+    def _chat_interval(chat_id: int | str | None) -> float:
+        if chat_id is None:
+            return 0.0
+        if isinstance(chat_id, str):
+            is_group = chat_id.startswith(("-", "@"))
+        else:
+            is_group = chat_id < 0
+        return GROUP_CHAT_INTERVAL if is_group else PRIVATE_CHAT_INTERVAL
+
+    def _refill(self, now: float):
+        elapsed = now - self._refilled_at
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._refilled_at = now
+
+    def _next_ready(self, now: float) -> tuple[_Waiter | None, float]:
+        """First waiter (by priority, then arrival) whose chat may send now.
+
+        Only the head waiter of each chat is eligible, so a chat's sends keep
+        their order. Otherwise returns the delay until the soonest chat frees up.
+        """
+        soonest = float("inf")
+        seen_chats: set[int | str] = set()
+        for waiter in sorted(self._waiters):
+            if waiter.future.done():
+                continue
+            if waiter.chat_id is None:
+                return waiter, 0.0
+            if waiter.chat_id in seen_chats:
+                continue
+            seen_chats.add(waiter.chat_id)
+            ready_at = self._chat_ready_at.get(waiter.chat_id, 0.0)
+            if ready_at <= now:
+                return waiter, 0.0
+            soonest = min(soonest, ready_at - now)
+        return None, soonest
+
+    def _prune_chat_state(self, now: float):
+        if len(self._chat_ready_at) < CHAT_STATE_MAX_SIZE:
+            return
+        self._chat_ready_at = {
+            chat_id: ready_at
+            for chat_id, ready_at in self._chat_ready_at.items()
+            if ready_at > now
+        }
+
+    async def _sleep(self, delay: float):
+        """Sleep up to ``delay``, waking early when a new waiter arrives."""
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+        except TimeoutError:
+            pass
+
+    async def _run(self):
+        while True:
+            self._waiters = [w for w in self._waiters if not w.future.done()]
+            if not self._waiters:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            now = time.monotonic()
+            self._refill(now)
+            if self._tokens < 1:
+                await self._sleep((1 - self._tokens) / self.rate)
+                continue
+
+            waiter, delay = self._next_ready(now)
+            if waiter is None:
+                await self._sleep(delay)
+                continue
+
+            self._tokens -= 1
+            if waiter.chat_id is not None:
+                self._prune_chat_state(now)
+                self._chat_ready_at[waiter.chat_id] = now + self._chat_interval(
+                    waiter.chat_id
+                )
+            self._waiters.remove(waiter)
+            waiter.future.set_result(None)
+
+
+outbound_dispatcher = OutboundDispatcher()
+
+
+def log_outbound_stats():
+    stats = outbound_dispatcher.stats
+    if not stats.sent and not stats.failed:
+        return
+    logger.info(f"Outbound sends: {stats.summary(outbound_dispatcher.depth)}")
@@ -0,0 +1,206 @@
+"""Translations and LLM prompts: a build-time bundle, or the source files in dev.
+
+`just build-resources` (run in the Docker build) parses i18n/<lang>/*.yml and
+prompts/*.txt into one marshal file that loads with a single read and no PyYAML.
+Without a bundle, or when a source file is newer than it, the sources are read
+directly and re-read when their mtime changes.
+"""
+
+import marshal
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from bot.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+REPO_ROOT = BASE_DIR.parent
+I18N_DIR = REPO_ROOT / "i18n"
+
+if not I18N_DIR.exists():
+    # Fallback for environments where package data lives next to bot/
+    I18N_DIR = BASE_DIR / "i18n"
+
+# Prefer project-level prompts directory (one level above /bot), but fall back to bot/prompts
+PROMPTS_DIR_CANDIDATES = [REPO_ROOT / "prompts", BASE_DIR / "prompts"]
+
+BUNDLE_PATH = REPO_ROOT / "build" / "resources.bundle"
+BUNDLE_FORMAT = 1
+RELOAD_CHECK_INTERVAL = 2.0  # seconds between source mtime checks in dev
+
+
+def _raise(path: Path, error: Exception):
+    raise error
+
+
+def i18n_sources() -> list[Path]:
+    return sorted(I18N_DIR.glob("*/*.yml"))
+
+
+def prompt_sources() -> list[Path]:
+    """Prompt files, the first directory winning for each name."""
+    by_name: dict[str, Path] = {}
+    for base_dir in PROMPTS_DIR_CANDIDATES:
+        for path in sorted(base_dir.glob("*.txt")):
+            by_name.setdefault(path.stem, path)
+    return list(by_name.values())
+
+
+def _flatten(data: dict, prefix: str = "") -> dict[str, object]:
+    flat: dict[str, object] = {}
+    for key, value in data.items():
+        if isinstance(key, bool):
+            # YAML 1.1 reads bare on/off keys as booleans
+            key = "on" if key else "off"
+        path = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path))
+        else:
+            flat[path] = value
+    return flat
+
+
+def read_i18n_sources(
+    on_error: Callable[[Path, Exception], None] = _raise,
+) -> dict[str, dict[str, object]]:
+    """Parse translations into {lang: {dotted key: value}}."""
+    import yaml  # only needed without a bundle
+
+    catalogs: dict[str, dict[str, object]] = {}
+    for path in i18n_sources():
+        catalog = catalogs.setdefault(path.parent.name, {})
+        try:
+            loaded = yaml.safe_load(path.read_text(encoding="utf-8"))
+            if isinstance(loaded, dict):
+                catalog.update(_flatten(loaded))
+        except Exception as e:
+            on_error(path, e)
+    return catalogs
+
+
+def read_prompt_sources(
+    on_error: Callable[[Path, Exception], None] = _raise,
+) -> dict[str, str]:
+    prompts: dict[str, str] = {}
+    for path in prompt_sources():
+        try:
+            prompts[path.stem] = path.read_text(encoding="utf-8").strip()
+        except Exception as e:
+            on_error(path, e)
+    return prompts
+
+
+def write_bundle(path: Path = BUNDLE_PATH) -> dict:
+    """Compile every source into the bundle at ``path``; raises on a bad source."""
+    data = {"i18n": read_i18n_sources(), "prompts": read_prompt_sources()}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = marshal.dumps((BUNDLE_FORMAT, sys.version_info[:2], data))
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_bytes(payload)
+    tmp_path.replace(path)
+    return data
+
+
+_bundle: dict | None = None
+_bundle_checked = False
+
+
+def _read_bundle() -> dict | None:
+    global _bundle, _bundle_checked
+    if _bundle_checked:
+        return _bundle
+    _bundle_checked = True
+    try:
+        bundle_mtime = BUNDLE_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    stale = [
+        path
+        for path in i18n_sources() + prompt_sources()
+        if path.stat().st_mtime_ns > bundle_mtime
+    ]
+    if stale:
+        logger.warning(
+            f"Resource bundle is older than {stale[0]} and {len(stale) - 1} other "
+            "file(s); reading sources instead (rerun just build-resources)"
+        )
+        return None
+    try:
+        # Written by our own build step, never from user input
+        fmt, python, data = marshal.loads(BUNDLE_PATH.read_bytes())  # noqa: S302
+    except Exception as e:
+        logger.warning(f"Unreadable resource bundle {BUNDLE_PATH}: {e}")
+        return None
+    if fmt != BUNDLE_FORMAT or tuple(python) != sys.version_info[:2]:
+        logger.warning(
+            f"Resource bundle {BUNDLE_PATH} was built for format {fmt}, Python "
+            f"{'.'.join(map(str, python))}; reading sources instead"
+        )
+        return None
+    _bundle = data
+    return _bundle
+
+
+def _log_error(path: Path, error: Exception):
+    logger.error(f"Failed to load {path}: {error}")
+
+
+class ReloadableResource:
+    """One bundle section, compiled for runtime use.
+
+    Without a usable bundle it is built from the source files, and rebuilt when
+    their mtimes change (checked at most every RELOAD_CHECK_INTERVAL seconds).
+    """
+
+    def __init__(
+        self,
+        section: str,
+        sources: Callable[[], list[Path]],
+        read_sources: Callable[..., dict],
+        compile_data: Callable[[dict], dict],
+    ):
+        self.section = section
+        self._sources = sources
+        self._read_sources = read_sources
+        self._compile = compile_data
+        self._data: dict | None = None
+        self._from_bundle = False
+        self._signature: tuple = ()
+        self._next_check = 0.0
+
+    def get(self) -> dict:
+        if self._data is not None and (
+            self._from_bundle or time.monotonic() < self._next_check
+        ):
+            return self._data
+        return self._load()
+
+    def _source_signature(self) -> tuple:
+        signature = []
+        for path in self._sources():
+            try:
+                signature.append((str(path), path.stat().st_mtime_ns))
+            except FileNotFoundError:
+                continue
+        return tuple(signature)
+
+    def _load(self) -> dict:
+        if self._data is None:
+            bundle = _read_bundle()
+            if bundle is not None and self.section in bundle:
+                self._data = self._compile(bundle[self.section])
+                self._from_bundle = True
+                return self._data
+
+        self._next_check = time.monotonic() + RELOAD_CHECK_INTERVAL
+        signature = self._source_signature()
+        if self._data is None or signature != self._signature:
+            reloading = self._data is not None
+            self._data = self._compile(self._read_sources(_log_error))
+            self._signature = signature
+            if reloading:
+                logger.info(f"Reloaded {self.section} from changed source files")
+        return self._data
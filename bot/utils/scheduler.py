@@ -15,7 +15,15 @@ class BotScheduler:
     """Scheduler for periodic tasks with comprehensive logging"""
 
     def __init__(self):
-        self.scheduler = AsyncIOScheduler()
+        # Collapse missed runs into one and never overlap a job with itself;
+        # cross-replica exclusivity is handled by the jobs (row/slot claims).
+        self.scheduler = AsyncIOScheduler(
+            job_defaults={
+                "coalesce": True,
+                "max_instances": 1,
+                "misfire_grace_time": 30,
+            }
+        )
         self.jobs: dict[str, Callable] = {}
 
     def start(self):
@@ -122,16 +130,34 @@ async def setup_scheduler(bot: Bot | None = None):
 
         if bot:
             try:
-                from bot.tasks.vacancy_delivery import run_daily_vacancies
+                from bot.tasks.vacancy_delivery import (
+                    prefetch_scheduled_searches,
+                    purge_delivered_vacancies,
+                    run_daily_vacancies,
+                )
+
+                bot_scheduler.add_job(
+                    prefetch_scheduled_searches,
+                    CronTrigger(minute="*"),
+                    job_id="prefetch_scheduled_searches",
+                    job_name="Scheduled Search Prefetch",
+                )
 
                 bot_scheduler.add_job(
                     run_daily_vacancies,
-                    CronTrigger(minute="*/15"),
+                    CronTrigger(minute="*"),
                     job_id="daily_vacancies",
                     job_name="Daily Vacancy Delivery",
                     job_args=[bot],
                 )
                 scheduler_logger.info("Daily vacancy delivery job registered")
+
+                bot_scheduler.add_job(
+                    purge_delivered_vacancies,
+                    CronTrigger(hour=3, minute=40),
+                    job_id="purge_delivered_vacancies",
+                    job_name="Delivered Vacancies Retention",
+                )
             except Exception as e:
                 scheduler_logger.error(f"Failed to register daily vacancy job: {e}")
 
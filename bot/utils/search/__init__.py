@@ -1,47 +1,117 @@
 """Search utilities package."""
 
+from bot.utils.search.callback_data import (
+    DETAIL_PREFIXES,
+    DOC_PREFIXES,
+    PAGE_PREFIXES,
+    SearchRef,
+    detail_callback,
+    doc_callback,
+    page_callback,
+    parse_detail_callback,
+    parse_doc_callback,
+    parse_page_callback,
+)
+from bot.utils.search.combined_query import (
+    build_or_query,
+    is_combinable,
+    pack_queries,
+    split_by_title,
+)
+from bot.utils.search.page_cache import (
+    RenderedPage,
+    forget_displayed,
+    is_displayed,
+    mark_displayed,
+    render_search_page,
+)
 from bot.utils.search.query_state import (
     get_query_thread_map,
-    get_sent_vacancy_ids_by_query,
     normalize_search_query_key,
+    search_fingerprint,
 )
 from bot.utils.search.search_cache import (
     CACHE_TTL,
+    cache_session,
     cache_vacancies,
+    get_cached_session,
     get_cached_vacancies,
 )
 from bot.utils.search.search_db import (
     extract_vacancy_data,
+    get_digest_from_db,
+    get_search_session,
     get_vacancies_from_db,
+    resolve_search_ref,
     store_search_results,
 )
 from bot.utils.search.search_format import (
+    DIGEST_PER_PAGE,
+    build_digest_keyboard,
+    build_search_keyboard,
     create_pagination_keyboard,
     create_vacancy_buttons,
+    format_digest_page,
     format_salary,
     format_search_page,
     format_search_response,
     format_vacancy,
     format_vacancy_details,
 )
-from bot.utils.search.search_service import perform_search
+from bot.utils.search.search_service import (
+    is_newer_than,
+    parse_published_at,
+    perform_incremental_search,
+    perform_search,
+)
 
 __all__ = [
     "CACHE_TTL",
     "cache_vacancies",
     "get_cached_vacancies",
+    "cache_session",
+    "get_cached_session",
     "extract_vacancy_data",
     "get_vacancies_from_db",
+    "get_digest_from_db",
+    "get_search_session",
+    "resolve_search_ref",
     "store_search_results",
+    "build_search_keyboard",
+    "build_digest_keyboard",
     "create_pagination_keyboard",
     "create_vacancy_buttons",
     "format_salary",
     "format_search_page",
+    "format_digest_page",
+    "DIGEST_PER_PAGE",
     "format_search_response",
     "format_vacancy",
     "format_vacancy_details",
     "perform_search",
+    "perform_incremental_search",
+    "parse_published_at",
+    "is_newer_than",
     "get_query_thread_map",
-    "get_sent_vacancy_ids_by_query",
     "normalize_search_query_key",
+    "search_fingerprint",
+    "build_or_query",
+    "is_combinable",
+    "pack_queries",
+    "split_by_title",
+    "SearchRef",
+    "PAGE_PREFIXES",
+    "DETAIL_PREFIXES",
+    "DOC_PREFIXES",
+    "page_callback",
+    "detail_callback",
+    "doc_callback",
+    "parse_page_callback",
+    "parse_detail_callback",
+    "parse_doc_callback",
+    "RenderedPage",
+    "render_search_page",
+    "mark_displayed",
+    "forget_displayed",
+    "is_displayed",
 ]
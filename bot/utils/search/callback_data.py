@@ -0,0 +1,71 @@
+"""Callback data for search result keyboards.
+
+Buttons carry the stored search query id (the search session) instead of the
+query text, which keeps callback_data within Telegram's 64-byte limit. Taps then
+load results by primary key. Keyboards on older messages still carry the text;
+those are parsed too and resolved by the latest search with that text.
+"""
+
+# Search query id, or the query text from a legacy button
+SearchRef = int | str
+
+PAGE_PREFIX = "sp"
+DETAIL_PREFIX = "sd"
+DOC_PREFIX = "sdoc"
+LEGACY_PAGE_PREFIX = "search_page"
+LEGACY_DETAIL_PREFIX = "vacancy_detail"
+LEGACY_DOC_PREFIX = "vacancy_doc"
+LEGACY_CV_PREFIX = "vacancy_cv"
+
+PAGE_PREFIXES = (f"{PAGE_PREFIX}:", f"{LEGACY_PAGE_PREFIX}:")
+DETAIL_PREFIXES = (f"{DETAIL_PREFIX}:", f"{LEGACY_DETAIL_PREFIX}:")
+DOC_PREFIXES = (f"{DOC_PREFIX}:", f"{LEGACY_DOC_PREFIX}:", f"{LEGACY_CV_PREFIX}:")
+
+
+def page_callback(ref: SearchRef, page: int) -> str:
+    if isinstance(ref, int):
+        return f"{PAGE_PREFIX}:{ref}:{page}"
+    return f"{LEGACY_PAGE_PREFIX}:{ref}:{page}"
+
+
+def detail_callback(ref: SearchRef, idx: int) -> str:
+    if isinstance(ref, int):
+        return f"{DETAIL_PREFIX}:{ref}:{idx}"
+    return f"{LEGACY_DETAIL_PREFIX}:{ref}:{idx}"
+
+
+def doc_callback(ref: SearchRef, doc_key: str, idx: int, action: str) -> str:
+    if isinstance(ref, int):
+        return f"{DOC_PREFIX}:{doc_key}:{ref}:{idx}:{action}"
+    return f"{LEGACY_DOC_PREFIX}:{doc_key}:{ref}:{idx}:{action}"
+
+
+def _split_ref_and_number(prefix: str, rest: str) -> tuple[SearchRef, int]:
+    # Legacy query text may itself contain ":", so split the number off the right
+    ref, number = rest.rsplit(":", 1)
+    return (int(ref) if prefix in {PAGE_PREFIX, DETAIL_PREFIX} else ref), int(number)
+
+
+def parse_page_callback(data: str) -> tuple[SearchRef, int]:
+    """Parse page callback data into (search ref, page). Raises ValueError."""
+    prefix, rest = data.split(":", 1)
+    return _split_ref_and_number(prefix, rest)
+
+
+def parse_detail_callback(data: str) -> tuple[SearchRef, int]:
+    """Parse vacancy detail callback data into (search ref, index). Raises ValueError."""
+    prefix, rest = data.split(":", 1)
+    return _split_ref_and_number(prefix, rest)
+
+
+def parse_doc_callback(data: str) -> tuple[str, SearchRef, int, str]:
+    """Parse document callback data into (doc key, search ref, index, action).
+
+    Raises ValueError on malformed data.
+    """
+    prefix, rest = data.split(":", 1)
+    doc_key = "cv"
+    if prefix != LEGACY_CV_PREFIX:
+        doc_key, rest = rest.split(":", 1)
+    ref, idx, action = rest.rsplit(":", 2)
+    return doc_key, (int(ref) if prefix == DOC_PREFIX else ref), int(idx), action
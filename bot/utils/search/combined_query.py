@@ -0,0 +1,88 @@
+"""Pack several plain queries into one HH boolean query and split results back."""
+
+import re
+
+from bot.utils.search.query_state import normalize_search_query_key
+
+# HH has no documented cap on `text`; stay well below URL limits of proxies
+COMBINED_QUERY_MAX_LENGTH = 1000
+# More sub-queries per request means they compete for one page of results
+COMBINED_QUERY_MAX_PARTS = 8
+
+# Only plain keyword queries are safe to combine and to match locally; anything
+# using HH syntax (quotes, OR/NOT, wildcards, field prefixes) is searched alone.
+_PLAIN_QUERY = re.compile(r"^[\w\s+#.\-]+$")
+_BOOLEAN_WORD = re.compile(r"\b(?:or|and|not)\b", re.IGNORECASE)
+_TOKEN = re.compile(r"[\w+#.\-]+")
+# Russian inflected forms ("разработчик" / "разработчика") share this many chars
+_MIN_STEM = 4
+
+
+def is_combinable(query_text: str) -> bool:
+    return bool(_PLAIN_QUERY.match(query_text)) and not _BOOLEAN_WORD.search(query_text)
+
+
+def build_or_query(queries: list[str]) -> str:
+    """Wrap in outer parentheses so a field prefix applies to the whole query."""
+    if len(queries) == 1:
+        return queries[0]
+    return "(" + " OR ".join(f"({query})" for query in queries) + ")"
+
+
+def pack_queries(
+    queries: list[str],
+    max_length: int = COMBINED_QUERY_MAX_LENGTH,
+    max_parts: int = COMBINED_QUERY_MAX_PARTS,
+) -> list[list[str]]:
+    """Greedily group queries into OR-queries; non-combinable ones stay alone."""
+    groups: list[list[str]] = []
+    current: list[str] = []
+    for query in queries:
+        if not is_combinable(query):
+            groups.append([query])
+            continue
+        candidate = [*current, query]
+        if current and (
+            len(candidate) > max_parts or len(build_or_query(candidate)) > max_length
+        ):
+            groups.append(current)
+            candidate = [query]
+        current = candidate
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _stem(token: str) -> str:
+    # Latin terms are matched whole: "java" must not match "javascript"
+    if token.isascii() or len(token) <= _MIN_STEM:
+        return token
+    return token[: max(_MIN_STEM, len(token) - 2)]
+
+
+def _query_stems(query_text: str) -> list[str]:
+    return [
+        _stem(token) for token in _TOKEN.findall(normalize_search_query_key(query_text))
+    ]
+
+
+def _term_in_title(stem: str, words: list[str]) -> bool:
+    if stem.isascii():
+        return stem in words
+    return any(word.startswith(stem) for word in words)
+
+
+def split_by_title(items: list[dict], queries: list[str]) -> dict[str, list[dict]]:
+    """Assign vacancies to every query whose words all appear in the title.
+
+    Cyrillic words match by prefix to approximate HH morphology. Items matching no
+    query (HH matched a form we could not) are dropped.
+    """
+    stems_by_query = {query: _query_stems(query) for query in queries}
+    split: dict[str, list[dict]] = {query: [] for query in queries}
+    for item in items:
+        words = _TOKEN.findall((item.get("name") or "").casefold())
+        for query, stems in stems_by_query.items():
+            if stems and all(_term_in_title(stem, words) for stem in stems):
+                split[query].append(item)
+    return split
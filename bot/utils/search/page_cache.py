@@ -0,0 +1,105 @@
+"""Rendered search result pages, so page flips skip re-rendering and re-taps skip edits."""
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from aiogram.types import InlineKeyboardMarkup
+
+from bot.utils.logging import get_logger
+from bot.utils.search.callback_data import SearchRef
+from bot.utils.search.search_cache import CACHE_TTL
+from bot.utils.search.search_format import build_search_keyboard, format_search_page
+
+logger = get_logger(__name__)
+
+PAGE_CACHE_MAX_SIZE = 2000
+DISPLAYED_MAX_SIZE = 10000
+
+
+@dataclass(frozen=True)
+class RenderedPage:
+    text: str
+    reply_markup: InlineKeyboardMarkup | None
+    content_hash: str
+
+
+# Pages of stored searches only: a search id fixes the query, filters and results.
+# Key: (user_db_id, search_query_id, page, per_page, lang), Value: (page, timestamp)
+_page_cache: OrderedDict[tuple, tuple[RenderedPage, float]] = OrderedDict()
+
+# Key: (chat_id, message_id), Value: content hash of the page the message shows
+_displayed: OrderedDict[tuple[int, int], str] = OrderedDict()
+
+
+def _content_hash(text: str, reply_markup: InlineKeyboardMarkup | None) -> str:
+    digest = hashlib.blake2b(text.encode(), digest_size=8)
+    if reply_markup:
+        digest.update(reply_markup.model_dump_json().encode())
+    return digest.hexdigest()
+
+
+def render_search_page(
+    user_db_id: int | None,
+    ref: SearchRef,
+    query: str,
+    vacancies: list[dict],
+    page: int,
+    per_page: int,
+    total_found: int,
+    lang: str,
+) -> RenderedPage:
+    """Render a results page (text and keyboard), cached for stored searches."""
+    key = None
+    if user_db_id is not None and isinstance(ref, int):
+        key = (user_db_id, ref, page, per_page, lang)
+        entry = _page_cache.get(key)
+        if entry and time.time() - entry[1] <= CACHE_TTL:
+            _page_cache.move_to_end(key)
+            return entry[0]
+
+    text = format_search_page(query, vacancies, page, per_page, total_found, lang)
+    total_pages = (len(vacancies) + per_page - 1) // per_page
+    reply_markup = build_search_keyboard(
+        ref, page, total_pages, per_page, len(vacancies)
+    )
+    rendered = RenderedPage(text, reply_markup, _content_hash(text, reply_markup))
+
+    if key is not None:
+        _page_cache[key] = (rendered, time.time())
+        _page_cache.move_to_end(key)
+        while len(_page_cache) > PAGE_CACHE_MAX_SIZE:
+            _page_cache.popitem(last=False)
+    return rendered
+
+
+def mark_displayed(chat_id: int, message_id: int, rendered: RenderedPage):
+    """Remember which page a message now shows."""
+    key = (chat_id, message_id)
+    _displayed[key] = rendered.content_hash
+    _displayed.move_to_end(key)
+    while len(_displayed) > DISPLAYED_MAX_SIZE:
+        _displayed.popitem(last=False)
+
+
+def forget_displayed(chat_id: int, message_id: int):
+    """Drop page tracking for a message edited to show something else."""
+    _displayed.pop((chat_id, message_id), None)
+
+
+def is_displayed(
+    chat_id: int,
+    message_id: int,
+    reply_markup: InlineKeyboardMarkup | None,
+    rendered: RenderedPage,
+) -> bool:
+    """Whether the message already shows ``rendered``.
+
+    Messages this process has not edited (after a restart, on another replica)
+    are compared by keyboard: it encodes the search and the current page.
+    """
+    shown = _displayed.get((chat_id, message_id))
+    if shown is not None:
+        return shown == rendered.content_hash
+    return reply_markup is not None and reply_markup == rendered.reply_markup
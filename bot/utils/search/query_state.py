@@ -1,10 +1,21 @@
-"""Helpers for storing per-query thread bindings and delivery state."""
+"""Helpers for storing per-query thread bindings."""
+
+import json
 
 
 def normalize_search_query_key(query_text: str) -> str:
     return " ".join(query_text.split()).casefold()
 
 
+def search_fingerprint(
+    query_text: str, area_id: str | None, filters: dict | None
+) -> str:
+    """Key for HH searches that return the same results for every user."""
+    active_filters = {k: v for k, v in (filters or {}).items() if v is not None}
+    filters_key = json.dumps(active_filters, sort_keys=True, default=str)
+    return f"{normalize_search_query_key(query_text)}|{area_id or ''}|{filters_key}"
+
+
 def get_query_thread_map(prefs: dict) -> dict[str, int]:
     raw_map = prefs.get("query_threads")
     if not isinstance(raw_map, dict):
@@ -18,16 +29,3 @@ def get_query_thread_map(prefs: dict) -> dict[str, int]:
             continue
         normalized[key] = value
     return normalized
-
-
-def get_sent_vacancy_ids_by_query(prefs: dict) -> dict[str, list[str]]:
-    raw_map = prefs.get("sent_vacancy_ids_by_query")
-    if not isinstance(raw_map, dict):
-        return {}
-
-    normalized: dict[str, list[str]] = {}
-    for key, value in raw_map.items():
-        if not isinstance(key, str) or not isinstance(value, list):
-            continue
-        normalized[key] = [str(item) for item in value if item]
-    return normalized
@@ -12,19 +12,24 @@ CACHE_TTL = 1800  # 30 minutes in seconds
 # Key: (user_db_id, query_text), Value: (vacancies, total_found, timestamp)
 _search_cache: dict[tuple[int, str], tuple[list[dict], int, float]] = {}
 
+# Search results by stored search query id, for compact callback data
+# Key: (user_db_id, search_query_id), Value: (vacancies, total_found, query_text, timestamp)
+_session_cache: dict[tuple[int, int], tuple[list[dict], int, str, float]] = {}
+
 
 def _cleanup_cache():
     """Remove expired cache entries."""
     current_time = time.time()
-    expired_keys = [
-        key
-        for key, (_, _, timestamp) in _search_cache.items()
-        if current_time - timestamp > CACHE_TTL
-    ]
-    for key in expired_keys:
-        del _search_cache[key]
-    if expired_keys:
-        logger.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
+    expired = 0
+    for cache in (_search_cache, _session_cache):
+        expired_keys = [
+            key for key, entry in cache.items() if current_time - entry[-1] > CACHE_TTL
+        ]
+        for key in expired_keys:
+            del cache[key]
+        expired += len(expired_keys)
+    if expired:
+        logger.debug(f"Cleaned up {expired} expired cache entries")
 
 
 def get_cached_vacancies(
@@ -55,3 +60,34 @@ def cache_vacancies(
     logger.debug(
         f"Cached {len(vacancies)} vacancies for user {user_db_id}, query '{query_text}'"
     )
+
+
+def get_cached_session(
+    user_db_id: int, search_query_id: int
+) -> tuple[list[dict], int, str] | None:
+    """Get cached results of a stored search. Returns None if not cached or expired."""
+    _cleanup_cache()
+    entry = _session_cache.get((user_db_id, search_query_id))
+    if entry is None:
+        return None
+    vacancies, total_found, query_text, _ = entry
+    logger.debug(
+        f"Cache hit for user {user_db_id}, search {search_query_id} ({len(vacancies)} vacancies)"
+    )
+    return vacancies, total_found, query_text
+
+
+def cache_session(
+    user_db_id: int,
+    search_query_id: int,
+    query_text: str,
+    vacancies: list[dict],
+    total_found: int,
+):
+    """Cache results of a stored search under its id."""
+    _session_cache[(user_db_id, search_query_id)] = (
+        vacancies,
+        total_found,
+        query_text,
+        time.time(),
+    )
@@ -7,7 +7,13 @@ from bot.db.database import db_session
 from bot.db.models import UserSearchResult, Vacancy
 from bot.services import search_service
 from bot.utils.logging import get_logger
-from bot.utils.search.search_cache import cache_vacancies, get_cached_vacancies
+from bot.utils.search.callback_data import SearchRef
+from bot.utils.search.search_cache import (
+    cache_session,
+    cache_vacancies,
+    get_cached_session,
+    get_cached_vacancies,
+)
 
 logger = get_logger(__name__)
 
@@ -63,12 +69,16 @@ async def store_search_results(
     vacancies: list[dict],
     response_time: int,
     per_page: int = 100,
-) -> bool:
-    """Store all search results in database. Duplicates are automatically skipped."""
+    search_params: dict | None = None,
+) -> int | None:
+    """Store all search results in database. Duplicates are automatically skipped.
+
+    Returns the id of the created search query, or None if storing failed.
+    """
     async with db_session() as session:
         if not session:
             logger.warning("Could not get database session for storing search results")
-            return False
+            return None
         try:
             vacancy_repo = VacancyRepository(session)
             user_search_result_repo = UserSearchResultRepository(session)
@@ -79,6 +89,7 @@ async def store_search_results(
                 results_count=len(vacancies),
                 response_time=response_time,
                 session=session,
+                search_params=search_params,
             )
 
             all_vacancy_data = [extract_vacancy_data(vacancy) for vacancy in vacancies]
@@ -161,10 +172,57 @@ async def store_search_results(
                 f"Stored search query and {len(vacancies)} results for user {user_db_id} "
                 f"(new: {new_count}, existing: {existing_count})"
             )
-            return True
+            return search_query.id
         except Exception as e:
             logger.error(f"Failed to store search results for user {user_db_id}: {e}")
-            return False
+            return None
+
+
+async def _load_search_results(session, search_query_id: int) -> list[dict]:
+    """Load a stored search's vacancies, in result order, as HH-like dicts."""
+    stmt = (
+        select(UserSearchResult, Vacancy)
+        .join(Vacancy, UserSearchResult.vacancy_id == Vacancy.id)
+        .where(UserSearchResult.search_query_id == search_query_id)
+        .order_by(UserSearchResult.position)
+    )
+    result = await session.execute(stmt)
+    rows = result.all()
+
+    vacancies: list[dict] = []
+    for _, vacancy in rows:
+        company = _normalize_field(vacancy.company)
+        area_name = _normalize_field(vacancy.location)
+        url = _normalize_field(vacancy.url)
+        vacancies.append(
+            {
+                "db_id": vacancy.id,
+                "id": vacancy.hh_vacancy_id,
+                "name": _normalize_field(vacancy.title),
+                "employer": {"name": company} if company else {},
+                "area": {"name": area_name} if area_name else {},
+                "alternate_url": url,
+                "description": _normalize_field(vacancy.description) or "",
+                "requirements": _normalize_field(vacancy.requirements) or "",
+                "employment": {"id": vacancy.employment_type}
+                if vacancy.employment_type
+                else None,
+                "experience": {"id": vacancy.experience}
+                if vacancy.experience
+                else None,
+                "schedule": {"id": vacancy.schedule} if vacancy.schedule else None,
+                "salary": (
+                    {
+                        "from": vacancy.salary_from,
+                        "to": vacancy.salary_to,
+                        "currency": vacancy.salary_currency,
+                    }
+                    if vacancy.salary_from or vacancy.salary_to
+                    else None
+                ),
+            }
+        )
+    return vacancies
 
 
 async def get_vacancies_from_db(
@@ -195,49 +253,7 @@ async def get_vacancies_from_db(
             )
             return [], 0
 
-        stmt = (
-            select(UserSearchResult, Vacancy)
-            .join(Vacancy, UserSearchResult.vacancy_id == Vacancy.id)
-            .where(UserSearchResult.search_query_id == search_query.id)
-            .order_by(UserSearchResult.position)
-        )
-        result = await session.execute(stmt)
-        rows = result.all()
-
-        vacancies: list[dict] = []
-        for _, vacancy in rows:
-            company = _normalize_field(vacancy.company)
-            area_name = _normalize_field(vacancy.location)
-            url = _normalize_field(vacancy.url)
-            vacancies.append(
-                {
-                    "db_id": vacancy.id,
-                    "id": vacancy.hh_vacancy_id,
-                    "name": _normalize_field(vacancy.title),
-                    "employer": {"name": company} if company else {},
-                    "area": {"name": area_name} if area_name else {},
-                    "alternate_url": url,
-                    "description": _normalize_field(vacancy.description) or "",
-                    "requirements": _normalize_field(vacancy.requirements) or "",
-                    "employment": {"id": vacancy.employment_type}
-                    if vacancy.employment_type
-                    else None,
-                    "experience": {"id": vacancy.experience}
-                    if vacancy.experience
-                    else None,
-                    "schedule": {"id": vacancy.schedule} if vacancy.schedule else None,
-                    "salary": (
-                        {
-                            "from": vacancy.salary_from,
-                            "to": vacancy.salary_to,
-                            "currency": vacancy.salary_currency,
-                        }
-                        if vacancy.salary_from or vacancy.salary_to
-                        else None
-                    ),
-                }
-            )
-
+        vacancies = await _load_search_results(session, search_query.id)
         total_found = search_query.results_count
 
         if use_cache:
@@ -247,3 +263,79 @@ async def get_vacancies_from_db(
             f"Retrieved {len(vacancies)} vacancies from DB for user {user_db_id}, query '{query_text}'"
         )
         return vacancies, total_found
+
+
+async def get_search_session(
+    user_db_id: int, search_query_id: int, use_cache: bool = True
+) -> tuple[list[dict], int, str]:
+    """Get a stored search by id as (vacancies, total found, query text)."""
+    if use_cache:
+        cached = get_cached_session(user_db_id, search_query_id)
+        if cached is not None:
+            return cached
+
+    async with db_session() as session:
+        if not session:
+            logger.warning("Could not get database session for retrieving vacancies")
+            return [], 0, ""
+
+        try:
+            search_query = await search_service.get_search_query_by_id(
+                user_db_id, search_query_id, session=session
+            )
+            if not search_query:
+                logger.warning(
+                    f"No search {search_query_id} found for user {user_db_id}"
+                )
+                return [], 0, ""
+            vacancies = await _load_search_results(session, search_query.id)
+        except Exception as e:
+            logger.error(
+                f"Failed to get search {search_query_id} for user {user_db_id}: {e}"
+            )
+            return [], 0, ""
+
+        total_found = search_query.results_count
+        if use_cache:
+            cache_session(
+                user_db_id,
+                search_query_id,
+                search_query.query_text,
+                vacancies,
+                total_found,
+            )
+        return vacancies, total_found, search_query.query_text
+
+
+async def resolve_search_ref(
+    user_db_id: int, ref: SearchRef
+) -> tuple[list[dict], int, str]:
+    """Load results for callback data: by search id, or by text for legacy buttons."""
+    if isinstance(ref, int):
+        return await get_search_session(user_db_id, ref)
+    vacancies, total_found = await get_vacancies_from_db(user_db_id, ref)
+    return vacancies, total_found, ref
+
+
+async def get_digest_from_db(
+    user_db_id: int, digest_id: int
+) -> tuple[list[dict], list[str]]:
+    """Get a stored delivery digest as (vacancies, query texts it covers)."""
+    async with db_session() as session:
+        if not session:
+            logger.warning("Could not get database session for retrieving digest")
+            return [], []
+
+        try:
+            search_query = await search_service.get_search_query_by_id(
+                user_db_id, digest_id, session=session
+            )
+            if not search_query or not (search_query.search_params or {}).get("digest"):
+                logger.warning(f"No digest {digest_id} found for user {user_db_id}")
+                return [], []
+            vacancies = await _load_search_results(session, search_query.id)
+        except Exception as e:
+            logger.error(f"Failed to get digest {digest_id} for user {user_db_id}: {e}")
+            return [], []
+
+        return vacancies, search_query.search_params.get("queries", [])
@@ -2,11 +2,18 @@
 
 import html
 
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
 from bot.utils.i18n import t
 from bot.utils.logging import get_logger
+from bot.utils.search.callback_data import SearchRef, detail_callback, page_callback
 
 logger = get_logger(__name__)
 
+# Digest headers list this many query texts, then "and N more"
+DIGEST_HEADER_QUERIES = 5
+DIGEST_PER_PAGE = 5
+
 
 def format_salary(salary: dict | None, lang: str) -> str:
     """Format salary information from HH API response."""
@@ -115,19 +122,53 @@ def format_search_page(
     end_idx = start_idx + per_page
     page_vacancies = vacancies[start_idx:end_idx]
 
+    parts = [
+        t("search.results_header", lang).format(total=total_found, query=query),
+        "\n\n",
+    ]
+    parts.extend(
+        format_vacancy(vacancy, start_idx + i, lang)
+        for i, vacancy in enumerate(page_vacancies, 1)
+    )
+
+    total_pages = (len(vacancies) + per_page - 1) // per_page
+    parts.append("\n")
+    parts.append(
+        t("search.page_label", lang).format(current=page + 1, total=total_pages)
+    )
+    return "".join(parts)
+
+
+def format_digest_page(
+    queries: list[str],
+    vacancies: list[dict],
+    page: int,
+    per_page: int,
+    lang: str,
+) -> str:
+    """Format a page of a delivery digest combining several queries."""
+    shown = [html.escape(query) for query in queries[:DIGEST_HEADER_QUERIES]]
+    if len(queries) > DIGEST_HEADER_QUERIES:
+        shown.append(
+            t("search.digest.more_queries", lang).format(
+                count=len(queries) - DIGEST_HEADER_QUERIES
+            )
+        )
     response = (
-        t("search.results_header", lang).format(total=total_found, query=query) + "\n\n"
+        t("search.digest.header", lang).format(
+            total=len(vacancies), queries=", ".join(shown)
+        )
+        + "\n\n"
     )
 
-    for i, vacancy in enumerate(page_vacancies, 1):
-        global_position = start_idx + i
-        response += format_vacancy(vacancy, global_position, lang)
+    start_idx = page * per_page
+    for i, vacancy in enumerate(vacancies[start_idx : start_idx + per_page], 1):
+        response += format_vacancy(vacancy, start_idx + i, lang)
 
     total_pages = (len(vacancies) + per_page - 1) // per_page
     response += "\n" + t("search.page_label", lang).format(
         current=page + 1, total=total_pages
     )
-
     return response
 
 
@@ -151,26 +192,25 @@ def format_search_response(
 
 
 def create_pagination_keyboard(
-    query: str, page: int, total_pages: int
+    ref: SearchRef, page: int, total_pages: int
 ) -> list[list[dict[str, str]]]:
-    """Create inline keyboard for pagination with page numbers and ellipsis."""
+    """Create inline keyboard for pagination with page numbers and ellipsis.
+
+    ``ref`` is the stored search query id; query text gives legacy callback data.
+    """
     keyboard = []
     buttons = []
 
     # Previous
     if page > 0:
-        buttons.append(
-            {"text": "◀️", "callback_data": f"search_page:{query}:{page - 1}"}
-        )
+        buttons.append({"text": "◀️", "callback_data": page_callback(ref, page - 1)})
 
     current_page_num = page + 1
 
     if total_pages <= 7:
         for p in range(1, total_pages + 1):
             text = f"• {p} •" if p == current_page_num else str(p)
-            buttons.append(
-                {"text": text, "callback_data": f"search_page:{query}:{p - 1}"}
-            )
+            buttons.append({"text": text, "callback_data": page_callback(ref, p - 1)})
     else:
         start_page = max(2, current_page_num - 1)
         end_page = min(total_pages - 1, current_page_num + 1)
@@ -178,7 +218,7 @@ def create_pagination_keyboard(
         buttons.append(
             {
                 "text": ("• 1 •" if current_page_num == 1 else "1"),
-                "callback_data": f"search_page:{query}:0",
+                "callback_data": page_callback(ref, 0),
             }
         )
         if start_page > 2:
@@ -188,9 +228,7 @@ def create_pagination_keyboard(
             if p in {1, total_pages}:
                 continue
             text = f"• {p} •" if p == current_page_num else str(p)
-            buttons.append(
-                {"text": text, "callback_data": f"search_page:{query}:{p - 1}"}
-            )
+            buttons.append({"text": text, "callback_data": page_callback(ref, p - 1)})
 
         if end_page < total_pages - 1:
             buttons.append({"text": "...", "callback_data": "noop"})
@@ -204,14 +242,12 @@ def create_pagination_keyboard(
             buttons.append(
                 {
                     "text": text,
-                    "callback_data": f"search_page:{query}:{total_pages - 1}",
+                    "callback_data": page_callback(ref, total_pages - 1),
                 }
             )
 
     if page < total_pages - 1:
-        buttons.append(
-            {"text": "▶️", "callback_data": f"search_page:{query}:{page + 1}"}
-        )
+        buttons.append({"text": "▶️", "callback_data": page_callback(ref, page + 1)})
 
     if buttons:
         keyboard.append(buttons)
@@ -220,12 +256,48 @@ def create_pagination_keyboard(
 
 
 def create_vacancy_buttons(
-    query: str, page: int, per_page: int, total_count: int
+    ref: SearchRef, page: int, per_page: int, total_count: int
 ) -> list[dict[str, str]]:
     """Create row of buttons for vacancies on the current page, showing absolute indices."""
     start_idx = page * per_page
     end_idx = min(start_idx + per_page, total_count)
     return [
-        {"text": f"{i + 1}.", "callback_data": f"vacancy_detail:{query}:{i}"}
+        {"text": f"{i + 1}.", "callback_data": detail_callback(ref, i)}
         for i in range(start_idx, end_idx)
     ]
+
+
+def build_search_keyboard(
+    ref: SearchRef, page: int, total_pages: int, per_page: int, total_count: int
+):
+    keyboard: list[list[dict[str, str]]] = []
+    vacancy_row = create_vacancy_buttons(ref, page, per_page, total_count)
+    if vacancy_row:
+        keyboard.append(vacancy_row)
+    pagination_row = create_pagination_keyboard(ref, page, total_pages)
+    if pagination_row:
+        keyboard.extend(pagination_row)
+    return InlineKeyboardMarkup(inline_keyboard=keyboard) if keyboard else None
+
+
+def build_digest_keyboard(digest_id: int, page: int, total_pages: int):
+    """Compact ◀️ n/N ▶️ row; callback data carries the digest id, not queries."""
+    if total_pages <= 1:
+        return None
+    buttons = []
+    if page > 0:
+        buttons.append(
+            InlineKeyboardButton(
+                text="◀️", callback_data=f"digest_page:{digest_id}:{page - 1}"
+            )
+        )
+    buttons.append(
+        InlineKeyboardButton(text=f"{page + 1}/{total_pages}", callback_data="noop")
+    )
+    if page < total_pages - 1:
+        buttons.append(
+            InlineKeyboardButton(
+                text="▶️", callback_data=f"digest_page:{digest_id}:{page + 1}"
+            )
+        )
+    return InlineKeyboardMarkup(inline_keyboard=[buttons])
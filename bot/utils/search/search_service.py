@@ -2,6 +2,7 @@
 
 import asyncio
 import time
+from datetime import datetime
 
 from bot.services.hh_service import hh_service
 from bot.utils.logging import get_logger
@@ -9,6 +10,57 @@ from bot.utils.logging import get_logger
 logger = get_logger(__name__)
 
 
+MAX_PAGE_RETRIES = 3
+PAGE_RETRY_DELAY = 2  # seconds, multiplied by the attempt number
+
+
+async def _fetch_page(
+    query: str,
+    page: int,
+    per_page: int,
+    search_in_name_only: bool,
+    area_id: str | None,
+    filters: dict | None,
+    order_by: str | None = None,
+    date_from: str | None = None,
+) -> dict | None:
+    """Fetch one HH results page, retrying failed attempts with a growing delay."""
+    filters = filters or {}
+    for attempt in range(1, MAX_PAGE_RETRIES + 1):
+        try:
+            page_results = await hh_service.search_vacancies(
+                query,
+                area=area_id,
+                page=page,
+                per_page=per_page,
+                search_in_name_only=search_in_name_only,
+                min_salary=filters.get("min_salary"),
+                remote_only=filters.get("remote_only"),
+                freshness_days=filters.get("freshness_days"),
+                employment=filters.get("employment"),
+                experience=filters.get("experience"),
+                order_by=order_by,
+                date_from=date_from,
+            )
+            if page_results:
+                return page_results
+            if attempt < MAX_PAGE_RETRIES:
+                logger.warning(
+                    f"Failed to fetch page {page} (attempt {attempt}/{MAX_PAGE_RETRIES}), retrying..."
+                )
+        except Exception as e:
+            logger.warning(
+                f"Exception fetching page {page} (attempt {attempt}/{MAX_PAGE_RETRIES}): {e}"
+            )
+            if attempt == MAX_PAGE_RETRIES:
+                logger.error(
+                    f"Failed to fetch page {page} after {MAX_PAGE_RETRIES} attempts"
+                )
+        if attempt < MAX_PAGE_RETRIES:
+            await asyncio.sleep(PAGE_RETRY_DELAY * attempt)
+    return None
+
+
 async def perform_search(
     query: str,
     per_page: int = 100,
@@ -23,56 +75,14 @@ async def perform_search(
     total_found = 0
     page = 0
     pages_count = 0
-    max_retries = 3
-    retry_delay = 2  # seconds
 
     while True:
         if max_pages and page >= max_pages:
             break
 
-        retries = 0
-        page_results = None
-
-        while retries < max_retries:
-            try:
-                min_salary = filters.get("min_salary") if filters else None
-                remote_only = filters.get("remote_only") if filters else None
-                freshness_days = filters.get("freshness_days") if filters else None
-                employment = filters.get("employment") if filters else None
-                experience = filters.get("experience") if filters else None
-
-                page_results = await hh_service.search_vacancies(
-                    query,
-                    area=area_id,
-                    page=page,
-                    per_page=per_page,
-                    search_in_name_only=search_in_name_only,
-                    min_salary=min_salary,
-                    remote_only=remote_only,
-                    freshness_days=freshness_days,
-                    employment=employment,
-                    experience=experience,
-                )
-                if page_results:
-                    break
-                retries += 1
-                if retries < max_retries:
-                    logger.warning(
-                        f"Failed to fetch page {page} (attempt {retries}/{max_retries}), retrying..."
-                    )
-                    await asyncio.sleep(retry_delay * retries)
-            except Exception as e:
-                logger.warning(
-                    f"Exception fetching page {page} (attempt {retries + 1}/{max_retries}): {e}"
-                )
-                retries += 1
-                if retries < max_retries:
-                    await asyncio.sleep(retry_delay * retries)
-                else:
-                    logger.error(
-                        f"Failed to fetch page {page} after {max_retries} attempts"
-                    )
-                    break
+        page_results = await _fetch_page(
+            query, page, per_page, search_in_name_only, area_id, filters
+        )
 
         if not page_results:
             logger.warning(f"Could not fetch page {page}, stopping pagination")
@@ -107,3 +117,91 @@ async def perform_search(
     )
 
     return combined_results, response_time
+
+
+def parse_published_at(vacancy: dict) -> datetime | None:
+    raw = vacancy.get("published_at")
+    if not raw:
+        return None
+    try:
+        return datetime.fromisoformat(raw)
+    except ValueError:
+        return None
+
+
+def is_newer_than(vacancy: dict, mark: tuple[datetime, str] | None) -> bool:
+    """True if the vacancy sorts after a (published_at, vacancy id) high-water mark."""
+    if mark is None:
+        return True
+    published_at = parse_published_at(vacancy)
+    if published_at is None:
+        return True
+    mark_published_at, mark_id = mark
+    if published_at != mark_published_at:
+        return published_at > mark_published_at
+    return str(vacancy.get("id")) != mark_id
+
+
+async def perform_incremental_search(
+    query: str,
+    since: datetime | None,
+    limit: int,
+    area_id: str | None = None,
+    filters: dict | None = None,
+    per_page: int = 50,
+    max_pages: int = 4,
+) -> tuple[dict | None, int]:
+    """Fetch vacancies published since ``since``, newest first.
+
+    Pages are requested with HH ``date_from`` and ``order_by=publication_time``.
+    Paging stops at the first item not newer than ``since``, after ``limit``
+    items, on a short page, or after ``max_pages``.
+    """
+    start_time = time.time()
+    date_from = since.isoformat(timespec="seconds") if since else None
+    all_items: list[dict] = []
+    total_found = 0
+
+    for page in range(max_pages):
+        page_results = await _fetch_page(
+            query,
+            page,
+            per_page,
+            True,
+            area_id,
+            filters,
+            order_by="publication_time",
+            date_from=date_from,
+        )
+        if not page_results:
+            if page == 0:
+                return None, int((time.time() - start_time) * 1000)
+            break
+        if page == 0:
+            total_found = page_results.get("found", 0)
+
+        items = page_results.get("items", [])
+        reached_seen = False
+        for item in items:
+            published_at = parse_published_at(item)
+            if since and published_at and published_at < since:
+                reached_seen = True
+                break
+            all_items.append(item)
+
+        pages_count = page_results.get("pages", 0)
+        if (
+            reached_seen
+            or len(all_items) >= limit
+            or len(items) < per_page
+            or page >= pages_count - 1
+        ):
+            break
+        await asyncio.sleep(0.5)
+
+    response_time = int((time.time() - start_time) * 1000)
+    logger.info(
+        f"Incremental search since {date_from or 'start'}: found {total_found}, "
+        f"fetched {len(all_items)} items in {response_time}ms"
+    )
+    return {"items": all_items, "found": total_found}, response_time
@@ -0,0 +1,65 @@
+"""Startup timeline: when each startup step ran, relative to process launch.
+
+Steps given to ``step`` may run concurrently; the timeline is logged once the
+bot can receive updates, so a slow or newly serialized step shows up there.
+"""
+
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass
+from typing import Any
+
+from bot.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class StartupStep:
+    name: str
+    started: float  # seconds after launch
+    finished: float
+    ok: bool = True
+
+    def describe(self) -> str:
+        span = f"{self.started * 1000:.0f}-{self.finished * 1000:.0f}ms"
+        return f"{self.name} {span}" + ("" if self.ok else " (unavailable)")
+
+
+class StartupTimeline:
+    def __init__(self, launched_at: float | None = None):
+        self.launched_at = time.monotonic() if launched_at is None else launched_at
+        self.steps: list[StartupStep] = []
+        self.ready_at: float | None = None
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.launched_at
+
+    def mark(self, name: str):
+        """Record a point in time, e.g. the end of module imports."""
+        now = self.elapsed()
+        self.steps.append(StartupStep(name, now, now))
+
+    async def step(self, name: str, awaitable: Awaitable[Any]) -> Any:
+        """Await one startup step; failures are logged and return None."""
+        started = self.elapsed()
+        try:
+            result = await awaitable
+        except Exception as e:
+            logger.error(f"Startup step {name} failed: {e}")
+            result, ok = None, False
+        else:
+            ok = result is not False
+        step = StartupStep(name, started, self.elapsed(), ok)
+        self.steps.append(step)
+        if self.ready_at is not None:
+            logger.info(f"Background startup step finished: {step.describe()}")
+        return result
+
+    def ready(self):
+        """Log the timeline once the bot can receive updates."""
+        self.ready_at = self.elapsed()
+        steps = ", ".join(step.describe() for step in self.steps)
+        logger.info(
+            f"Ready for updates {self.ready_at * 1000:.0f}ms after launch ({steps})"
+        )
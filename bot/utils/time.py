@@ -1,4 +1,7 @@
-from datetime import UTC, datetime
+from datetime import UTC, datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+DEFAULT_TIMEZONE = "Europe/Moscow"
 
 
 def parse_time(raw: str, minute_step: int | None = None) -> str | None:
@@ -17,3 +20,32 @@ def parse_time(raw: str, minute_step: int | None = None) -> str | None:
 
 def utc_now():
     return datetime.now(UTC)
+
+
+def get_zone(tz_name: str | None) -> ZoneInfo:
+    """Return the user's zone, falling back to the default for empty/invalid names."""
+    if tz_name:
+        try:
+            return ZoneInfo(tz_name)
+        except (ZoneInfoNotFoundError, ValueError):
+            return ZoneInfo(DEFAULT_TIMEZONE)
+    return ZoneInfo(DEFAULT_TIMEZONE)
+
+
+def compute_next_delivery_at(
+    schedule_time: str | None, tz_name: str | None, after: datetime
+) -> datetime | None:
+    """Return the first UTC moment strictly after `after` matching HH:MM local time."""
+    normalized = parse_time(schedule_time) if schedule_time else None
+    if not normalized:
+        return None
+    hours, minutes = (int(part) for part in normalized.split(":"))
+    zone = get_zone(tz_name)
+    local_day = after.astimezone(zone).date()
+    for day_offset in range(3):
+        candidate = datetime.combine(
+            local_day + timedelta(days=day_offset), time(hours, minutes), tzinfo=zone
+        ).astimezone(UTC)
+        if candidate > after:
+            return candidate
+    return None
@@ -0,0 +1,248 @@
+"""Webhook updates: acknowledged at once, then handled by a bounded worker pool.
+
+Each chat has its own FIFO queue and at most one update in progress, so a chat's
+messages and button taps are handled in the order Telegram sent them, while
+other chats proceed in parallel. Telegram redeliveries are skipped by update_id.
+When too many updates are pending the webhook answers 503 and Telegram retries
+later, instead of the bot piling up handlers without limit.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler
+from aiohttp import web
+
+from bot.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_WORKERS = 16
+DEFAULT_MAX_PENDING = 1000
+CHAT_MAX_PENDING = 50  # more than this from one chat is a flood, not a backlog
+SUBMIT_TIMEOUT = 5.0  # seconds a full queue may hold the webhook request
+DRAIN_TIMEOUT = 30.0  # seconds to finish pending updates on shutdown
+SEEN_UPDATES_MAX_SIZE = 10000
+
+ChatKey = int | str
+
+
+class SubmitResult(Enum):
+    ACCEPTED = "accepted"
+    DUPLICATE = "duplicate"  # already accepted, e.g. a Telegram redelivery
+    DROPPED = "dropped"  # the chat has too many pending updates
+    REJECTED = "rejected"  # queue full or closing; Telegram should retry
+
+
+def update_chat_key(update: dict[str, Any]) -> ChatKey:
+    """Chat (or user) an update belongs to, read from the raw update payload."""
+    for name, event in update.items():
+        if name == "update_id" or not isinstance(event, dict):
+            continue
+        chat = event.get("chat") or (event.get("message") or {}).get("chat")
+        if chat and "id" in chat:
+            return chat["id"]
+        user = event.get("from") or event.get("user")
+        if user and "id" in user:
+            return user["id"]
+    # Nothing to order against: the update gets a queue of its own
+    return f"update:{update.get('update_id')}"
+
+
+@dataclass
+class UpdateQueueStats:
+    accepted: int = 0
+    duplicates: int = 0
+    dropped: int = 0
+    rejected: int = 0
+    failed: int = 0
+    max_depth: int = 0
+
+    def summary(self, depth: int) -> str:
+        return (
+            f"accepted {self.accepted}, duplicates {self.duplicates}, "
+            f"dropped {self.dropped}, rejected {self.rejected}, failed {self.failed}; "
+            f"pending {depth} (max {self.max_depth})"
+        )
+
+
+class UpdateQueue:
+    def __init__(
+        self,
+        process: Callable[[dict[str, Any]], Awaitable[Any]],
+        workers: int = DEFAULT_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        chat_max_pending: int = CHAT_MAX_PENDING,
+    ):
+        self._process = process
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self.chat_max_pending = chat_max_pending
+        self.stats = UpdateQueueStats()
+        # Key: chat key, Value: its updates; the head is the one being handled
+        self._chats: dict[ChatKey, deque[dict[str, Any]]] = {}
+        # Chats with an update ready for a worker; each chat is in here at most once
+        self._ready: asyncio.Queue[ChatKey] = asyncio.Queue()
+        self._pending = 0
+        self._room = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._seen: OrderedDict[int, None] = OrderedDict()
+        self._tasks: list[asyncio.Task] = []
+        self._closing = False
+
+    @property
+    def depth(self) -> int:
+        return self._pending
+
+    async def submit(self, update: dict[str, Any]) -> SubmitResult:
+        """Queue an update, waiting up to SUBMIT_TIMEOUT for room."""
+        if self._closing:
+            self.stats.rejected += 1
+            return SubmitResult.REJECTED
+
+        update_id = update.get("update_id")
+        if update_id is not None:
+            if update_id in self._seen:
+                self.stats.duplicates += 1
+                return SubmitResult.DUPLICATE
+            # Claimed before waiting, so a redelivery arriving meanwhile is a duplicate
+            self._remember(update_id)
+
+        key = update_chat_key(update)
+        chat_queue = self._chats.get(key)
+        if chat_queue is not None and len(chat_queue) >= self.chat_max_pending:
+            self.stats.dropped += 1
+            logger.warning(f"Dropped update {update_id}: chat {key} has a full queue")
+            return SubmitResult.DROPPED
+
+        if not await self._wait_for_room():
+            self._seen.pop(update_id, None)
+            self.stats.rejected += 1
+            logger.warning(
+                f"Rejected update {update_id}: {self._pending} update(s) pending"
+            )
+            return SubmitResult.REJECTED
+
+        self._ensure_running()
+        chat_queue = self._chats.get(key)
+        if chat_queue is None:
+            self._chats[key] = deque([update])
+            self._ready.put_nowait(key)
+        else:
+            chat_queue.append(update)
+        self._pending += 1
+        self._idle.clear()
+        self.stats.accepted += 1
+        self.stats.max_depth = max(self.stats.max_depth, self._pending)
+        return SubmitResult.ACCEPTED
+
+    async def close(self, drain_timeout: float = DRAIN_TIMEOUT):
+        """Stop accepting updates and finish the pending ones, up to ``drain_timeout``."""
+        if self._closing and not self._tasks:
+            return
+        self._closing = True
+        if self._pending:
+            logger.info(f"Draining {self._pending} pending update(s)...")
+            try:
+                await asyncio.wait_for(self._idle.wait(), timeout=drain_timeout)
+            except TimeoutError:
+                logger.warning(
+                    f"Gave up on {self._pending} pending update(s) after {drain_timeout:.0f}s"
+                )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self.stats.accepted or self.stats.rejected:
+            logger.info(f"Webhook updates: {self.stats.summary(self._pending)}")
+
+    def _remember(self, update_id: int):
+        self._seen[update_id] = None
+        if len(self._seen) > SEEN_UPDATES_MAX_SIZE:
+            self._seen.popitem(last=False)
+
+    async def _wait_for_room(self) -> bool:
+        deadline = time.monotonic() + SUBMIT_TIMEOUT
+        while self._pending >= self.max_pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._closing:
+                return False
+            self._room.clear()
+            try:
+                await asyncio.wait_for(self._room.wait(), timeout=remaining)
+            except TimeoutError:
+                return False
+        return not self._closing
+
+    def _ensure_running(self):
+        self._tasks = [task for task in self._tasks if not task.done()]
+        for _ in range(self.workers - len(self._tasks)):
+            self._tasks.append(asyncio.create_task(self._worker()))
+
+    async def _worker(self):
+        while True:
+            key = await self._ready.get()
+            chat_queue = self._chats[key]
+            update = chat_queue[0]
+            try:
+                await self._process(update)
+            except Exception as e:
+                self.stats.failed += 1
+                logger.error(f"Failed to handle update {update.get('update_id')}: {e}")
+            finally:
+                chat_queue.popleft()
+                if chat_queue:
+                    self._ready.put_nowait(key)
+                else:
+                    del self._chats[key]
+                self._pending -= 1
+                self._room.set()
+                if not self._pending:
+                    self._idle.set()
+
+
+class QueuedRequestHandler(SimpleRequestHandler):
+    """Webhook handler that answers Telegram at once and feeds an UpdateQueue."""
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot: Bot,
+        workers: int = DEFAULT_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        secret_token: str | None = None,
+        **data: Any,
+    ):
+        super().__init__(
+            dispatcher,
+            bot,
+            handle_in_background=True,
+            secret_token=secret_token,
+            **data,
+        )
+        self.update_queue = UpdateQueue(
+            lambda update: self._background_feed_update(self.bot, update),
+            workers=workers,
+            max_pending=max_pending,
+        )
+
+    async def _handle_request_background(
+        self, bot: Bot, request: web.Request
+    ) -> web.Response:
+        update = await request.json(loads=bot.session.json_loads)
+        result = await self.update_queue.submit(update)
+        if result is SubmitResult.REJECTED:
+            # Any non-2xx answer makes Telegram redeliver the update later
+            return web.Response(status=503, text="Busy")
+        return web.json_response({}, dumps=bot.session.json_dumps)
+
+    async def close(self):
+        await self.update_queue.close()
+        await super().close()
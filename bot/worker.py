@@ -0,0 +1,69 @@
+"""Delivery worker: runs scheduled jobs without the Telegram update handlers.
+
+Start with ``python -m bot.worker`` alongside the bot running with
+``BOT_RUN_SCHEDULER=false``, so heavy delivery slots never share an event loop
+with interactive updates. Both processes use the same config and database.
+"""
+
+import asyncio
+import os
+import signal
+import sys
+
+from aiogram import Bot
+
+from bot.config import settings
+from bot.db.database import close_database, init_database
+from bot.middlewares import OutboundRateLimitMiddleware
+from bot.services.hh_service import hh_service
+from bot.utils.i18n import load_catalogs
+from bot.utils.logging import get_logger
+from bot.utils.outbound import GLOBAL_RATE, log_outbound_stats, outbound_dispatcher
+from bot.utils.scheduler import cleanup_scheduler, setup_scheduler
+
+logger = get_logger(__name__)
+
+
+async def run_worker() -> bool:
+    os.makedirs("logs", exist_ok=True)
+    logger.info("Starting delivery worker...")
+    load_catalogs()
+
+    if not await init_database():
+        logger.error("Delivery worker needs the database; exiting")
+        return False
+
+    bot = Bot(token=settings.TG_BOT_API_KEY)
+    # The bot process sends at GLOBAL_RATE minus this (see main.py)
+    outbound_dispatcher.set_rate(min(settings.WORKER_SEND_RATE, GLOBAL_RATE))
+    bot.session.middleware(OutboundRateLimitMiddleware())
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    try:
+        await hh_service.init_session()
+        if not await setup_scheduler(bot):
+            return False
+        logger.success("Delivery worker started")
+        await stop.wait()
+        return True
+    finally:
+        logger.info("Shutting down delivery worker...")
+        await cleanup_scheduler()
+        await outbound_dispatcher.close()
+        log_outbound_stats()
+        await hh_service.close_session()
+        await close_database()
+        await bot.session.close()
+
+
+def main():
+    success = asyncio.run(run_worker())
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
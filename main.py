@@ -1,5 +1,10 @@
 # ruff: noqa: E402
 
+import time
+
+# Taken before the heavy imports below, so the startup timeline includes them
+LAUNCHED_AT = time.monotonic()
+
 import asyncio
 import os
 import warnings
@@ -13,62 +18,88 @@ warnings.filterwarnings(
 )
 
 from aiogram import Bot, Dispatcher
-from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiogram.webhook.aiohttp_server import setup_application
 from aiohttp import web
 
 from bot.config import settings
 from bot.db.database import close_database, init_database
 from bot.handlers import register_all_handlers
+from bot.middlewares import (
+    DbTimingMiddleware,
+    OutboundRateLimitMiddleware,
+    SearchThrottleMiddleware,
+    UserActivityMiddleware,
+)
 from bot.services.hh_service import hh_service
 from bot.services.openai_service import openai_service
+from bot.utils.i18n import load_catalogs
 from bot.utils.logging import get_logger
+from bot.utils.outbound import GLOBAL_RATE, log_outbound_stats, outbound_dispatcher
 from bot.utils.scheduler import cleanup_scheduler, setup_scheduler
+from bot.utils.startup import StartupTimeline
+from bot.utils.update_queue import QueuedRequestHandler
 
 logger = get_logger(__name__)
 
+startup_timeline = StartupTimeline(LAUNCHED_AT)
+startup_timeline.mark("imports")
+
+# Startup steps nothing waits for; cancelled on shutdown if still running
+_background_tasks: set[asyncio.Task] = set()
+
 
 async def on_startup(bot: Bot):
     os.makedirs("logs", exist_ok=True)
     logger.info("Starting HH Bot...")
-
-    # Database
-    try:
-        await init_database()
+    timeline = startup_timeline
+
+    # The LLM probe is a network round trip that no handler needs to wait for;
+    # LLM features report "unavailable" until it succeeds
+    probe = asyncio.create_task(timeline.step("llm", openai_service.init_service()))
+    _background_tasks.add(probe)
+    probe.add_done_callback(_background_tasks.discard)
+
+    # Independent steps run concurrently. Translations are flattened now rather
+    # than on the first message, in a thread when they come from YAML sources.
+    catalogs, db_ready, _ = await asyncio.gather(
+        timeline.step("i18n", asyncio.to_thread(load_catalogs)),
+        timeline.step("database", init_database()),
+        timeline.step("hh", hh_service.init_session()),
+    )
+    if catalogs:
+        logger.info(f"Loaded {catalogs} i18n catalog(s)")
+    if db_ready:
         logger.info("Database initialized")
-    except Exception as e:
-        logger.error(f"DB init failed: {e}")
-
-    # HH API client
-    try:
-        await hh_service.init_session()
+    if hh_service.session:
         logger.info("HH service ready")
-    except Exception as e:
-        logger.error(f"HH service init failed: {e}")
 
-    # OpenAI client
-    try:
-        await openai_service.init_service()
-        logger.info("OpenAI service ready")
-    except Exception as e:
-        logger.error(f"OpenAI init failed: {e}")
+    # Scheduler (runs in the delivery worker instead when disabled here)
+    if settings.BOT_RUN_SCHEDULER:
+        if await timeline.step("scheduler", setup_scheduler(bot)):
+            logger.info("Scheduler started")
+    else:
+        logger.info("Scheduler disabled; scheduled jobs run in bot.worker")
 
-    # Scheduler
-    try:
-        await setup_scheduler(bot)
-        logger.info("Scheduler started")
-    except Exception as e:
-        logger.error(f"Scheduler init failed: {e}")
+    # In webhook mode the bot is ready only once the webhook is set
+    if settings.ENV.lower() != "prod":
+        timeline.ready()
 
 
 async def on_shutdown(bot: Bot):
     logger.info("Shutting down bot...")
 
+    for task in _background_tasks:
+        task.cancel()
+
     try:
         await cleanup_scheduler()
         logger.info("Scheduler stopped")
     except Exception as e:
         logger.error(f"Error stopping scheduler: {e}")
 
+    await outbound_dispatcher.close()
+    log_outbound_stats()
+
     try:
         await hh_service.close_session()
         logger.info("HH client closed")
@@ -98,7 +129,14 @@ async def run_webhook(bot: Bot, dp: Dispatcher):
     webhook_path = parsed.path or "/webhook"
 
     app = web.Application()
-    SimpleRequestHandler(dp, bot).register(app, path=webhook_path)
+    # Answers Telegram at once; updates run on per-chat queues in a worker pool
+    QueuedRequestHandler(
+        dp,
+        bot,
+        workers=settings.WEBHOOK_WORKERS,
+        max_pending=settings.WEBHOOK_MAX_PENDING,
+        secret_token=settings.WEBHOOK_SECRET,
+    ).register(app, path=webhook_path)
     setup_application(app, dp, bot=bot)
 
     runner = web.AppRunner(app)
@@ -115,6 +153,7 @@ async def run_webhook(bot: Bot, dp: Dispatcher):
         drop_pending_updates=True,
     )
     logger.success(f"Webhook set to {settings.WEBHOOK_URL}")
+    startup_timeline.ready()
 
     try:
         await asyncio.Event().wait()
@@ -127,11 +166,22 @@ async def run_webhook(bot: Bot, dp: Dispatcher):
 
 async def main():
     bot = Bot(token=settings.TG_BOT_API_KEY)
+    if not settings.BOT_RUN_SCHEDULER:
+        # Telegram's budget is per bot token: leave the worker its share
+        outbound_dispatcher.set_rate(max(1, GLOBAL_RATE - settings.WORKER_SEND_RATE))
+    bot.session.middleware(OutboundRateLimitMiddleware())
     dp = Dispatcher()
 
     register_all_handlers(dp)
+    if settings.DB_QUERY_TIMING:
+        dp.update.outer_middleware(DbTimingMiddleware())
+    dp.update.outer_middleware(UserActivityMiddleware())
+    # Runs flagged searches as tasks: one per chat, rate-limited per user
+    search_throttle = SearchThrottleMiddleware()
+    dp.message.middleware(search_throttle)
 
     dp.startup.register(on_startup)
+    dp.shutdown.register(search_throttle.close)
     dp.shutdown.register(on_shutdown)
 
     # Webhook mode for prod, polling otherwise
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark UserRepository.get_or_create_user (single upsert) against the previous
+SELECT + UPDATE/INSERT + refresh path, using the database from DATABASE_URL.
+
+Creates users with a "bench-" tg_user_id prefix and deletes them afterwards.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+from sqlalchemy import delete, select, update
+
+from bot.db import database
+from bot.db.models import User
+from bot.db.query_timing import get_query_stats, install_query_timing, reset_query_stats
+from bot.db.user_cache import clear_user_cache
+from bot.db.user_repository import UserRepository
+
+TG_PREFIX = "bench-"
+
+
+async def legacy_get_or_create_user(session, tg_user_id: str, **kwargs) -> User:
+    """The pre-upsert implementation, kept here only for comparison."""
+    stmt = select(User).where(User.tg_user_id == tg_user_id)
+    result = await session.execute(stmt)
+    user = result.scalar_one_or_none()
+    if user:
+        update_data = {}
+        for k, v in kwargs.items():
+            if not hasattr(user, k) or v is None:
+                continue
+            if k in {"first_name", "last_name"} and getattr(user, k):
+                continue
+            if k == "language_code" and getattr(user, k):
+                continue
+            update_data[k] = v
+        if update_data:
+            await session.execute(
+                update(User).where(User.tg_user_id == tg_user_id).values(**update_data)
+            )
+            await session.commit()
+            await session.refresh(user)
+        return user
+    user = User(tg_user_id=tg_user_id, **kwargs)
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    return user
+
+
+async def upsert_get_or_create_user(session, tg_user_id: str, **kwargs) -> User:
+    clear_user_cache()  # measure the database path, not the in-process cache
+    return await UserRepository(session).get_or_create_user(tg_user_id, **kwargs)
+
+
+def _statement_count() -> int:
+    return sum(stat.count for _, stat in get_query_stats())
+
+
+async def _run_scenario(name: str, func, users: int, kwargs_for) -> dict:
+    timings: list[float] = []
+    reset_query_stats()
+    for i in range(users):
+        async with database.db_session() as session:
+            started = time.perf_counter()
+            await func(session, f"{TG_PREFIX}{name}-{i}", **kwargs_for(i))
+            timings.append((time.perf_counter() - started) * 1000)
+    return {
+        "mean": statistics.fmean(timings),
+        "p50": statistics.median(timings),
+        "p95": statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else 0.0,
+        "statements": _statement_count() / users,
+    }
+
+
+async def run_benchmark(users: int) -> bool:
+    if not await database.init_database():
+        print("Error: could not connect to the database")
+        return False
+    # High threshold: we only want the counters, not slow-query log lines
+    install_query_timing(database.engine.sync_engine, slow_threshold_ms=60_000)
+
+    def telegram_fields(i: int, username_suffix: str = "") -> dict:
+        return {
+            "username": f"user{i}{username_suffix}",
+            "first_name": "Bench",
+            "last_name": None,
+            "language_code": "en",
+        }
+
+    scenarios = [
+        ("create", lambda i: telegram_fields(i)),
+        ("repeat", lambda i: telegram_fields(i)),
+        ("rename", lambda i: telegram_fields(i, "-renamed")),
+    ]
+
+    try:
+        print(
+            f"{'path':<8} {'scenario':<8} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'stmts':>6}"
+        )
+        for label, func in (
+            ("legacy", legacy_get_or_create_user),
+            ("upsert", upsert_get_or_create_user),
+        ):
+            for scenario, kwargs_for in scenarios:
+                stats = await _run_scenario(label, func, users, kwargs_for)
+                print(
+                    f"{label:<8} {scenario:<8} {stats['mean']:8.2f} {stats['p50']:8.2f} "
+                    f"{stats['p95']:8.2f} {stats['statements']:6.1f}"
+                )
+        return True
+    finally:
+        async with database.db_session() as session:
+            await session.execute(
+                delete(User).where(User.tg_user_id.startswith(TG_PREFIX))
+            )
+            await session.commit()
+        await database.close_database()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=200, help="calls per scenario")
+    args = parser.parse_args()
+    success = asyncio.run(run_benchmark(args.users))
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
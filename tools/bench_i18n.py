@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark i18n.t() on the rendering paths against the previous implementation.
+
+The previous t() walked nested dicts on every call. On a missing key it cleared
+its cache and re-parsed every YAML file. Both run over the same scenarios:
+single lookups, a search results page, a vacancy detail card and the profile
+toggles. The toggle keys exist only as hardcoded fallbacks, so they took the
+missing-key path.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from functools import lru_cache
+
+import yaml
+
+from bot.utils import i18n, resources
+from bot.utils.search import search_format
+
+
+@lru_cache(maxsize=8)
+def _legacy_load_lang(lang: str) -> dict:
+    data: dict = {}
+    for file in (resources.I18N_DIR / lang).glob("*.yml"):
+        loaded = yaml.safe_load(file.read_text(encoding="utf-8"))
+        if isinstance(loaded, dict):
+            data.update(loaded)
+    return data
+
+
+def _legacy_get_by_path(data: dict, path: str):
+    cur = data
+    for part in path.split("."):
+        if not isinstance(cur, dict) or part not in cur:
+            return None
+        cur = cur[part]
+    return cur
+
+
+def legacy_t(key: str, lang: str = "en", **kwargs) -> str:
+    """The pre-catalog implementation, kept here only for comparison."""
+    template = _legacy_get_by_path(_legacy_load_lang(lang), key)
+    if template is None:
+        _legacy_load_lang.cache_clear()
+        template = _legacy_get_by_path(_legacy_load_lang(lang), key)
+    if template is None and lang != "en":
+        template = _legacy_get_by_path(_legacy_load_lang("en"), key)
+    if template is None and key in i18n.FALLBACKS:
+        template = i18n.FALLBACKS[key].get(lang) or i18n.FALLBACKS[key].get("en")
+    if template is None:
+        return key
+    try:
+        return template.format(**kwargs)
+    except Exception:
+        return str(template)
+
+
+def _vacancy(index: int) -> dict:
+    return {
+        "id": str(index),
+        "name": f"Python developer {index}",
+        "employer": {"name": "Example LLC"},
+        "salary": {"from": 200000, "to": 300000, "currency": "RUR"},
+        "area": {"name": "Moscow"},
+        "alternate_url": f"https://hh.ru/vacancy/{index}",
+        "description": "Build and run backend services",
+    }
+
+
+VACANCIES = [_vacancy(index) for index in range(40)]
+
+SCENARIOS = {
+    "lookup": lambda lang: i18n.t("search.pagination.invalid_page", lang),
+    "lookup_format": lambda lang: i18n.t(
+        "search.results_header", lang, total=40, query="python"
+    ),
+    "search_page": lambda lang: search_format.format_search_page(
+        "python", VACANCIES, 1, 8, 40, lang
+    ),
+    "vacancy_details": lambda lang: search_format.format_vacancy_details(
+        VACANCIES[3], 4, 40, lang
+    ),
+    "profile_toggles": lambda lang: (
+        i18n.t("profile.on", lang),
+        i18n.t("profile.off", lang),
+    ),
+}
+
+
+def _time(fn, lang: str, iterations: int, repeats: int) -> float:
+    """Best-of-``repeats`` microseconds per call."""
+    fn(lang)  # warm caches
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn(lang)
+        samples.append((time.perf_counter() - started) / iterations * 1e6)
+    return min(samples)
+
+
+def run_benchmark(
+    lang: str, iterations: int, legacy_iterations: int, repeats: int
+) -> bool:
+    started = time.perf_counter()
+    count = i18n.load_catalogs()
+    print(
+        f"Catalogs: {count} language(s) in {(time.perf_counter() - started) * 1000:.1f}ms"
+    )
+
+    print(f"{'scenario':<16} {'catalog us':>11} {'legacy us':>11} {'speedup':>8}")
+    speedups = []
+    for name, fn in SCENARIOS.items():
+        current = _time(fn, lang, iterations, repeats)
+        search_format.t = legacy_t
+        i18n_t, i18n.t = i18n.t, legacy_t
+        try:
+            legacy = _time(fn, lang, legacy_iterations, repeats)
+        finally:
+            search_format.t = i18n.t = i18n_t
+        speedups.append(legacy / current)
+        print(f"{name:<16} {current:>11.2f} {legacy:>11.2f} {legacy / current:>7.1f}x")
+    print(f"Geometric mean speedup: {statistics.geometric_mean(speedups):.1f}x")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lang", default="ru", choices=["en", "ru"])
+    parser.add_argument("--iterations", type=int, default=10000)
+    parser.add_argument(
+        "--legacy-iterations",
+        type=int,
+        default=20,
+        help="the legacy missing-key path re-parses YAML, keep this small",
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    success = run_benchmark(
+        args.lang, args.iterations, args.legacy_iterations, args.repeats
+    )
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
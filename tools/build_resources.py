@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Compile i18n/<lang>/*.yml and prompts/*.txt into the runtime resource bundle.
+
+Run by `just build-resources` and the Docker build. Fails on a source file that
+does not parse, so a broken translation stops the build instead of a deploy.
+Importing bot code loads bot.config, so TG_BOT_API_KEY and DATABASE_URL must be
+set (the Docker build passes placeholders); they are not used.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Run as a script, so the repository root is not on sys.path by default
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from bot.utils.resources import BUNDLE_PATH, write_bundle  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", type=Path, default=BUNDLE_PATH)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        data = write_bundle(args.output)
+    except Exception as e:
+        print(f"Error: could not build resources: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    keys = sum(len(catalog) for catalog in data["i18n"].values())
+    print(
+        f"Wrote {args.output} ({args.output.stat().st_size / 1024:.1f} KiB): "
+        f"{len(data['i18n'])} language(s), {keys} keys, {len(data['prompts'])} prompt(s) "
+        f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+    )
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Report scheduled delivery capacity from the delivery_runs table.
+
+Prints one line per day (or hour): runs, due users, sends, HH calls, per-user
+p95 and the slowest run. It then fits a line through the busiest period's run
+duration and estimates when a run stops fitting in the budget. Schedule times
+are 15 minutes apart, so by default a slot's run must finish within 15 minutes.
+Runs longer than the budget are counted as overruns.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+from collections import defaultdict
+from datetime import UTC, datetime, timedelta
+
+from bot.db import DeliveryRunRepository, database
+
+
+def _bucket(started_at: datetime, by: str) -> datetime:
+    if by == "hour":
+        return started_at.replace(minute=0, second=0, microsecond=0)
+    return started_at.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _summarize(runs: list, budget_s: float) -> dict:
+    requests = sum(run.search_requests for run in runs)
+    hh_calls = sum(run.hh_calls for run in runs)
+    return {
+        "runs": len(runs),
+        "due": sum(run.users_due for run in runs),
+        "sent": sum(run.users_sent for run in runs),
+        "hh": hh_calls,
+        "reuse": (requests - hh_calls) / requests * 100 if requests else 0.0,
+        "sends": sum(run.telegram_sends for run in runs),
+        "failed": sum(run.telegram_failures for run in runs),
+        "peak_users": max(run.users_due for run in runs),
+        "user_p95": max(run.user_ms_p95 for run in runs),
+        "peak_s": max(run.duration_ms for run in runs) / 1000,
+        # Against the same budget as the trend, not each run's stored headroom
+        "overruns": sum(1 for run in runs if run.duration_ms > budget_s * 1000),
+    }
+
+
+def _print_table(buckets: dict[datetime, dict], by: str):
+    fmt = "%Y-%m-%d %H:00" if by == "hour" else "%Y-%m-%d"
+    print(
+        f"{'period':<16} {'runs':>5} {'due':>6} {'sent':>6} {'HH':>6} {'reuse%':>7} "
+        f"{'sends':>6} {'fail':>5} {'peak users':>10} {'user p95 ms':>11} "
+        f"{'peak run s':>10} {'overruns':>8}"
+    )
+    for period, row in sorted(buckets.items()):
+        print(
+            f"{period.strftime(fmt):<16} {row['runs']:>5} {row['due']:>6} "
+            f"{row['sent']:>6} {row['hh']:>6} {row['reuse']:>6.1f}% "
+            f"{row['sends']:>6} {row['failed']:>5} {row['peak_users']:>10} "
+            f"{row['user_p95']:>11} {row['peak_s']:>10.1f} {row['overruns']:>8}"
+        )
+
+
+def _print_trend(buckets: dict[datetime, dict], by: str, budget_s: float):
+    points = sorted(buckets.items())
+    if len(points) < 3:
+        print("\nNot enough periods for a trend (need at least 3).")
+        return
+
+    period_s = 3600 if by == "hour" else 86400
+    origin = points[0][0]
+    xs = [(period - origin).total_seconds() / period_s for period, _ in points]
+    peak_s = [row["peak_s"] for _, row in points]
+    peak_users = [row["peak_users"] for _, row in points]
+    duration_fit = statistics.linear_regression(xs, peak_s)
+    users_fit = statistics.linear_regression(xs, peak_users)
+
+    print(
+        f"\nTrend per {by}: peak run {duration_fit.slope:+.2f}s, "
+        f"peak due users {users_fit.slope:+.1f}"
+    )
+    latest = duration_fit.intercept + duration_fit.slope * xs[-1]
+    if latest >= budget_s:
+        print(f"Peak run already at {latest:.0f}s, over the {budget_s:.0f}s budget.")
+    elif duration_fit.slope <= 0:
+        print(f"Peak run {latest:.0f}s of {budget_s:.0f}s budget and not growing.")
+    else:
+        periods_left = (budget_s - latest) / duration_fit.slope
+        reaches_at = points[-1][0] + timedelta(seconds=periods_left * period_s)
+        print(
+            f"Peak run {latest:.0f}s of {budget_s:.0f}s budget; at this rate it "
+            f"reaches the budget around {reaches_at:%Y-%m-%d} "
+            f"({periods_left:.0f} {by}s)."
+        )
+
+
+async def run_report(days: int, by: str, job: str, budget_s: float) -> bool:
+    if not await database.init_database():
+        print("Error: could not connect to DATABASE_URL", file=sys.stderr)
+        return False
+    try:
+        since = datetime.now(UTC) - timedelta(days=days)
+        async with database.db_session() as session:
+            runs = await DeliveryRunRepository(session).get_since(since, job=job)
+    finally:
+        await database.close_database()
+
+    if not runs:
+        print(f"No '{job}' runs recorded in the last {days} day(s).")
+        return True
+
+    grouped: dict[datetime, list] = defaultdict(list)
+    for run in runs:
+        grouped[_bucket(run.started_at.astimezone(UTC), by)].append(run)
+    buckets = {period: _summarize(group, budget_s) for period, group in grouped.items()}
+
+    _print_table(buckets, by)
+    _print_trend(buckets, by, budget_s)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=30, help="history to include")
+    parser.add_argument("--by", choices=["day", "hour"], default="day")
+    parser.add_argument("--job", default="daily_vacancies")
+    parser.add_argument(
+        "--budget-minutes",
+        type=float,
+        default=15,
+        help="time one slot's run may take",
+    )
+    args = parser.parse_args()
+    success = asyncio.run(
+        run_report(args.days, args.by, args.job, args.budget_minutes * 60)
+    )
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
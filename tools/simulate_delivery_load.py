@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Load-test scheduled delivery against the database from DATABASE_URL.
+
+Seeds synthetic users ("sim-" tg_user_id prefix) with weighted schedule times,
+time zones and Zipf-distributed queries. It then runs run_daily_vacancies once
+per busiest slot, with HH served by a fake HTTP transport and Telegram by a
+fake Bot session (configurable latency and error rate). Sends still pass
+through the outbound rate limiter. Each run starts right after a job tick and
+misses its deadline if it takes longer than --budget-minutes.
+
+Reports throughput, deadline misses, per-user p95 and peak RSS per run, then
+deletes everything it created. Searches are fetched live at the slot (no
+prefetch), so this measures the worst case. Use a scratch database: the job
+claims every due user, not only synthetic ones.
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import resource
+import sys
+import time
+from collections import defaultdict
+from datetime import UTC, datetime, timedelta
+
+import httpx
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.methods import GetFile, SendMessage
+from aiogram.types import Chat, Message
+from loguru import logger
+from sqlalchemy import delete, func, insert, select
+
+from bot.config import settings
+from bot.db import DeliveryRunRepository, database
+from bot.db.models import (
+    DeliveredVacancy,
+    DeliveryRun,
+    QueryWatermark,
+    SearchQuery,
+    User,
+    UserSearchResult,
+    Vacancy,
+)
+from bot.middlewares import OutboundRateLimitMiddleware
+from bot.services import job_run_service, user_service
+from bot.services.hh_service import hh_service
+from bot.tasks import vacancy_delivery
+from bot.utils.outbound import GLOBAL_RATE, outbound_dispatcher
+from bot.utils.time import compute_next_delivery_at
+
+TG_PREFIX = "sim-"
+VACANCY_PREFIX = "sim-"
+INSERT_CHUNK = 1000
+
+
+def _parse_weights(spec: str) -> list[tuple[str, float]]:
+    """Parse "a=3,b=1" into [("a", 3.0), ("b", 1.0)]."""
+    choices = []
+    for part in spec.split(","):
+        value, _, weight = part.strip().rpartition("=")
+        choices.append((value, float(weight)) if value else (weight, 1.0))
+    return choices
+
+
+def _pick(rng: random.Random, choices: list[tuple[str, float]]) -> str:
+    values, weights = zip(*choices, strict=True)
+    return rng.choices(values, weights=weights)[0]
+
+
+def _lognormal_delay(rng: random.Random, median_ms: float) -> float:
+    return rng.lognormvariate(math.log(max(median_ms, 0.001)), 0.5) / 1000
+
+
+class FakeHH:
+    """httpx transport handler answering /vacancies like HH, without the network."""
+
+    def __init__(self, rng, latency_ms: float, error_rate: float, results: int):
+        self.rng = rng
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.results = results
+        self.requests = 0
+        self.errors = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        await asyncio.sleep(_lognormal_delay(self.rng, self.latency_ms))
+        if self.rng.random() < self.error_rate:
+            self.errors += 1
+            return httpx.Response(503, json={"errors": [{"type": "simulated"}]})
+
+        params = request.url.params
+        text = params.get("text", "")
+        page = int(params.get("page", 0))
+        per_page = int(params.get("per_page", 20))
+        now = datetime.now(UTC)
+        start = page * per_page
+        key = abs(hash(text)) % 10**8
+        items = [
+            {
+                "id": f"{VACANCY_PREFIX}{key}-{index}",
+                "name": f"{text.removeprefix('name:')} #{index}",
+                "employer": {"name": "Simulated LLC"},
+                "area": {"name": "Moscow"},
+                "salary": None,
+                "alternate_url": f"https://hh.ru/vacancy/{key}{index}",
+                "published_at": (now - timedelta(minutes=index)).isoformat(),
+            }
+            for index in range(start, min(start + per_page, self.results))
+        ]
+        return httpx.Response(
+            200,
+            json={
+                "items": items,
+                "found": self.results,
+                "pages": math.ceil(self.results / per_page),
+                "page": page,
+                "per_page": per_page,
+            },
+        )
+
+
+class FakeTelegramSession(BaseSession):
+    """Bot session that answers API calls locally after a simulated delay."""
+
+    def __init__(self, rng, latency_ms: float, error_rate: float):
+        super().__init__()
+        self.rng = rng
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.calls = 0
+
+    async def make_request(self, bot, method, timeout=None):  # noqa: ASYNC109
+        self.calls += 1
+        await asyncio.sleep(_lognormal_delay(self.rng, self.latency_ms))
+        if self.rng.random() < self.error_rate:
+            raise TelegramBadRequest(method=method, message="simulated failure")
+        if isinstance(method, SendMessage):
+            return Message(
+                message_id=self.calls,
+                date=datetime.now(UTC),
+                chat=Chat(id=0, type="private"),
+                text=method.text,
+            )
+        return True
+
+    async def close(self):
+        pass
+
+    async def stream_content(self, url, headers=None, timeout=30, **kwargs):  # noqa: ASYNC109
+        # Delivery never downloads files; fail like any other unsupported call
+        self.calls += 1
+        raise TelegramBadRequest(
+            method=GetFile(file_id=url), message="file downloads are not simulated"
+        )
+        yield b""  # an async generator, like the base method
+
+
+async def seed_users(args, rng: random.Random) -> dict[datetime, list[int]]:
+    """Insert synthetic users and queries; return user ids by UTC slot."""
+    slots = _parse_weights(args.slots)
+    zones = _parse_weights(args.timezones)
+    pool = [f"sim query {rank}" for rank in range(args.query_pool)]
+    query_weights = [1 / (rank + 1) ** args.zipf for rank in range(args.query_pool)]
+    now = datetime.now(UTC)
+
+    rows = []
+    for index in range(args.users):
+        schedule_time, zone = _pick(rng, slots), _pick(rng, zones)
+        rows.append(
+            {
+                "tg_user_id": f"{TG_PREFIX}{index}",
+                "language_code": "ru",
+                "hh_area_id": "1",
+                "is_active": True,
+                "last_seen_at": now,
+                "preferences": {
+                    "vacancy_schedule_time": schedule_time,
+                    "timezone": zone,
+                },
+                "schedule_time": schedule_time,
+                "timezone": zone,
+                "next_delivery_at": compute_next_delivery_at(schedule_time, zone, now),
+            }
+        )
+
+    by_slot: dict[datetime, list[int]] = defaultdict(list)
+    async with database.db_session() as session:
+        for offset in range(0, len(rows), INSERT_CHUNK):
+            chunk = rows[offset : offset + INSERT_CHUNK]
+            result = await session.execute(
+                insert(User).values(chunk).returning(User.id, User.next_delivery_at)
+            )
+            user_rows = result.all()
+            queries = []
+            for user_id, next_at in user_rows:
+                by_slot[next_at].append(user_id)
+                tracked = max(1, round(rng.expovariate(1 / args.queries_mean)))
+                for text in set(rng.choices(pool, weights=query_weights, k=tracked)):
+                    queries.append({"user_id": user_id, "query_text": text})
+            await session.execute(insert(SearchQuery).values(queries))
+            await session.commit()
+    return by_slot
+
+
+async def cleanup(started_at: datetime):
+    async with database.db_session() as session:
+        user_ids = select(User.id).where(User.tg_user_id.startswith(TG_PREFIX))
+        for model in (UserSearchResult, DeliveredVacancy, QueryWatermark, SearchQuery):
+            await session.execute(delete(model).where(model.user_id.in_(user_ids)))
+        await session.execute(
+            delete(Vacancy).where(Vacancy.hh_vacancy_id.startswith(VACANCY_PREFIX))
+        )
+        await session.execute(delete(User).where(User.tg_user_id.startswith(TG_PREFIX)))
+        await session.execute(
+            delete(DeliveryRun).where(
+                DeliveryRun.owner == job_run_service.OWNER,
+                DeliveryRun.started_at >= started_at,
+            )
+        )
+        await session.commit()
+
+
+async def count_real_scheduled_users() -> int:
+    async with database.db_session() as session:
+        result = await session.execute(
+            select(func.count())
+            .select_from(User)
+            .where(
+                User.is_active.is_(True),
+                User.next_delivery_at.isnot(None),
+                User.tg_user_id.not_like(f"{TG_PREFIX}%"),
+            )
+        )
+        return result.scalar_one()
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+async def run_simulation(args) -> bool:
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level)
+    rng = random.Random(args.seed)  # noqa: S311  # reproducible synthetic data
+
+    if not await database.init_database():
+        print("Error: could not connect to DATABASE_URL", file=sys.stderr)
+        return False
+
+    settings.DELIVERY_COMBINED_QUERIES = args.combined
+    settings.DELIVERY_DIGEST = args.digest
+    outbound_dispatcher.set_rate(args.send_rate)
+    fake_hh = FakeHH(rng, args.hh_latency_ms, args.hh_error_rate, args.hh_results)
+    hh_service.session = httpx.AsyncClient(
+        base_url=hh_service.base_url, transport=httpx.MockTransport(fake_hh)
+    )
+    tg_session = FakeTelegramSession(rng, args.tg_latency_ms, args.tg_error_rate)
+    bot = Bot(token="123456:SIMULATED", session=tg_session)  # noqa: S106
+    bot.session.middleware(OutboundRateLimitMiddleware())
+
+    started_at = datetime.now(UTC)
+    try:
+        if not args.force and (real := await count_real_scheduled_users()):
+            print(
+                f"Refusing to run: {real} real user(s) have a delivery schedule and "
+                "would be claimed too. Use a scratch database or pass --force.",
+                file=sys.stderr,
+            )
+            return False
+
+        seed_started = time.monotonic()
+        by_slot = await seed_users(args, rng)
+        print(
+            f"Seeded {args.users} users in {len(by_slot)} UTC slot(s) "
+            f"in {time.monotonic() - seed_started:.1f}s"
+        )
+
+        busiest = sorted(by_slot.items(), key=lambda item: -len(item[1]))
+        print(
+            f"{'slot (UTC)':<17} {'due':>6} {'sent':>6} {'run s':>7} {'users/s':>8} "
+            f"{'sends/s':>8} {'HH':>6} {'p95 ms':>7} {'headroom s':>10} {'RSS MB':>7}"
+        )
+        misses = 0
+        total_users = 0
+        total_seconds = 0.0
+        for slot_at, user_ids in busiest[: args.runs]:
+            # Start just after a job tick, as the scheduler would
+            interval = vacancy_delivery.SLOT_INTERVAL.total_seconds()
+            await asyncio.sleep(interval - time.time() % interval + 0.1)
+            due_at = datetime.now(UTC) - timedelta(seconds=1)
+            await user_service.set_next_delivery_times(dict.fromkeys(user_ids, due_at))
+            run_started = datetime.now(UTC)
+            await vacancy_delivery.run_daily_vacancies(bot)
+
+            async with database.db_session() as session:
+                runs = await DeliveryRunRepository(session).get_since(run_started)
+            run = next(
+                (run for run in reversed(runs) if run.owner == job_run_service.OWNER),
+                None,
+            )
+            if run is None:
+                print(f"{slot_at:%Y-%m-%d %H:%M}  no run recorded")
+                continue
+            seconds = run.duration_ms / 1000 or 0.001
+            # Same budget as the throughput estimate below
+            headroom = args.budget_minutes * 60 - seconds
+            missed = headroom < 0
+            misses += missed
+            total_users += run.users_due
+            total_seconds += seconds
+            print(
+                f"{slot_at:%Y-%m-%d %H:%M} {run.users_due:>6} {run.users_sent:>6} "
+                f"{seconds:>7.1f} {run.users_due / seconds:>8.1f} "
+                f"{run.telegram_sends / seconds:>8.1f} {run.hh_calls:>6} "
+                f"{run.user_ms_p95:>7} {headroom:>10.1f}"
+                f"{'!' if missed else ' '}{_peak_rss_mb():>6.0f}"
+            )
+
+        print(
+            f"\nHH requests {fake_hh.requests} ({fake_hh.errors} failed), "
+            f"Telegram calls {tg_session.calls}; slot-deadline misses: {misses}"
+        )
+        if total_seconds:
+            rate = total_users / total_seconds
+            print(
+                f"Throughput {rate:.1f} users/s: one instance serves about "
+                f"{rate * args.budget_minutes * 60:.0f} users per "
+                f"{args.budget_minutes:g}-minute slot; peak RSS {_peak_rss_mb():.0f} MB"
+            )
+        return True
+    finally:
+        await cleanup(started_at)
+        await outbound_dispatcher.close()
+        await hh_service.session.aclose()
+        await database.close_database()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument(
+        "--slots",
+        default="09:00=40,10:00=25,12:00=10,18:00=15,21:00=10",
+        help="schedule times with weights, HH:MM=weight,...",
+    )
+    parser.add_argument(
+        "--timezones",
+        default="Europe/Moscow=70,Asia/Yekaterinburg=10,Asia/Novosibirsk=10,UTC=10",
+        help="IANA zones with weights",
+    )
+    parser.add_argument(
+        "--queries-mean", type=float, default=3.0, help="tracked queries per user"
+    )
+    parser.add_argument("--query-pool", type=int, default=500)
+    parser.add_argument("--zipf", type=float, default=1.1, help="query popularity skew")
+    parser.add_argument("--hh-latency-ms", type=float, default=300)
+    parser.add_argument("--hh-error-rate", type=float, default=0.01)
+    parser.add_argument("--hh-results", type=int, default=200, help="found per query")
+    parser.add_argument("--tg-latency-ms", type=float, default=80)
+    parser.add_argument("--tg-error-rate", type=float, default=0.0)
+    parser.add_argument("--send-rate", type=float, default=GLOBAL_RATE)
+    parser.add_argument("--combined", action="store_true", help="OR-query mode")
+    parser.add_argument("--digest", action="store_true", help="digest mode")
+    parser.add_argument("--runs", type=int, default=3, help="busiest slots to run")
+    parser.add_argument(
+        "--budget-minutes", type=float, default=15, help="time one slot's run may take"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="run even if real users have a delivery schedule",
+    )
+    args = parser.parse_args()
+    success = asyncio.run(run_simulation(args))
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Estimate how many HH searches the delivery job saves by fetching each distinct
+(query, area, filters) fingerprint once per run instead of once per user query.
+
+Users are synthetic: query popularity follows a Zipf distribution, most users sit
+in a few large areas and leave filters empty, and query texts vary in case and
+spacing the way they are typed.
+"""
+
+import argparse
+import random
+import sys
+
+from bot.utils.search.query_state import search_fingerprint
+
+# (area_id, weight): Moscow, Saint Petersburg, a few big cities, then a long tail
+AREAS = [("1", 45), ("2", 20), ("3", 5), ("4", 4), ("88", 3), (None, 8)]
+TAIL_AREAS = [str(area_id) for area_id in range(5, 80)]
+TAIL_AREA_WEIGHT = 15
+# Mirrors bot.tasks.vacancy_delivery.MAX_TRACKED_QUERIES
+MAX_TRACKED_QUERIES = 50
+
+FILTER_PRESETS = [
+    ({}, 70),
+    ({"remote_only": True}, 12),
+    ({"experience": "between1And3"}, 6),
+    ({"min_salary": 150000}, 5),
+    ({"remote_only": True, "experience": "between3And6"}, 4),
+    ({"employment": "full", "min_salary": 200000}, 3),
+]
+
+
+def _pick_weighted(rng: random.Random, choices: list[tuple]) -> object:
+    values, weights = zip(*choices, strict=True)
+    return rng.choices(values, weights=weights)[0]
+
+
+def _spell(rng: random.Random, query: str) -> str:
+    """Vary the text the way users type it; fingerprints must absorb this."""
+    roll = rng.random()
+    if roll < 0.15:
+        return query.capitalize()
+    if roll < 0.2:
+        return f" {query}  "
+    return query
+
+
+def simulate(
+    users: int, pool_size: int, zipf: float, mean_queries: float, seed: int
+) -> tuple[int, int]:
+    """Return (per-user HH calls, grouped HH calls) for one synthetic run."""
+    rng = random.Random(seed)  # noqa: S311  # reproducible synthetic data
+    pool = [f"query {rank}" for rank in range(pool_size)]
+    query_weights = [1 / (rank + 1) ** zipf for rank in range(pool_size)]
+
+    per_user_calls = 0
+    fingerprints: set[str] = set()
+    for _ in range(users):
+        area_id = _pick_weighted(rng, [*AREAS, ("tail", TAIL_AREA_WEIGHT)])
+        if area_id == "tail":
+            area_id = rng.choice(TAIL_AREAS)
+        filters = _pick_weighted(rng, FILTER_PRESETS)
+
+        tracked = min(
+            MAX_TRACKED_QUERIES, max(1, round(rng.expovariate(1 / mean_queries)))
+        )
+        queries = set(rng.choices(pool, weights=query_weights, k=tracked))
+        for query in queries:
+            per_user_calls += 1
+            fingerprints.add(search_fingerprint(_spell(rng, query), area_id, filters))
+
+    return per_user_calls, len(fingerprints)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--users",
+        type=int,
+        nargs="+",
+        default=[100, 500, 2000, 10000],
+        help="due users per run",
+    )
+    parser.add_argument("--pool", type=int, default=2000, help="distinct query texts")
+    parser.add_argument("--zipf", type=float, default=1.1, help="popularity skew")
+    parser.add_argument(
+        "--mean-queries", type=float, default=3.0, help="tracked queries per user"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'users':>7} {'per-user':>9} {'grouped':>8} {'saved':>8} {'saved %':>8}")
+    for users in args.users:
+        per_user, grouped = simulate(
+            users, args.pool, args.zipf, args.mean_queries, args.seed
+        )
+        saved = per_user - grouped
+        share = saved / per_user * 100 if per_user else 0.0
+        print(f"{users:>7} {per_user:>9} {grouped:>8} {saved:>8} {share:>7.1f}%")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()